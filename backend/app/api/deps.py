@@ -1,19 +1,45 @@
 """API dependencies."""
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.services.providers.market_provider import MarketProvider
 from app.services.providers.news_provider import NewsProvider
 from app.services.providers.sentiment_provider import SentimentProvider
+from app.services.providers.sentiment_batcher import SentimentBatcher
 from app.services.features.signals import SignalService
 
+_sentiment_batcher: SentimentBatcher | None = None
+
 
 def get_database() -> Generator[Session, None, None]:
     """Dependency for database session."""
     yield from get_db()
 
 
+async def get_async_database() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for an asyncio database session (use from async def routes)."""
+    async for db in get_async_db():
+        yield db
+
+
+def get_sentiment_batcher() -> SentimentBatcher:
+    """The API process's batcher: concurrent requests share its FinBERT batches."""
+    global _sentiment_batcher
+    if _sentiment_batcher is None:
+        _sentiment_batcher = SentimentBatcher(SentimentProvider())
+    return _sentiment_batcher
+
+
+async def close_sentiment_batcher() -> None:
+    global _sentiment_batcher
+    batcher, _sentiment_batcher = _sentiment_batcher, None
+    if batcher is not None:
+        await batcher.aclose()
+
+
 def get_signal_service():
-    return SignalService(MarketProvider(), NewsProvider(), SentimentProvider())
+    batcher = get_sentiment_batcher()
+    return SignalService(MarketProvider(), NewsProvider(), batcher.provider, batcher=batcher)
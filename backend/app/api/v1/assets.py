@@ -7,12 +7,15 @@ from sqlalchemy import select
 
 from app.api.deps import get_database
 from app.db.models.asset import Asset
+from app.db.repositories.asset_repo import invalidate_symbols
 
 router = APIRouter()
 
 
+# plain def routes: FastAPI runs them in its threadpool, so the sync session does
+# not block the event loop, and short queries cost less than on the asyncio engine
 @router.get("/")
-async def list_assets(
+def list_assets(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_database),
@@ -34,7 +37,7 @@ async def list_assets(
 
 
 @router.post("/")
-async def create_asset(
+def create_asset(
     symbol: str,
     name: str,
     asset_class: str,
@@ -51,6 +54,7 @@ async def create_asset(
     db.add(asset)
     db.commit()
     db.refresh(asset)
+    invalidate_symbols([symbol])
     return {
         "id": asset.id,
         "symbol": asset.symbol,
@@ -2,9 +2,45 @@
 
 from fastapi import APIRouter
 
+from app.core.executors import executor_stats
+from app.services.providers.concurrency import concurrency_limits
+from app.services.providers.http_clients import http_clients
+from app.services.providers.negative_cache import negative_cache
+from app.services.providers.rate_limiter import rate_limiter
+
 router = APIRouter()
 
 
 @router.get("/")
 def health():
     return {"status": "ok"}
+
+
+@router.get("/executors")
+def executors():
+    """Queue depth and throughput of the blocking-work pools (FinBERT, yfinance)."""
+    return {"executors": executor_stats()}
+
+
+@router.get("/http-clients")
+def http_client_stats():
+    """Pooled upstream HTTP clients (one per host) and their connection limits."""
+    return http_clients.stats()
+
+
+@router.get("/negative-cache")
+def negative_cache_stats():
+    """Symbols skipped because a provider recently had no data for them."""
+    return negative_cache.stats()
+
+
+@router.get("/rate-limits")
+def rate_limit_stats():
+    """Per-upstream token buckets: configured rate, requests admitted, time spent waiting."""
+    return rate_limiter.stats()
+
+
+@router.get("/concurrency")
+def concurrency_stats():
+    """Adaptive per-upstream concurrency: current limit, in-flight requests, latency."""
+    return concurrency_limits.stats()
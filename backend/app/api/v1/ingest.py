@@ -6,7 +6,7 @@ from celery.result import AsyncResult
 
 from ...services.tasks.celery_app import app as celery_app
 from ...services.tasks.orchestrate import universe_backfill_and_signals
-from ...services.tasks.price_tasks import fetch_and_store_prices
+from ...services.tasks.price_tasks import fetch_and_store_prices, ingest_grouped_daily
 from ...services.tasks.signal_tasks import compute_signal_task
 
 router = APIRouter()
@@ -19,8 +19,14 @@ def queue_backfill(symbols: list[str] = Query(...), lookback_days: int = 365 * 3
 
 
 @router.post("/celery/price")
-def queue_price(symbol: str, lookback_days: int = 365 * 3):
-    job = fetch_and_store_prices.delay(symbol, lookback_days)
+def queue_price(symbol: str, lookback_days: int = 365 * 3, full_refresh: bool = False):
+    job = fetch_and_store_prices.delay(symbol, lookback_days, full_refresh)
+    return {"task_id": job.id}
+
+
+@router.post("/celery/grouped-daily")
+def queue_grouped_daily(max_days: int | None = None):
+    job = ingest_grouped_daily.delay(max_days)
     return {"task_id": job.id}
 
 
@@ -11,8 +11,10 @@ from app.db.models.portfolio import Portfolio
 router = APIRouter()
 
 
+# plain def routes: FastAPI runs them in its threadpool, so the sync session does
+# not block the event loop, and short queries cost less than on the asyncio engine
 @router.get("/{user_id}")
-async def load_portfolio(
+def load_portfolio(
     user_id: str,
     db: Session = Depends(get_database),
 ) -> List[dict]:
@@ -32,7 +34,7 @@ async def load_portfolio(
 
 
 @router.post("/")
-async def save_portfolio(
+def save_portfolio(
     user_id: str,
     allocations: dict,
     policy: dict | None = None,
@@ -13,7 +13,11 @@ async def get_recommendation(
     risk: str = Query("balanced", pattern="^(conservative|balanced|aggressive)$"),
     amount: float = 10000,
     symbols: list[str] | None = Query(None),
+    solver: str | None = Query(None, pattern="^(ecos|numpy)$"),
+    mode: str | None = Query(None, pattern="^(online|cached)$"),
     signal_service=Depends(get_signal_service),
 ):
     recommender = RecommenderService(signal_service)
-    return await recommender.recommend(risk=risk, invest_amount=amount, symbols=symbols)
+    return await recommender.recommend(
+        risk=risk, invest_amount=amount, symbols=symbols, solver=solver, mode=mode
+    )
@@ -2,35 +2,30 @@
 
 from fastapi import APIRouter, Query, Depends
 
-from ...services.providers.market_provider import MarketProvider
-from ...services.providers.news_provider import NewsProvider
-from ...services.providers.sentiment_provider import SentimentProvider
-from ...services.features.signals import SignalService
+from ...services.providers.sentiment_cache import sentiment_cache
 from ...api.deps import get_signal_service
 
 router = APIRouter()
 
 
 def _svc():
-    return SignalService(MarketProvider(), NewsProvider(), SentimentProvider())
+    return get_signal_service()
 
 
 @router.post("/backfill")
-async def backfill(symbols: list[str] = Query(...), lookback_days: int = 365 * 3):
-    svc = _svc()
-    counts = {}
-    for s in symbols:
-        counts[s] = await svc.backfill_prices(s, lookback_days=lookback_days)
+async def backfill(
+    symbols: list[str] = Query(...), lookback_days: int = 365 * 3, full_refresh: bool = False
+):
+    counts = await _svc().backfill_prices_many(
+        symbols, lookback_days=lookback_days, full_refresh=full_refresh
+    )
     return {"inserted_or_updated_rows": counts}
 
 
 @router.post("/compute")
 async def compute(symbols: list[str] = Query(...)):
     svc = _svc()
-    out = []
-    for s in symbols:
-        out.append(await svc.compute_and_persist(s))
-    return {"signals": out}
+    return {"signals": await svc.compute_and_persist_many(symbols)}
 
 
 @router.get("/")
@@ -41,3 +36,9 @@ async def preview_signals(
     """Preview signals for a symbol (non-persisting)."""
     result = await signal_service.combine(symbol)
     return result
+
+
+@router.get("/sentiment-cache")
+def sentiment_cache_stats():
+    """Hit/miss counters of this process's per-headline sentiment cache."""
+    return sentiment_cache.stats()
@@ -11,9 +11,15 @@ router = APIRouter()
 
 
 @router.post("/build")
-async def build_universe(count: int = Query(100, ge=10, le=500), lookback_days: int = 365 * 3):
+async def build_universe(
+    count: int = Query(100, ge=10, le=500),
+    lookback_days: int = 365 * 3,
+    full_refresh: bool = False,
+):
     svc = UniverseService(UniverseProvider(), MarketProvider())
-    return await svc.ensure_assets_and_backfill(count=count, lookback_days=lookback_days)
+    return await svc.ensure_assets_and_backfill(
+        count=count, lookback_days=lookback_days, full_refresh=full_refresh
+    )
 
 
 @router.get("/list")
@@ -0,0 +1,121 @@
+"""Named, bounded executors for blocking work, with queue-depth metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+
+class MeteredExecutor:
+    """
+    Executor wrapper counting submitted, in-flight and queued work.
+
+    queued is in-flight work beyond max_workers (waiting for a free worker); it is
+    derived on the submitting side, so it also works for process pools.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int):
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed - self.failed
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            self.submitted += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        fut = self.executor.submit(fn, *args, **kwargs)
+        fut.add_done_callback(self._done)
+        return fut
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Await fn(*args, **kwargs) on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(partial(fn, *args, **kwargs)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _done(self, fut: Future) -> None:
+        with self._lock:
+            if fut.cancelled() or fut.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+
+_executors: dict[str, MeteredExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def thread_pool(name: str, max_workers: int) -> MeteredExecutor:
+    """Process-wide thread pool registered under name (created on first use)."""
+    with _registry_lock:
+        if name not in _executors:
+            pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = MeteredExecutor(name, pool, max_workers)
+        return _executors[name]
+
+
+def process_pool(
+    name: str, max_workers: int, initializer: Callable | None = None, initargs: tuple = ()
+) -> MeteredExecutor:
+    """
+    Process-wide spawn-context process pool registered under name. Spawned (not forked)
+    children start clean, so native thread pools such as torch's are safe to use.
+    """
+    with _registry_lock:
+        if name not in _executors:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+            _executors[name] = MeteredExecutor(name, pool, max_workers)
+        return _executors[name]
+
+
+def can_spawn_processes() -> bool:
+    # daemonic processes (e.g. Celery prefork children) may not have children
+    return not multiprocessing.current_process().daemon
+
+
+def executor_stats() -> list[dict]:
+    with _registry_lock:
+        return [e.stats() for e in _executors.values()]
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    with _registry_lock:
+        pools = list(_executors.values())
+        _executors.clear()
+    for e in pools:
+        e.shutdown(wait=wait, cancel_futures=True)
@@ -5,6 +5,8 @@ from app.db.models.price import Price
 from app.db.models.signal import Signal
 from app.db.models.recommendation import Recommendation
 from app.db.models.portfolio import Portfolio
+from app.db.models.sentiment_score import SentimentScore
+from app.db.models.asset_volume import AssetVolume
 
 __all__ = [
     "Asset",
@@ -12,5 +14,7 @@ __all__ = [
     "Signal",
     "Recommendation",
     "Portfolio",
+    "SentimentScore",
+    "AssetVolume",
 ]
 
@@ -0,0 +1,22 @@
+"""Rolling average-volume summary model (one row per asset)."""
+
+from sqlalchemy import ForeignKey, Date, DateTime, Double, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from app.db.base import Base
+
+
+class AssetVolume(Base):
+    __tablename__ = "asset_volume_stats"
+
+    __table_args__ = (Index("ix_asset_volume_stats_avg_volume", "avg_volume"),)
+
+    asset_id: Mapped[int] = mapped_column(
+        ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True
+    )
+    avg_volume: Mapped[float] = mapped_column(Double)  # mean volume of bars since window_start
+    bars: Mapped[int] = mapped_column(Integer)
+    last_date: Mapped[object] = mapped_column(Date)
+    window_start: Mapped[object] = mapped_column(Date)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+"""Cached per-text sentiment score model."""
+
+from sqlalchemy import String, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from app.db.base import Base
+
+
+class SentimentScore(Base):
+    __tablename__ = "sentiment_scores"
+
+    __table_args__ = (
+        UniqueConstraint("text_hash", "model", name="uq_sentiment_scores_hash_model"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64))  # sha256 hex of the normalized text
+    model: Mapped[str] = mapped_column(String(120))  # FinBERT model id, or "vader"
+    score: Mapped[float]
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
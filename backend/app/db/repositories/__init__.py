@@ -1,13 +1,19 @@
 """Database repositories."""
 
-from app.db.repositories.asset_repo import AssetRepo
-from app.db.repositories.price_repo import PriceRepo
-from app.db.repositories.signal_repo import SignalRepo
+from app.db.repositories.asset_repo import AssetRepo, AsyncAssetRepo, invalidate_symbols
 from app.db.repositories.portfolio_repo import PortfolioRepository
+from app.db.repositories.price_repo import AsyncPriceRepo, PriceRepo
+from app.db.repositories.sentiment_repo import SentimentScoreRepo
+from app.db.repositories.signal_repo import AsyncSignalRepo, SignalRepo
 
 __all__ = [
     "AssetRepo",
+    "AsyncAssetRepo",
+    "invalidate_symbols",
     "PriceRepo",
+    "AsyncPriceRepo",
     "SignalRepo",
+    "AsyncSignalRepo",
     "PortfolioRepository",
+    "SentimentScoreRepo",
 ]
@@ -1,12 +1,77 @@
 """Asset repository."""
 
+import threading
+from collections.abc import Iterable
+
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 
-from ..session import SessionLocal
+from ..session import SessionLocal, AsyncSessionLocal
 from ..models.asset import Asset
 
 
+class SymbolMap:
+    """
+    Process-wide symbol -> asset_id map shared by the sync and async repos.
+
+    Filled from ensure_assets' RETURNING rows and resolve_many lookups; ids of
+    existing assets never change, so entries only need dropping when assets are
+    created, renamed or deleted (see invalidate_symbols).
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, symbols: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+        """Split symbols into (cached ids, misses), preserving the order of misses."""
+        hits, misses = {}, []
+        with self._lock:
+            for s in dict.fromkeys(symbols):
+                asset_id = self._ids.get(s)
+                if asset_id is None:
+                    misses.append(s)
+                else:
+                    hits[s] = asset_id
+        return hits, misses
+
+    def update(self, pairs: Iterable[tuple[str, int]]) -> None:
+        with self._lock:
+            self._ids.update(pairs)
+
+    def invalidate(self, symbols: Iterable[str] | None = None) -> None:
+        with self._lock:
+            if symbols is None:
+                self._ids.clear()
+            else:
+                for s in symbols:
+                    self._ids.pop(s, None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+symbol_map = SymbolMap()
+
+
+def invalidate_symbols(symbols: Iterable[str] | None = None) -> None:
+    """Drop cached asset ids (all of them when symbols is None) after asset changes."""
+    symbol_map.invalidate(symbols)
+
+
+def _ensure_assets_stmt(assets: list[dict]):
+    stmt = insert(Asset).values(assets)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["symbol"],
+        set_={"name": stmt.excluded.name, "asset_class": stmt.excluded.asset_class},
+    )
+    return stmt.returning(Asset.id, Asset.symbol)
+
+
+def _resolve_query(symbols: list[str]):
+    return select(Asset.symbol, Asset.id).where(Asset.symbol.in_(symbols))
+
+
 class AssetRepo:
     def __init__(self, session_factory=SessionLocal):
         self.session_factory = session_factory
@@ -15,18 +80,70 @@ class AssetRepo:
         with self.session_factory() as s:
             return s.execute(select(Asset).where(Asset.symbol == symbol)).scalar_one_or_none()
 
+    def resolve_many(self, symbols: Iterable[str]) -> dict[str, int]:
+        """
+        Map symbols to asset ids with at most one query (cache misses only).
+        Unknown symbols are omitted.
+        """
+        ids, misses = symbol_map.get_many(symbols)
+        if misses:
+            with self.session_factory() as s:
+                found = dict(s.execute(_resolve_query(misses)).all())
+            symbol_map.update(found.items())
+            ids.update(found)
+        return ids
+
+    def all_ids(self) -> dict[str, int]:
+        """Every stored asset as {symbol: id}."""
+        with self.session_factory() as s:
+            found = dict(s.execute(select(Asset.symbol, Asset.id)).all())
+        symbol_map.update(found.items())
+        return found
+
     def ensure_assets(self, assets: list[dict]) -> list[int]:
         """assets: [{'symbol': 'VOO', 'name':'Vanguard 500', 'asset_class':'etf'}, ...]"""
         if not assets:
             return []
 
-        stmt = insert(Asset).values(assets)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["symbol"],
-            set_={"name": stmt.excluded.name, "asset_class": stmt.excluded.asset_class},
-        )
-
         with self.session_factory() as s:
-            result = s.execute(stmt.returning(Asset.id))
+            result = s.execute(_ensure_assets_stmt(assets)).fetchall()
             s.commit()
-            return [r[0] for r in result.fetchall()]
+        symbol_map.update((sym, asset_id) for asset_id, sym in result)
+        return [r[0] for r in result]
+
+
+class AsyncAssetRepo:
+    """asyncio counterpart of AssetRepo for the API event loop."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def get_by_symbol(self, symbol: str) -> Asset | None:
+        async with self.session_factory() as s:
+            res = await s.execute(select(Asset).where(Asset.symbol == symbol))
+            return res.scalar_one_or_none()
+
+    async def resolve_many(self, symbols: Iterable[str]) -> dict[str, int]:
+        ids, misses = symbol_map.get_many(symbols)
+        if misses:
+            async with self.session_factory() as s:
+                found = dict((await s.execute(_resolve_query(misses))).all())
+            symbol_map.update(found.items())
+            ids.update(found)
+        return ids
+
+    async def all_ids(self) -> dict[str, int]:
+        async with self.session_factory() as s:
+            found = dict((await s.execute(select(Asset.symbol, Asset.id))).all())
+        symbol_map.update(found.items())
+        return found
+
+    async def ensure_assets(self, assets: list[dict]) -> list[int]:
+        if not assets:
+            return []
+
+        async with self.session_factory() as s:
+            result = (await s.execute(_ensure_assets_stmt(assets))).fetchall()
+            await s.commit()
+        symbol_map.update((sym, asset_id) for asset_id, sym in result)
+        return [r[0] for r in result]
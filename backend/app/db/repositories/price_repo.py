@@ -1,10 +1,145 @@
 """Price repository."""
 
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import select, func, text
 from sqlalchemy.dialects.postgresql import insert
 
-from ..session import SessionLocal
+from ..session import SessionLocal, AsyncSessionLocal
+from ...core.config import settings
+from ..models.asset import Asset
 from ..models.price import Price
 
+# Above this many rows upsert_prices switches from one multi-VALUES INSERT to COPY
+# (4 bind params per row; PostgreSQL caps a statement at 65535).
+BULK_THRESHOLD = 5_000
+BULK_CHUNK_ROWS = 200_000
+
+_STAGE_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS prices_stage (
+    asset_id integer NOT NULL,
+    date date NOT NULL,
+    close numeric(18, 6) NOT NULL,
+    volume numeric(18, 2) NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+_COPY_SQL = "COPY prices_stage (asset_id, date, close, volume) FROM STDIN"
+
+# DISTINCT ON keeps one row per key (the last one copied), which ON CONFLICT requires
+_MERGE_SQL = """
+INSERT INTO prices (asset_id, date, close, volume)
+SELECT DISTINCT ON (asset_id, date) asset_id, date, close, volume
+FROM prices_stage
+ORDER BY asset_id, date, ctid DESC
+ON CONFLICT ON CONSTRAINT uq_prices_asset_date
+DO UPDATE SET close = EXCLUDED.close, volume = EXCLUDED.volume
+"""
+
+# Rolling average volume per asset over bars since window_start (asset_volume_stats).
+# Writes refresh the assets they touched; the nightly job refreshes every asset so
+# the window rolls forward and assets without recent bars drop out.
+_REFRESH_VOLUME_SQL = """
+INSERT INTO asset_volume_stats (asset_id, avg_volume, bars, last_date, window_start, updated_at)
+SELECT asset_id, avg(volume)::float8, count(*), max(date), :start, now() AT TIME ZONE 'utc'
+FROM prices
+WHERE date >= :start {only}
+GROUP BY asset_id
+ON CONFLICT (asset_id) DO UPDATE SET
+    avg_volume = EXCLUDED.avg_volume, bars = EXCLUDED.bars, last_date = EXCLUDED.last_date,
+    window_start = EXCLUDED.window_start, updated_at = EXCLUDED.updated_at
+"""
+
+_DROP_OUT_OF_WINDOW_SQL = "DELETE FROM asset_volume_stats WHERE window_start < :start"
+
+
+def _volume_window_start() -> date:
+    return date.today() - timedelta(days=settings.avg_volume_window_days)
+
+
+def _refresh_volume_stmts(asset_ids) -> list[tuple]:
+    start = _volume_window_start()
+    if asset_ids is None:
+        return [
+            (text(_REFRESH_VOLUME_SQL.format(only="")), {"start": start}),
+            (text(_DROP_OUT_OF_WINDOW_SQL), {"start": start}),
+        ]
+    ids = sorted({int(a) for a in asset_ids})
+    sql = text(_REFRESH_VOLUME_SQL.format(only="AND asset_id = ANY(:ids)"))
+    return [(sql, {"start": start, "ids": ids})] if ids else []
+
+
+# Bumped after every committed price write; readers cache against it (see price_cache)
+_data_version = 0
+
+
+def price_data_version() -> int:
+    return _data_version
+
+
+def _bump_data_version() -> None:
+    global _data_version
+    _data_version += 1
+
+
+def _upsert_prices_stmt(rows: list[dict]):
+    stmt = insert(Price).values(rows)
+    return stmt.on_conflict_do_update(
+        constraint="uq_prices_asset_date",
+        set_={"close": stmt.excluded.close, "volume": stmt.excluded.volume},
+    )
+
+
+def _latest_dates_query(asset_ids: list[int]):
+    return (
+        select(Price.asset_id, func.max(Price.date))
+        .where(Price.asset_id.in_(asset_ids))
+        .group_by(Price.asset_id)
+    )
+
+
+def _volume_stats_query(symbols: list[str], start: date):
+    # one aggregate per symbol over the (asset_id, date) index
+    return (
+        select(Asset.symbol, func.avg(Price.volume), func.max(Price.date))
+        .join(Price, Price.asset_id == Asset.id)
+        .where(Asset.symbol.in_(symbols), Price.date >= start)
+        .group_by(Asset.symbol)
+    )
+
+
+def _rows_to_columns(rows: list[dict]) -> tuple:
+    return (
+        [r["asset_id"] for r in rows],
+        [r["date"] for r in rows],
+        [r["close"] for r in rows],
+        [r.get("volume", 0) for r in rows],
+    )
+
+
+def _columns_to_rows(asset_id: int, dates, close, volume) -> list[dict]:
+    return [
+        {"asset_id": asset_id, "date": d, "close": c, "volume": v}
+        for d, c, v in zip(
+            np.asarray(dates, dtype="datetime64[D]").tolist(),
+            np.asarray(close, dtype=float).tolist(),
+            np.asarray(volume, dtype=float).tolist(),
+        )
+    ]
+
+
+def _copy_rows(asset_ids, dates, close, volume) -> list[tuple]:
+    """COPY-ready python tuples (psycopg adapts date/float/int natively)."""
+    return list(
+        zip(
+            np.asarray(asset_ids, dtype=np.int64).tolist(),
+            np.asarray(dates, dtype="datetime64[D]").tolist(),
+            np.asarray(close, dtype=float).tolist(),
+            np.asarray(volume, dtype=float).tolist(),
+        )
+    )
+
 
 class PriceRepo:
     def __init__(self, session_factory=SessionLocal):
@@ -13,18 +148,170 @@ class PriceRepo:
     def upsert_prices(self, rows: list[dict]) -> int:
         """
         rows: [{'asset_id':1,'date':date(YYYY,MM,DD),'close':float,'volume':float}, ...]
+
+        Large inputs are routed through bulk_upsert (COPY + merge).
         """
         if not rows:
             return 0
 
-        stmt = insert(Price).values(rows)
-        stmt = stmt.on_conflict_do_update(
-            constraint="uq_prices_asset_date",
-            set_={"close": stmt.excluded.close, "volume": stmt.excluded.volume},
-        )
+        if len(rows) > BULK_THRESHOLD:
+            return self.bulk_upsert(*_rows_to_columns(rows))
 
         with self.session_factory() as s:
-            res = s.execute(stmt)
+            res = s.execute(_upsert_prices_stmt(rows))
+            for stmt, params in _refresh_volume_stmts(r["asset_id"] for r in rows):
+                s.execute(stmt, params)
             s.commit()
+            _bump_data_version()
             # rowcount can be -1 if not available, so return len(rows) as fallback
             return res.rowcount if res.rowcount and res.rowcount > 0 else len(rows)
+
+    def upsert_columns(
+        self, asset_id: int, dates: np.ndarray, close: np.ndarray, volume: np.ndarray
+    ) -> int:
+        """Column-oriented variant of upsert_prices: dates as datetime64[D], floats as float64."""
+        if len(dates) > BULK_THRESHOLD:
+            return self.bulk_upsert(np.full(len(dates), asset_id), dates, close, volume)
+        return self.upsert_prices(_columns_to_rows(asset_id, dates, close, volume))
+
+    def bulk_upsert(
+        self,
+        asset_ids,
+        dates,
+        close,
+        volume,
+        chunk_rows: int = BULK_CHUNK_ROWS,
+    ) -> int:
+        """
+        Stream rows with COPY into a session-local temp table, then merge into prices
+        with one INSERT ... SELECT ... ON CONFLICT DO UPDATE per chunk.
+
+        Columns are parallel sequences/arrays (any mix of assets); each chunk commits
+        on its own, so a failure leaves earlier chunks applied (upserts are idempotent).
+        """
+        rows = _copy_rows(asset_ids, dates, close, volume)
+
+        total = 0
+        with self.session_factory() as s:
+            for lo in range(0, len(rows), chunk_rows):
+                conn = s.connection()
+                conn.exec_driver_sql(_STAGE_DDL)
+                with conn.connection.driver_connection.cursor() as cur:
+                    with cur.copy(_COPY_SQL) as copy:
+                        for row in rows[lo : lo + chunk_rows]:
+                            copy.write_row(row)
+                res = conn.exec_driver_sql(_MERGE_SQL)
+                total += res.rowcount if res.rowcount and res.rowcount > 0 else 0
+                s.commit()
+                _bump_data_version()
+            for stmt, params in _refresh_volume_stmts(np.unique(np.asarray(asset_ids)).tolist()):
+                s.execute(stmt, params)
+            s.commit()
+        return total
+
+    def refresh_volume_stats(self, asset_ids: list[int] | None = None) -> None:
+        """Recompute the rolling average volume for asset_ids (all assets when None)."""
+        with self.session_factory() as s:
+            for stmt, params in _refresh_volume_stmts(asset_ids):
+                s.execute(stmt, params)
+            s.commit()
+
+    def latest_dates(self, asset_ids: list[int]) -> dict[int, date]:
+        """Watermark per asset: max stored Price.date, resolved in one query.
+
+        Assets without any stored prices are omitted.
+        """
+        if not asset_ids:
+            return {}
+
+        with self.session_factory() as s:
+            return dict(s.execute(_latest_dates_query(asset_ids)).all())
+
+    def volume_stats(self, symbols: list[str], start: date) -> dict[str, tuple[float, date]]:
+        """{symbol: (average volume, last bar date)} over stored bars since start."""
+        if not symbols:
+            return {}
+
+        with self.session_factory() as s:
+            rows = s.execute(_volume_stats_query(symbols, start)).all()
+        return {sym: (float(avg), last) for sym, avg, last in rows}
+
+
+class AsyncPriceRepo:
+    """asyncio counterpart of PriceRepo for the API event loop."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def upsert_prices(self, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+
+        if len(rows) > BULK_THRESHOLD:
+            return await self.bulk_upsert(*_rows_to_columns(rows))
+
+        async with self.session_factory() as s:
+            res = await s.execute(_upsert_prices_stmt(rows))
+            for stmt, params in _refresh_volume_stmts(r["asset_id"] for r in rows):
+                await s.execute(stmt, params)
+            await s.commit()
+            _bump_data_version()
+            return res.rowcount if res.rowcount and res.rowcount > 0 else len(rows)
+
+    async def upsert_columns(
+        self, asset_id: int, dates: np.ndarray, close: np.ndarray, volume: np.ndarray
+    ) -> int:
+        if len(dates) > BULK_THRESHOLD:
+            return await self.bulk_upsert(np.full(len(dates), asset_id), dates, close, volume)
+        return await self.upsert_prices(_columns_to_rows(asset_id, dates, close, volume))
+
+    async def bulk_upsert(
+        self,
+        asset_ids,
+        dates,
+        close,
+        volume,
+        chunk_rows: int = BULK_CHUNK_ROWS,
+    ) -> int:
+        rows = _copy_rows(asset_ids, dates, close, volume)
+
+        total = 0
+        async with self.session_factory() as s:
+            for lo in range(0, len(rows), chunk_rows):
+                conn = await s.connection()
+                await conn.exec_driver_sql(_STAGE_DDL)
+                raw = await conn.get_raw_connection()
+                async with raw.driver_connection.cursor() as cur:
+                    async with cur.copy(_COPY_SQL) as copy:
+                        for row in rows[lo : lo + chunk_rows]:
+                            await copy.write_row(row)
+                res = await conn.exec_driver_sql(_MERGE_SQL)
+                total += res.rowcount if res.rowcount and res.rowcount > 0 else 0
+                await s.commit()
+                _bump_data_version()
+            for stmt, params in _refresh_volume_stmts(np.unique(np.asarray(asset_ids)).tolist()):
+                await s.execute(stmt, params)
+            await s.commit()
+        return total
+
+    async def refresh_volume_stats(self, asset_ids: list[int] | None = None) -> None:
+        async with self.session_factory() as s:
+            for stmt, params in _refresh_volume_stmts(asset_ids):
+                await s.execute(stmt, params)
+            await s.commit()
+
+    async def latest_dates(self, asset_ids: list[int]) -> dict[int, date]:
+        if not asset_ids:
+            return {}
+
+        async with self.session_factory() as s:
+            res = await s.execute(_latest_dates_query(asset_ids))
+            return dict(res.all())
+
+    async def volume_stats(self, symbols: list[str], start: date) -> dict[str, tuple[float, date]]:
+        if not symbols:
+            return {}
+
+        async with self.session_factory() as s:
+            rows = (await s.execute(_volume_stats_query(symbols, start))).all()
+        return {sym: (float(avg), last) for sym, avg, last in rows}
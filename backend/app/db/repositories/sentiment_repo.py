@@ -0,0 +1,42 @@
+"""Sentiment score cache repository."""
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from ..session import SessionLocal
+from ..models.sentiment_score import SentimentScore
+
+
+class SentimentScoreRepo:
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def get_many(self, hashes: list[str], model: str) -> dict[str, float]:
+        """Stored scores for the text hashes under one model; unknown hashes are omitted."""
+        if not hashes:
+            return {}
+
+        with self.session_factory() as s:
+            rows = s.execute(
+                select(SentimentScore.text_hash, SentimentScore.score)
+                .where(SentimentScore.model == model)
+                .where(SentimentScore.text_hash.in_(hashes))
+            ).all()
+            return dict(rows)
+
+    def put_many(self, scores: dict[str, float], model: str) -> int:
+        """Insert scores for new hashes; scores are deterministic, so existing rows are kept."""
+        if not scores:
+            return 0
+
+        rows = [{"text_hash": h, "model": model, "score": v} for h, v in scores.items()]
+        with self.session_factory() as s:
+            stmt = (
+                insert(SentimentScore)
+                .values(rows)
+                .on_conflict_do_nothing(constraint="uq_sentiment_scores_hash_model")
+                .returning(SentimentScore.id)
+            )
+            inserted = len(s.execute(stmt).fetchall())
+            s.commit()
+            return inserted
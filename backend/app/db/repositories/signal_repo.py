@@ -1,9 +1,46 @@
 """Signal repository."""
 
+from sqlalchemy import select, func
 from sqlalchemy.dialects.postgresql import insert
 
-from ..session import SessionLocal
+from ..session import SessionLocal, AsyncSessionLocal
 from ..models.signal import Signal
+from ..models.asset import Asset
+
+
+def _upsert_signals_stmt(rows: list[dict]):
+    stmt = insert(Signal).values(rows)
+    return stmt.on_conflict_do_update(
+        constraint="uq_signals_asset_date_kind",
+        set_={"value": stmt.excluded.value, "meta": stmt.excluded.meta},
+    )
+
+
+def _latest_by_symbol_query(symbols: list[str], kinds: tuple[str, ...]):
+    latest = (
+        select(Signal.asset_id, Signal.kind, func.max(Signal.date).label("date"))
+        .join(Asset, Asset.id == Signal.asset_id)
+        .where(Asset.symbol.in_(symbols), Signal.kind.in_(kinds))
+        .group_by(Signal.asset_id, Signal.kind)
+        .subquery()
+    )
+    return (
+        select(Asset.symbol, Signal.kind, Signal.date, Signal.value)
+        .join(Signal, Signal.asset_id == Asset.id)
+        .join(
+            latest,
+            (latest.c.asset_id == Signal.asset_id)
+            & (latest.c.kind == Signal.kind)
+            & (latest.c.date == Signal.date),
+        )
+    )
+
+
+def _group_latest(rows) -> dict[str, dict[str, tuple]]:
+    out: dict[str, dict[str, tuple]] = {}
+    for sym, kind, d, value in rows:
+        out.setdefault(sym, {})[kind] = (d, float(value))
+    return out
 
 
 class SignalRepo:
@@ -17,14 +54,49 @@ class SignalRepo:
         if not rows:
             return 0
 
-        stmt = insert(Signal).values(rows)
-        stmt = stmt.on_conflict_do_update(
-            constraint="uq_signals_asset_date_kind",
-            set_={"value": stmt.excluded.value, "meta": stmt.excluded.meta},
-        )
-
         with self.session_factory() as s:
-            res = s.execute(stmt)
+            res = s.execute(_upsert_signals_stmt(rows))
             s.commit()
             # rowcount can be -1 if not available, so return len(rows) as fallback
             return res.rowcount if res.rowcount and res.rowcount > 0 else len(rows)
+
+    def latest_by_symbol(
+        self, symbols: list[str], kinds: tuple[str, ...] = ("momentum", "sentiment")
+    ) -> dict[str, dict[str, tuple]]:
+        """
+        Latest persisted signal per (symbol, kind) in one query.
+
+        Returns {'VOO': {'momentum': (date, value), 'sentiment': (date, value)}, ...};
+        symbols/kinds without any rows are omitted.
+        """
+        if not symbols:
+            return {}
+
+        with self.session_factory() as s:
+            return _group_latest(s.execute(_latest_by_symbol_query(symbols, kinds)).all())
+
+
+class AsyncSignalRepo:
+    """asyncio counterpart of SignalRepo for the API event loop."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def upsert_signals(self, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+
+        async with self.session_factory() as s:
+            res = await s.execute(_upsert_signals_stmt(rows))
+            await s.commit()
+            return res.rowcount if res.rowcount and res.rowcount > 0 else len(rows)
+
+    async def latest_by_symbol(
+        self, symbols: list[str], kinds: tuple[str, ...] = ("momentum", "sentiment")
+    ) -> dict[str, dict[str, tuple]]:
+        if not symbols:
+            return {}
+
+        async with self.session_factory() as s:
+            res = await s.execute(_latest_by_symbol_query(symbols, kinds))
+            return _group_latest(res.all())
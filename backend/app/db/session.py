@@ -1,7 +1,8 @@
 """Database session management."""
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
@@ -9,6 +10,24 @@ from app.core.config import settings
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Same URL: the psycopg (v3) dialect serves both the sync and the asyncio engine.
+async_engine = create_async_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=settings.db_async_pool_size,
+    max_overflow=settings.db_async_max_overflow,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, autocommit=False, expire_on_commit=False
+)
+# Read-only queries: autocommit skips the BEGIN and ROLLBACK round trips around each
+# one. Connections come from the same pool.
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency for getting database session."""
@@ -18,3 +37,9 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an asyncio database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
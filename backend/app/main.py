@@ -34,15 +34,27 @@ async def startup_event() -> None:
     """Application startup event."""
     from loguru import logger
     from app.core.config import settings
+    from app.api.deps import get_sentiment_batcher
+    from app.services.providers.http_clients import http_clients
 
     logger.info("Starting AI Investment Recommender API")
     logger.info(f"Environment: {settings.env}")
+    await http_clients.open()
+    get_sentiment_batcher()
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Application shutdown event."""
     from loguru import logger
+    from app.api.deps import close_sentiment_batcher
+    from app.core.executors import shutdown_executors
+    from app.db.session import async_engine
+    from app.services.providers.http_clients import http_clients
 
     logger.info("Shutting down AI Investment Recommender API")
+    await close_sentiment_batcher()
+    await http_clients.aclose()
+    await async_engine.dispose()
+    shutdown_executors(wait=False)
 
@@ -6,6 +6,7 @@ from app.services.features.optimizer import mean_variance_opt
 from app.services.features.recommender import RecommenderService, DEFAULT_SYMBOLS
 from app.services.features.prices_cov import (
     load_price_matrix,
+    load_price_matrix_async,
     pct_returns,
     cov_matrix,
     daily_log_returns,
@@ -19,6 +20,7 @@ __all__ = [
     "RecommenderService",
     "DEFAULT_SYMBOLS",
     "load_price_matrix",
+    "load_price_matrix_async",
     "pct_returns",
     "cov_matrix",
     "daily_log_returns",
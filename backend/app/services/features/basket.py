@@ -4,25 +4,71 @@ from datetime import date, timedelta
 
 from sqlalchemy import select, func
 
-from ...db.session import SessionLocal
+from ...core.config import settings
+from ...db.session import AsyncReadSessionLocal, SessionLocal
 from ...db.models.asset import Asset
+from ...db.models.asset_volume import AssetVolume
 from ...db.models.price import Price
 
 
-def top_by_avg_volume(k: int = 60, lookback_days: int = 60) -> list[str]:
-    with SessionLocal() as s:
-        end = date.today()
-        start = end - timedelta(days=lookback_days)
-
-        q = (
-            select(Asset.symbol, func.avg(Price.volume).label("avgv"))
-            .join(Price, Price.asset_id == Asset.id)
-            .where(Price.date >= start, Price.date <= end)
-            .group_by(Asset.symbol)
-            .order_by(func.avg(Price.volume).desc())
-            .limit(k)
+def _top_by_avg_volume_query(k: int, lookback_days: int):
+    end = date.today()
+    start = end - timedelta(days=lookback_days)
+
+    return (
+        select(Asset.symbol, func.avg(Price.volume).label("avgv"))
+        .join(Price, Price.asset_id == Asset.id)
+        .where(Price.date >= start, Price.date <= end)
+        .group_by(Asset.symbol)
+        .order_by(func.avg(Price.volume).desc())
+        .limit(k)
+    )
+
+
+def _top_by_rolling_volume_query(k: int, lookback_days: int):
+    # top-k scan of ix_asset_volume_stats_avg_volume. Between nightly refreshes a row
+    # may be a day behind; rows older than that, or for assets with no bar in the
+    # window, are stale and are skipped.
+    start = date.today() - timedelta(days=lookback_days)
+    return (
+        select(Asset.symbol)
+        .join(AssetVolume, AssetVolume.asset_id == Asset.id)
+        .where(
+            AssetVolume.window_start >= start - timedelta(days=1),
+            AssetVolume.last_date >= start,
         )
+        .order_by(AssetVolume.avg_volume.desc())
+        .limit(k)
+    )
+
 
-        rows = s.execute(q).all()
+def _uses_rolling_table(lookback_days: int | None) -> bool:
+    return lookback_days is None or lookback_days == settings.avg_volume_window_days
+
+
+def top_by_avg_volume(k: int = 60, lookback_days: int | None = None) -> list[str]:
+    """
+    Symbols with the highest average volume. The default window is served from the
+    asset_volume_stats summary; other windows (or an empty summary) aggregate prices.
+    """
+    with SessionLocal() as s:
+        if _uses_rolling_table(lookback_days):
+            query = _top_by_rolling_volume_query(k, settings.avg_volume_window_days)
+            rows = s.execute(query).all()
+            if rows:
+                return [r[0] for r in rows]
+        query = _top_by_avg_volume_query(k, lookback_days or settings.avg_volume_window_days)
+        rows = s.execute(query).all()
         return [r[0] for r in rows]
 
+
+async def top_by_avg_volume_async(k: int = 60, lookback_days: int | None = None) -> list[str]:
+    async with AsyncReadSessionLocal() as s:
+        if _uses_rolling_table(lookback_days):
+            query = _top_by_rolling_volume_query(k, settings.avg_volume_window_days)
+            rows = (await s.execute(query)).all()
+            if rows:
+                return [r[0] for r in rows]
+        query = _top_by_avg_volume_query(k, lookback_days or settings.avg_volume_window_days)
+        rows = (await s.execute(query)).all()
+        return [r[0] for r in rows]
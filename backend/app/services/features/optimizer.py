@@ -1,21 +1,124 @@
 """Mean-variance portfolio optimization."""
 
-import cvxpy as cp
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
 import numpy as np
+from loguru import logger
+
+from .projected_gradient import solve_mean_variance_pg
+
+SOLVERS = ("ecos", "numpy")
+DEFAULT_GAMMA = 1.0  # risk aversion hyperparameter (tune later / expose to user)
+_MAX_CACHED_SIZES = 8
+_EIG_TOL = 1e-10
+
+
+def _risk_factor(cov: np.ndarray) -> np.ndarray:
+    """Return F (k x n) with F.T @ F == cov, so w' cov w == ||F w||^2."""
+    cov = 0.5 * (cov + cov.T)
+    try:
+        return np.linalg.cholesky(cov).T
+    except np.linalg.LinAlgError:
+        # PSD but singular (e.g. fewer observations than assets, zero-filled columns):
+        # keep only the non-null eigen directions so the solver sees a k x n factor
+        vals, vecs = np.linalg.eigh(cov)
+        keep = vals > _EIG_TOL * max(vals.max(), 0.0)
+        if not keep.any():
+            return np.zeros((1, cov.shape[0]))
+        return np.sqrt(vals[keep])[:, None] * vecs[:, keep].T
+
+
+class _MeanVarianceProblem:
+    """
+    Parameterized long-only mean-variance problem for a fixed (universe size, factor rank).
+
+    mu, the scaled risk factor sqrt(gamma) * F and max_w are cp.Parameters, so cvxpy
+    canonicalizes the problem once and later solves only swap in new parameter values.
+    """
+
+    def __init__(self, n: int, k: int):
+        import cvxpy as cp  # imported lazily so the numpy backend never pays for it
+
+        self.w = cp.Variable(n)
+        self.mu = cp.Parameter(n)
+        self.factor = cp.Parameter((k, n))
+        self.max_w = cp.Parameter(nonneg=True)
+        objective = cp.Maximize(self.mu @ self.w - cp.sum_squares(self.factor @ self.w))
+        constraints = [cp.sum(self.w) == 1, self.w >= 0, self.w <= self.max_w]
+        self.prob = cp.Problem(objective, constraints)
+        self.lock = threading.Lock()
+
+    def solve(
+        self, mu: np.ndarray, factor: np.ndarray, gamma: float, max_w: float
+    ) -> np.ndarray | None:
+        import cvxpy as cp
 
+        with self.lock:
+            self.mu.value = np.asarray(mu, dtype=float)
+            self.factor.value = np.sqrt(gamma) * factor
+            self.max_w.value = float(max_w)
+            # warm start from the previous solution (kept in self.w.value) where supported
+            try:
+                self.prob.solve(solver=cp.ECOS, warm_start=True, verbose=False)
+            except cp.SolverError:
+                return None
+
+            if self.w.value is None or self.prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+                return None
+            return np.array(self.w.value).flatten()
+
+
+_problems: OrderedDict[tuple[int, int], _MeanVarianceProblem] = OrderedDict()
+_problems_lock = threading.Lock()
+
+
+def _problem_for(n: int, k: int) -> _MeanVarianceProblem:
+    key = (n, k)
+    with _problems_lock:
+        p = _problems.get(key)
+        if p is None:
+            p = _problems[key] = _MeanVarianceProblem(n, k)
+            if len(_problems) > _MAX_CACHED_SIZES:
+                _problems.popitem(last=False)
+        else:
+            _problems.move_to_end(key)
+        return p
+
+
+def _solve_ecos(mu: np.ndarray, cov: np.ndarray, max_w: float, gamma: float) -> np.ndarray | None:
+    factor = _risk_factor(np.asarray(cov, dtype=float))
+    return _problem_for(len(mu), factor.shape[0]).solve(mu, factor, gamma, max_w)
+
+
+def mean_variance_opt(
+    mu: np.ndarray,
+    cov: np.ndarray,
+    max_w: float = 0.35,
+    gamma: float = DEFAULT_GAMMA,
+    solver: str = "ecos",
+):
+    """
+    solver: "ecos" (cvxpy) or "numpy" (accelerated projected gradient, falls back
+    to ECOS if it does not converge).
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}; expected one of {SOLVERS}")
 
-def mean_variance_opt(mu: np.ndarray, cov: np.ndarray, max_w: float = 0.35):
     n = len(mu)
-    w = cp.Variable(n)
-    gamma = 1.0  # risk aversion hyperparameter (tune later / expose to user)
-    objective = cp.Maximize(mu @ w - gamma * cp.quad_form(w, cov))
-    constraints = [cp.sum(w) == 1, w >= 0, w <= max_w]
-    prob = cp.Problem(objective, constraints)
-    prob.solve(solver=cp.ECOS, verbose=False)
-    
+    if solver == "numpy":
+        w = solve_mean_variance_pg(mu, cov, max_w, gamma=gamma)
+        if w is None and n * max_w >= 1:  # infeasible caps go straight to equal weights
+            logger.warning("numpy optimizer did not converge for n={}; falling back to ECOS", n)
+            w = _solve_ecos(mu, cov, max_w, gamma)
+    else:
+        w = _solve_ecos(mu, cov, max_w, gamma)
+
     # Check if solution exists
-    if w.value is None or prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+    if w is None:
         # Fallback to equal weights if optimization fails
         return np.ones(n) / n
-    
-    return np.clip(np.array(w.value).flatten(), 0, 1)
+
+    return np.clip(w, 0, 1)
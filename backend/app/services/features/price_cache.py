@@ -0,0 +1,162 @@
+"""In-process cache of pivoted date x symbol close matrices for load_price_matrix."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from ...core.config import settings
+from ...db.repositories.price_repo import price_data_version
+
+
+@dataclass(frozen=True)
+class PriceBlock:
+    """
+    Raw (not forward-filled) closes for the symbols requested over [start, end].
+
+    Requested symbols without any stored prices are in `requested` but not in `symbols`,
+    so a later request for them can still be answered from this block.
+    """
+
+    start: date
+    end: date
+    requested: frozenset[str]
+    symbols: tuple[str, ...]  # sorted, column order of `values`
+    dates: np.ndarray  # datetime64[D], sorted
+    values: np.ndarray  # (len(dates), len(symbols)), C-contiguous, NaN where missing
+    version: int
+    loaded_at: float
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.dates.nbytes
+
+    def covers(self, symbols: frozenset[str], start: date, end: date) -> bool:
+        return self.start <= start and end <= self.end and symbols <= self.requested
+
+    def frame(self, symbols: frozenset[str], start: date, end: date) -> pd.DataFrame:
+        """Slice to the requested window/columns and apply load_price_matrix's ffill rules."""
+        lo = np.searchsorted(self.dates, np.datetime64(start), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end), side="right")
+        cols = [i for i, s in enumerate(self.symbols) if s in symbols]
+        values = self.values[lo:hi, cols]
+
+        # a fresh query only returns dates where one of the requested symbols traded
+        keep = ~np.isnan(values).all(axis=1)
+        if not cols or not keep.any():
+            return pd.DataFrame()
+        df = pd.DataFrame(
+            values[keep],
+            index=pd.Index(self.dates[lo:hi][keep].astype(object), name="date"),
+            columns=pd.Index([self.symbols[i] for i in cols], name="symbol"),
+        )
+        return df.ffill()
+
+
+def block_from_rows(
+    rows, symbols: list[str], start: date, end: date, version: int, dtype=np.float64
+) -> PriceBlock:
+    """Pivot (symbol, date, close) rows into a PriceBlock (dense NumPy, no long DataFrame)."""
+    if rows:
+        syms, dates, close = zip(*rows)
+        # hash-based factorize: sorting/converting the uniques only, not every row
+        col_idx, col_names = pd.factorize(pd.Series(syms, dtype=object), sort=True)
+        row_idx, uniq_dates = pd.factorize(pd.Series(dates, dtype=object), sort=True)
+        uniq_dates = np.asarray(uniq_dates, dtype="datetime64[D]")
+        values = np.full((len(uniq_dates), len(col_names)), np.nan, dtype=dtype)
+        values[row_idx, col_idx] = np.asarray(close, dtype=float)
+    else:
+        col_names, uniq_dates = [], np.array([], dtype="datetime64[D]")
+        values = np.empty((0, 0), dtype=dtype)
+
+    return PriceBlock(
+        start=start,
+        end=end,
+        requested=frozenset(symbols),
+        symbols=tuple(col_names),
+        dates=uniq_dates,
+        values=np.ascontiguousarray(values),
+        version=version,
+        loaded_at=time.monotonic(),
+    )
+
+
+class PriceMatrixCache:
+    """
+    LRU of PriceBlocks bounded by a memory budget.
+
+    A lookup is served from any block that covers the symbols and date range, as long
+    as no price write committed in this process since it was loaded (PriceRepo bumps
+    price_data_version) and it is younger than the TTL, which bounds staleness from
+    writers in other processes (Celery workers).
+    """
+
+    def __init__(self, max_bytes: int, ttl_secs: float):
+        self.max_bytes = max_bytes
+        self.ttl_secs = ttl_secs
+        self.hits = 0
+        self.misses = 0
+        self._blocks: OrderedDict[tuple, PriceBlock] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, symbols: list[str], start: date, end: date) -> pd.DataFrame | None:
+        wanted = frozenset(symbols)
+        version, now = price_data_version(), time.monotonic()
+        with self._lock:
+            for key, block in reversed(self._blocks.items()):
+                if block.version != version or now - block.loaded_at > self.ttl_secs:
+                    continue
+                if block.covers(wanted, start, end):
+                    self._blocks.move_to_end(key)
+                    self.hits += 1
+                    break
+            else:
+                self.misses += 1
+                return None
+        return block.frame(wanted, start, end)
+
+    def put(self, block: PriceBlock) -> None:
+        if self.max_bytes <= 0 or block.nbytes > self.max_bytes:
+            return
+        key = (block.requested, block.start, block.end)
+        with self._lock:
+            old = self._blocks.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._blocks[key] = block
+            self._bytes += block.nbytes
+            self._evict(price_data_version())
+
+    def _evict(self, version: int) -> None:
+        # outdated blocks can never be served again: drop them first, then LRU order
+        for key in [k for k, b in self._blocks.items() if b.version != version]:
+            self._bytes -= self._blocks.pop(key).nbytes
+        while self._bytes > self.max_bytes and self._blocks:
+            _, block = self._blocks.popitem(last=False)
+            self._bytes -= block.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "blocks": len(self._blocks),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+price_matrix_cache = PriceMatrixCache(
+    max_bytes=settings.price_cache_mb * 1024 * 1024, ttl_secs=settings.price_cache_ttl_secs
+)
@@ -0,0 +1,230 @@
+"""Price ingestion shared by the backfill paths (API, universe build, Celery)."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..providers.errors import is_retryable
+from ...core.config import settings
+from ...db.repositories.price_repo import PriceRepo, AsyncPriceRepo
+
+
+class PriceColumns(NamedTuple):
+    """Typed, column-oriented daily bars for one asset (sorted by date, unique dates)."""
+
+    dates: np.ndarray  # datetime64[D]
+    close: np.ndarray  # float64
+    volume: np.ndarray  # float64
+
+
+def last_complete_bar(end: date) -> date:
+    """Most recent weekday strictly before `end` (provider end dates are exclusive)."""
+    d = end - timedelta(days=1)
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return d
+
+
+def missing_window(last_stored: date | None, start: date, end: date) -> date | None:
+    """
+    First date still to fetch for the window [start, end), given the asset's
+    watermark (max stored Price.date). Returns None when the asset is current.
+
+    Only the tail gap is tracked; use a full refresh to extend history backwards.
+    """
+    if last_stored is None or last_stored < start:
+        return start
+    if last_stored >= last_complete_bar(end):
+        return None
+    return last_stored + timedelta(days=1)
+
+
+def weekdays(start: date, end: date) -> list[date]:
+    """Weekdays in [start, end); exchange holidays are included (providers return no bars)."""
+    return [d.date() for d in pd.bdate_range(start, end - timedelta(days=1))]
+
+
+def normalize_price_frame(df: pd.DataFrame | None) -> PriceColumns:
+    """
+    Coerce a provider frame with date/close/volume columns into typed arrays.
+
+    Dates may be Timestamps, datetime.date objects or strings (tz-aware values are
+    taken in their own timezone); coercion is done for the whole column at once.
+    Rows with a missing date or close are dropped, volume defaults to 0 and
+    duplicate dates keep the last bar.
+    """
+    if df is None or df.empty:
+        empty = np.array([], dtype="datetime64[D]")
+        return PriceColumns(empty, np.array([], dtype=float), np.array([], dtype=float))
+
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_localize(None)
+    d = dates.to_numpy(dtype="datetime64[D]")
+    close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+    volume = pd.to_numeric(df["volume"], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    keep = ~(np.isnat(d) | np.isnan(close))
+    d, close, volume = d[keep], close[keep], volume[keep]
+
+    # sort by date and keep the last bar for each date
+    order = np.argsort(d, kind="stable")
+    d, close, volume = d[order], close[order], volume[order]
+    last = np.ones(d.shape[0], dtype=bool)
+    last[:-1] = d[1:] != d[:-1]
+    return PriceColumns(d[last], close[last], volume[last])
+
+
+def store_price_frame(price_repo: PriceRepo, asset_id: int, df: pd.DataFrame | None) -> int:
+    """Normalize a provider frame and bulk-upsert it for one asset."""
+    cols = normalize_price_frame(df)
+    if not cols.dates.size:
+        return 0
+    return price_repo.upsert_columns(asset_id, cols.dates, cols.close, cols.volume)
+
+
+async def store_price_frame_async(
+    price_repo: AsyncPriceRepo, asset_id: int, df: pd.DataFrame | None
+) -> int:
+    cols = normalize_price_frame(df)
+    if not cols.dates.size:
+        return 0
+    return await price_repo.upsert_columns(asset_id, cols.dates, cols.close, cols.volume)
+
+
+async def grouped_catch_up(
+    market,
+    price_repo: AsyncPriceRepo,
+    asset_ids: dict[str, int],
+    watermarks: dict[int, date],
+    end: date,
+    max_days: int,
+) -> tuple[dict[str, int], list[str]]:
+    """
+    Bring assets up to last_complete_bar(end) with one grouped-daily request per missed
+    weekday (every ticker at once) and a single bulk upsert for all days.
+
+    Only assets with stored history at most max_days weekdays behind are caught up this
+    way; the rest need a per-symbol backfill and are returned as leftovers. Returns
+    ({symbol: bars stored} for the caught-up assets, leftovers).
+    """
+    last = last_complete_bar(end)
+    starts: dict[str, date] = {}
+    leftovers: list[str] = []
+    for sym, asset_id in asset_ids.items():
+        wm = watermarks.get(asset_id)
+        if wm is not None and wm >= last:
+            continue  # current
+        if wm is None or len(weekdays(wm + timedelta(days=1), end)) > max_days:
+            leftovers.append(sym)
+        else:
+            starts[sym] = wm + timedelta(days=1)
+    if not starts:
+        return {}, leftovers
+
+    frames = []
+    for day in weekdays(min(starts.values()), end):
+        df = await market.fetch_grouped_daily(day)
+        frames.append(df[df["symbol"].isin(starts.keys())])
+    bars = pd.concat(frames, ignore_index=True)
+    # the window is shared, so drop days a symbol already had stored
+    bars = bars[bars["date"] >= bars["symbol"].map(starts)]
+
+    if not bars.empty:
+        await price_repo.bulk_upsert(
+            bars["symbol"].map(asset_ids).to_numpy(),
+            pd.to_datetime(bars["date"]).to_numpy(dtype="datetime64[D]"),
+            bars["close"].to_numpy(dtype=float),
+            bars["volume"].fillna(0).to_numpy(dtype=float),
+        )
+    counts = bars["symbol"].value_counts()
+    return {sym: int(counts.get(sym, 0)) for sym in starts}, leftovers
+
+
+async def store_price_frames_async(
+    price_repo: AsyncPriceRepo, frames: dict[int, pd.DataFrame]
+) -> dict[int, int]:
+    """Normalize {asset_id: frame} and write them all with one bulk upsert; bars per asset."""
+    cols = {asset_id: normalize_price_frame(df) for asset_id, df in frames.items()}
+    counts = {asset_id: int(c.dates.size) for asset_id, c in cols.items()}
+    if not any(counts.values()):
+        return counts
+    await price_repo.bulk_upsert(
+        np.concatenate([np.full(c.dates.size, a) for a, c in cols.items()]),
+        np.concatenate([c.dates for c in cols.values()]),
+        np.concatenate([c.close for c in cols.values()]),
+        np.concatenate([c.volume for c in cols.values()]),
+    )
+    return counts
+
+
+async def backfill_many(
+    market,
+    price_repo: AsyncPriceRepo,
+    asset_ids: dict[str, int],
+    start: date,
+    end: date,
+    full_refresh: bool = False,
+) -> dict[str, int]:
+    """
+    Bring every asset in asset_ids up to date over [start, end); bars stored per symbol.
+
+    Each symbol is fetched from its watermark onwards (unless full_refresh). With
+    Polygon grouped daily available, recently refreshed assets are caught up with one
+    request per missed day; the rest are downloaded with fetch_daily_prices_many, one
+    call per distinct start date, and written with a single bulk upsert. Symbols whose
+    fetch fails store 0 bars; after the rest are stored, the first retryable failure
+    (anything not classified permanent) is re-raised so callers such as Celery's
+    RetriableTask retry, and the retry only fetches what is still missing.
+    """
+    watermarks = {} if full_refresh else await price_repo.latest_dates(list(asset_ids.values()))
+
+    upserts = {sym: 0 for sym in asset_ids}
+    if watermarks and market.grouped_daily_available:
+        try:
+            grouped, _ = await grouped_catch_up(
+                market, price_repo, asset_ids, watermarks, end, settings.polygon_grouped_max_days
+            )
+            upserts.update(grouped)
+        except Exception as e:
+            logger.warning(
+                f"Grouped-daily catch-up to {end} failed, fetching per symbol instead: {e}"
+            )
+            grouped = {}  # fall back to per-symbol fetches
+    else:
+        grouped = {}
+
+    # symbols sharing a start date (e.g. all new ones, or all a day behind) share a download
+    pending: dict[date, list[str]] = {}
+    for sym, asset_id in asset_ids.items():
+        if sym in grouped:
+            continue
+        sym_start = missing_window(watermarks.get(asset_id), start, end)
+        if sym_start is not None:
+            pending.setdefault(sym_start, []).append(sym)
+
+    frames: dict[int, pd.DataFrame] = {}
+    failures: list[Exception] = []
+    for sym_start, syms in pending.items():
+        errors: dict[str, Exception] = {}  # per-symbol failures, logged by the provider
+        try:
+            fetched = await market.fetch_daily_prices_many(syms, sym_start, end, errors=errors)
+        except Exception as e:
+            logger.warning(f"Price backfill {sym_start}..{end} failed for {syms}: {e!r}")
+            if is_retryable(e):
+                failures.append(e)
+            continue
+        failures.extend(e for e in errors.values() if is_retryable(e))
+        frames.update((asset_ids[sym], df) for sym, df in fetched.items())
+
+    by_id = await store_price_frames_async(price_repo, frames)
+    ids_to_sym = {asset_id: sym for sym, asset_id in asset_ids.items()}
+    upserts.update((ids_to_sym[a], n) for a, n in by_id.items())
+    if failures:
+        raise failures[0]
+    return upserts
@@ -4,35 +4,60 @@ from __future__ import annotations
 
 import pandas as pd
 from datetime import date
-from sqlalchemy import select
+from sqlalchemy import Float, cast, select
 
-from ...db.session import SessionLocal
+from ...db.session import AsyncReadSessionLocal, SessionLocal
 from ...db.models.price import Price
 from ...db.models.asset import Asset
+from ...db.repositories.price_repo import price_data_version
+from .price_cache import block_from_rows, price_matrix_cache
 
 
-def load_price_matrix(symbols: list[str], start: date, end: date) -> pd.DataFrame:
-    with SessionLocal() as s:
-        q = (
-            select(Asset.symbol, Price.date, Price.close)
-            .join(Price, Price.asset_id == Asset.id)
-            .where(Asset.symbol.in_(symbols))
-            .where(Price.date >= start)
-            .where(Price.date <= end)
-        )
-        rows = s.execute(q).all()
-
-    if not rows:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(rows, columns=["symbol", "date", "close"])
-    df = (
-        df.pivot(index="date", columns="symbol", values="close")
-        .sort_index()
-        .ffill()
-        .dropna(how="all")
+def _price_matrix_query(symbols: list[str], start: date, end: date):
+    # cast in SQL so the driver hands back floats instead of Decimals
+    return (
+        select(Asset.symbol, Price.date, cast(Price.close, Float))
+        .join(Price, Price.asset_id == Asset.id)
+        .where(Asset.symbol.in_(symbols))
+        .where(Price.date >= start)
+        .where(Price.date <= end)
     )
-    return df
+
+
+def load_price_matrix(
+    symbols: list[str], start: date, end: date, use_cache: bool = True
+) -> pd.DataFrame:
+    """
+    date x symbol float64 closes (forward-filled), served from price_matrix_cache when
+    a cached block covers the symbols and window.
+    """
+    if use_cache and (df := price_matrix_cache.get(symbols, start, end)) is not None:
+        return df
+
+    version = price_data_version()  # read before the query: a concurrent write invalidates
+    with SessionLocal() as s:
+        rows = s.execute(_price_matrix_query(symbols, start, end)).all()
+    return _store_block(rows, symbols, start, end, version, use_cache)
+
+
+async def load_price_matrix_async(
+    symbols: list[str], start: date, end: date, use_cache: bool = True
+) -> pd.DataFrame:
+    """asyncio variant of load_price_matrix for the API event loop."""
+    if use_cache and (df := price_matrix_cache.get(symbols, start, end)) is not None:
+        return df
+
+    version = price_data_version()
+    async with AsyncReadSessionLocal() as s:
+        rows = (await s.execute(_price_matrix_query(symbols, start, end))).all()
+    return _store_block(rows, symbols, start, end, version, use_cache)
+
+
+def _store_block(rows, symbols, start, end, version, use_cache) -> pd.DataFrame:
+    block = block_from_rows(rows, symbols, start, end, version)
+    if use_cache:
+        price_matrix_cache.put(block)
+    return block.frame(frozenset(symbols), start, end)
 
 
 def daily_log_returns(price_df: pd.DataFrame) -> pd.DataFrame:
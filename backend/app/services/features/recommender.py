@@ -1,54 +1,151 @@
 """Recommendation service combining signals, risk, and optimization."""
 
+import asyncio
+import time
 import numpy as np
 from datetime import date, timedelta
+from loguru import logger
 
-from .signals import SignalService
+from .signals import SignalService, combined_score
 from .risk import policy_from_risk_level
 from .optimizer import mean_variance_opt
-from .prices_cov import load_price_matrix, cov_matrix
-from .basket import top_by_avg_volume
+from .prices_cov import load_price_matrix_async, cov_matrix
+from .basket import top_by_avg_volume_async
+from ...core.config import settings
+from ...db.repositories.signal_repo import AsyncSignalRepo
 
 DEFAULT_SYMBOLS = ["VOO", "QQQM", "IWM", "EFA", "EMB", "AGG"]
+REFRESH_REQUEUE_SECS = 15 * 60
+
+_refresh_queued_at: dict[str, float] = {}  # symbol -> monotonic time last queued
+_background_tasks: set[asyncio.Task] = set()
 
 
 class RecommenderService:
     def __init__(self, signal_service: SignalService):
         self.signals = signal_service
 
-    async def recommend(self, risk: str, invest_amount: float, symbols: list[str] = None):
-        symbols = symbols or top_by_avg_volume(k=60) or DEFAULT_SYMBOLS
+    async def recommend(
+        self,
+        risk: str,
+        invest_amount: float,
+        symbols: list[str] = None,
+        solver: str | None = None,
+        mode: str | None = None,
+    ):
+        solver = solver or settings.optimizer_solver
+        mode = mode or settings.recommend_mode
+        symbols = symbols or await top_by_avg_volume_async(k=60) or DEFAULT_SYMBOLS
+        requested = symbols
 
-        # ensure data exists & compute signals
-        sigs = []
-        for s in symbols:
-            await self.signals.backfill_prices(s, lookback_days=3 * 365)
-            sigs.append(await self.signals.compute_and_persist(s))
+        refresh_queued: list[str] = []
+        if mode == "cached":
+            # read-only: persisted signals in one query, stale names refreshed in the background
+            sigs, stale = await self._persisted_signals(symbols)
+            refresh_queued = self._queue_refresh(stale)
+            # symbols never scored are left out until their queued refresh lands
+            symbols = [x["symbol"] for x in sigs]
+        else:
+            # ensure data exists & compute signals
+            await self.signals.backfill_prices_many(symbols, lookback_days=3 * 365)
+            sigs = await self.signals.compute_and_persist_many(symbols)
 
-        mu = np.array([x["score"] for x in sigs], dtype=float)
+        allocation: dict[str, float] = {}
+        cov_days = 0
+        if symbols:
+            mu = np.array([x["score"] for x in sigs], dtype=float)
 
-        end, start = date.today(), date.today() - timedelta(days=365)
-        pm = load_price_matrix(symbols, start, end)
+            end, start = date.today(), date.today() - timedelta(days=365)
+            pm = await load_price_matrix_async(symbols, start, end)
+            cov_days = pm.shape[0] if not pm.empty else 0
 
-        if pm.empty or pm.shape[0] < 60:
-            cov = np.eye(len(symbols)) * 0.04
-        else:
-            cov_df = cov_matrix(pm)
-            cov = cov_df.reindex(index=symbols, columns=symbols).fillna(0.0).to_numpy()
+            if pm.empty or pm.shape[0] < 60:
+                cov = np.eye(len(symbols)) * 0.04
+            else:
+                cov_df = cov_matrix(pm)
+                cov = cov_df.reindex(index=symbols, columns=symbols).fillna(0.0).to_numpy()
 
-        policy = policy_from_risk_level(risk)
-        w = mean_variance_opt(mu, cov, max_w=policy.max_weight)
+            policy = policy_from_risk_level(risk)
+            w = mean_variance_opt(mu, cov, max_w=policy.max_weight, solver=solver)
+            allocation = {sym: float(a) for sym, a in zip(symbols, w)}
 
-        allocation = {sym: float(a) for sym, a in zip(symbols, w)}
         dollars = {sym: round(invest_amount * wt, 2) for sym, wt in allocation.items()}
 
         return {
-            "inputs": {"risk": risk, "amount": invest_amount, "symbols": symbols},
+            "inputs": {
+                "risk": risk,
+                "amount": invest_amount,
+                "symbols": requested,
+                "solver": solver,
+                "mode": mode,
+            },
             "signals": sigs,
             "allocation_weights": allocation,
             "allocation_dollars": dollars,
-            "cov_estimation_days": pm.shape[0] if not pm.empty else 0,
+            "cov_estimation_days": cov_days,
+            "refresh_queued": refresh_queued,
             "notes": [
                 "Signals persisted to DB; covariance from realized daily returns (1y fallback to identity)."
             ],
         }
+
+    async def _persisted_signals(self, symbols: list[str]) -> tuple[list[dict], list[str]]:
+        """Latest stored momentum/sentiment per symbol, plus the symbols whose signals are
+        older than the freshness threshold or missing. Symbols without any stored signal
+        are only returned as stale; a missing kind scores 0 until refreshed."""
+        latest = await AsyncSignalRepo().latest_by_symbol(symbols, ("momentum", "sentiment"))
+        cutoff = date.today() - timedelta(days=settings.signal_max_age_days)
+
+        sigs, stale = [], []
+        for sym in symbols:
+            kinds = latest.get(sym, {})
+            mom_date, mom = kinds.get("momentum", (None, 0.0))
+            sen_date, sen = kinds.get("sentiment", (None, 0.0))
+            as_of = min((d for d in (mom_date, sen_date) if d is not None), default=None)
+            is_stale = as_of is None or as_of < cutoff or len(kinds) < 2
+            if is_stale:
+                stale.append(sym)
+            if not kinds:
+                continue
+            sigs.append(
+                {
+                    "symbol": sym,
+                    "date": str(as_of) if as_of else None,
+                    "momentum": mom,
+                    "sentiment": sen,
+                    "score": combined_score(mom, sen),
+                    "stale": is_stale,
+                }
+            )
+        return sigs, stale
+
+    def _queue_refresh(self, symbols: list[str]) -> list[str]:
+        # skip names already queued recently so repeated requests don't pile up jobs
+        now = time.monotonic()
+        symbols = [
+            s
+            for s in symbols
+            if s not in _refresh_queued_at or now - _refresh_queued_at[s] >= REFRESH_REQUEUE_SECS
+        ]
+        if not symbols:
+            return []
+        for s in symbols:
+            _refresh_queued_at[s] = now
+
+        # publishing can block for seconds if the broker is down: keep it off the request path
+        task = asyncio.create_task(asyncio.to_thread(_enqueue_refresh, symbols))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return symbols
+
+
+def _enqueue_refresh(symbols: list[str]) -> None:
+    # imported lazily: the task modules import this package
+    from ..tasks.orchestrate import universe_backfill_and_signals
+
+    try:
+        universe_backfill_and_signals.apply_async(args=(symbols, 3 * 365), retry=False)
+    except Exception as e:
+        logger.warning(f"Could not queue refresh for {len(symbols)} symbols: {e}")
+        for s in symbols:
+            _refresh_queued_at.pop(s, None)
@@ -3,195 +3,250 @@
 from __future__ import annotations
 
 import asyncio
-import pandas as pd
+from collections.abc import Sequence
 from datetime import date, timedelta
 
-from .prices_cov import load_price_matrix, pct_returns
+import numpy as np
+from loguru import logger
+
+from .prices_cov import load_price_matrix_async, pct_returns
+from .price_ingest import backfill_many
 from ..providers.sentiment_provider import SentimentProvider
+from ..providers.sentiment_batcher import SentimentBatcher
 from ..providers.news_provider import NewsProvider
 from ..providers.market_provider import MarketProvider
 from ..providers.universe_provider import UniverseProvider
-from ...db.repositories.signal_repo import SignalRepo
-from ...db.repositories.asset_repo import AssetRepo
-from ...db.repositories.price_repo import PriceRepo
-from ...db.session import SessionLocal
+from ...db.repositories.signal_repo import AsyncSignalRepo
+from ...db.repositories.asset_repo import AsyncAssetRepo
+from ...db.repositories.price_repo import AsyncPriceRepo
 
 
-class SignalService:
-    def __init__(self, market: MarketProvider, news: NewsProvider, sentiment: SentimentProvider):
-        self.market = market
-        self.news = news
-        self.sentiment = sentiment
-        self.signal_repo = SignalRepo()
-        self.asset_repo = AssetRepo()
-        self.price_repo = PriceRepo()
+MOMENTUM_LOOKBACK_DAYS = 60
 
-    async def backfill_prices(self, symbol: str, lookback_days: int = 365 * 3) -> int:
-        end, start = date.today(), date.today() - timedelta(days=lookback_days)
 
-        # ensure asset exists
-        self.asset_repo.ensure_assets([{"symbol": symbol, "name": symbol, "asset_class": "etf"}])
-
-        # fetch & persist
-        df = await self.market.fetch_daily_prices(symbol, start, end)
-
-        # map to asset_id
-        asset = self.asset_repo.get_by_symbol(symbol)
-        if not asset:
-            return 0
-
-        rows = []
-        for _, row in df.iterrows():
-            date_val = row["date"]
-            # Handle different date formats
-            if isinstance(date_val, pd.Timestamp):
-                date_val = date_val.date()
-            elif isinstance(date_val, date):
-                pass  # Already a date object
-            else:
-                # Convert string or other types to date
-                if hasattr(date_val, 'date'):
-                    date_val = date_val.date()
-                else:
-                    date_val = pd.to_datetime(str(date_val)).date()
+def combined_score(momentum: float, sentiment: float) -> float:
+    # weighted sum baseline
+    return 0.7 * momentum + 0.3 * sentiment
 
-            rows.append(
-                {
-                    "asset_id": asset.id,
-                    "date": date_val,
-                    "close": float(row["close"]),
-                    "volume": float(row["volume"]),
-                }
-            )
-        return self.price_repo.upsert_prices(rows)
 
-    async def momentum_signal(self, symbol: str, lb_days: int = 60) -> float:
-        end, start = date.today(), date.today() - timedelta(days=lb_days + 120)
+def momentum_kind(lb_days: int) -> str:
+    """Signal kind for a trailing-return lookback; the default lookback is plain 'momentum'."""
+    return "momentum" if lb_days == MOMENTUM_LOOKBACK_DAYS else f"momentum_{lb_days}d"
+
 
-        pm = load_price_matrix([symbol], start, end)
+def trailing_returns(prices: np.ndarray, lookbacks: Sequence[int]) -> np.ndarray:
+    """
+    Trailing simple returns for every column of a date x symbol close matrix and every
+    lookback (in observations), shape (len(lookbacks), n_symbols).
 
-        if pm.empty or pm.shape[0] < lb_days + 1:
-            await self.backfill_prices(symbol, lookback_days=lb_days + 365)
-            pm = load_price_matrix([symbol], start, end)
+    Missing closes are skipped per column, like Series.dropna(); columns with fewer
+    than lb + 1 closes get NaN.
+    """
+    prices = np.asarray(prices, dtype=float)
+    lbs = np.asarray(lookbacks, dtype=int)
+    out = np.full((len(lbs), prices.shape[1]), np.nan)
+    if prices.shape[0] == 0:
+        return out
 
-        # simple trailing return
-        s = pm[symbol].dropna()
+    # stable sort moves each column's observed closes to the bottom, still in date order
+    valid = ~np.isnan(prices)
+    packed = np.take_along_axis(prices, np.argsort(valid, axis=0, kind="stable"), axis=0)
+    counts = valid.sum(axis=0)
 
-        if len(s) < lb_days + 1:
-            return 0.0
+    last = packed[-1]
+    lag = packed[np.clip(prices.shape[0] - 1 - lbs, 0, None)]  # (len(lbs), n_symbols)
+    ok = counts[None, :] >= lbs[:, None] + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[ok] = ((last - lag) / lag)[ok]
+    return out
 
-        return float((s.iloc[-1] - s.iloc[-lb_days - 1]) / s.iloc[-lb_days - 1])
+
+class SignalService:
+    def __init__(
+        self,
+        market: MarketProvider,
+        news: NewsProvider,
+        sentiment: SentimentProvider,
+        batcher: SentimentBatcher | None = None,
+    ):
+        self.market = market
+        self.news = news
+        self.sentiment = sentiment
+        self.sentiment_batcher = batcher or SentimentBatcher(sentiment)
+        self.signal_repo = AsyncSignalRepo()
+        self.asset_repo = AsyncAssetRepo()
+        self.price_repo = AsyncPriceRepo()
+
+    async def backfill_prices(
+        self, symbol: str, lookback_days: int = 365 * 3, full_refresh: bool = False
+    ) -> int:
+        return (await self.backfill_prices_many([symbol], lookback_days, full_refresh))[symbol]
+
+    async def backfill_prices_many(
+        self, symbols: list[str], lookback_days: int = 365 * 3, full_refresh: bool = False
+    ) -> dict[str, int]:
+        """
+        Fetch and persist missing daily bars for all symbols at once: {symbol: bars}.
+        Unknown symbols are created as assets first.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        end, start = date.today(), date.today() - timedelta(days=lookback_days)
+
+        # map to asset_ids, creating assets on first sight
+        ids = await self.asset_repo.resolve_many(symbols)
+        missing = [s for s in symbols if s not in ids]
+        if missing:
+            await self.asset_repo.ensure_assets(
+                [{"symbol": s, "name": s, "asset_class": "etf"} for s in missing]
+            )
+            ids = await self.asset_repo.resolve_many(symbols)
+
+        # only fetch the gap after each asset's last stored bar
+        upserts = await backfill_many(
+            self.market, self.price_repo, ids, start, end, full_refresh=full_refresh
+        )
+        return {s: upserts.get(s, 0) for s in symbols}
+
+    async def momentum_signal(self, symbol: str, lb_days: int = MOMENTUM_LOOKBACK_DAYS) -> float:
+        return (await self.momentum_signals([symbol], (lb_days,)))[lb_days][symbol]
+
+    async def momentum_signals(
+        self, symbols: list[str], lookbacks: Sequence[int] = (MOMENTUM_LOOKBACK_DAYS,)
+    ) -> dict[int, dict[str, float]]:
+        """
+        Trailing returns for all symbols and lookbacks from one price-matrix load:
+        {lb_days: {symbol: return}}. Symbols short on history are backfilled once and
+        the matrix reloaded; those still short score 0.0.
+        """
+        max_lb = max(lookbacks)
+        end, start = date.today(), date.today() - timedelta(days=max_lb + 120)
+
+        async def load() -> np.ndarray:
+            pm = await load_price_matrix_async(symbols, start, end)
+            return trailing_returns(pm.reindex(columns=symbols).to_numpy(dtype=float), lookbacks)
+
+        rets = await load()
+        short = [s for s, col in zip(symbols, rets.T) if np.isnan(col).any()]
+        if short:
+            # not enough history: a watermark-based gap fill would not extend it backwards
+            try:
+                await self.backfill_prices_many(
+                    short, lookback_days=max_lb + 365, full_refresh=True
+                )
+            except Exception as e:
+                logger.warning(f"History backfill for {short} failed, using stored bars: {e!r}")
+            rets = await load()
+
+        rets = np.nan_to_num(rets, nan=0.0)
+        return {lb: dict(zip(symbols, row.tolist())) for lb, row in zip(lookbacks, rets)}
 
     async def sentiment_signal(self, symbol: str, limit: int = 30) -> float:
+        """
+        Headline sentiment; concurrent calls share FinBERT batches via the batcher and
+        headline fetches are bounded by the news provider's adaptive concurrency limit.
+        """
         items = await self.news.fetch_headlines(symbol, limit)
         texts = [f"{x.get('title', '')} {x.get('text', '')}" for x in items]
-        score = self.sentiment.score_texts(texts)
-        return float(score)
+        return await self.sentiment_batcher.score_texts(texts)
 
     async def compute_and_persist(self, symbol: str, date_for: date | None = None) -> dict:
+        return (await self.compute_and_persist_many([symbol], date_for))[0]
+
+    async def compute_and_persist_many(
+        self,
+        symbols: list[str],
+        date_for: date | None = None,
+        lookbacks: Sequence[int] = (MOMENTUM_LOOKBACK_DAYS,),
+    ) -> list[dict]:
+        """
+        Momentum for every symbol and lookback in one batch, sentiment for all symbols
+        concurrently (headlines scored in shared FinBERT micro-batches), and all rows
+        persisted with a single upsert_signals call.
+        """
         date_for = date_for or date.today()
+        symbols = list(dict.fromkeys(symbols))  # one row per (asset, date, kind) per upsert
+        score_lb = MOMENTUM_LOOKBACK_DAYS if MOMENTUM_LOOKBACK_DAYS in lookbacks else lookbacks[0]
+
+        mom = await self.momentum_signals(symbols, lookbacks)
+        scores = await asyncio.gather(*[self.sentiment_signal(s) for s in symbols])
+        sen = dict(zip(symbols, scores))
+        ids = await self.asset_repo.resolve_many(symbols)
+
+        rows, out = [], []
+        for s in symbols:
+            if s not in ids:
+                out.append({"symbol": s, "error": "Asset not found"})
+                continue
+
+            for lb in lookbacks:
+                rows.append(
+                    {
+                        "asset_id": ids[s],
+                        "date": date_for,
+                        "kind": momentum_kind(lb),
+                        "value": mom[lb][s],
+                        "meta": {"lookback_days": lb},
+                    }
+                )
+            rows.append(
+                {
+                    "asset_id": ids[s],
+                    "date": date_for,
+                    "kind": "sentiment",
+                    "value": sen[s],
+                    "meta": {},
+                }
+            )
 
-        mom = await self.momentum_signal(symbol)
-        sen = await self.sentiment_signal(symbol)
+            m = mom[score_lb][s]
+            out.append(
+                {
+                    "symbol": s,
+                    "date": str(date_for),
+                    "momentum": m,
+                    "sentiment": sen[s],
+                    "score": combined_score(m, sen[s]),
+                }
+            )
 
-        asset = self.asset_repo.get_by_symbol(symbol)
-        if not asset:
-            return {"symbol": symbol, "error": "Asset not found"}
-
-        rows = [
-            {
-                "asset_id": asset.id,
-                "date": date_for,
-                "kind": "momentum",
-                "value": mom,
-                "meta": {},
-            },
-            {
-                "asset_id": asset.id,
-                "date": date_for,
-                "kind": "sentiment",
-                "value": sen,
-                "meta": {},
-            },
-        ]
-
-        self.signal_repo.upsert_signals(rows)
-
-        return {
-            "symbol": symbol,
-            "date": str(date_for),
-            "momentum": mom,
-            "sentiment": sen,
-            "score": 0.7 * mom + 0.3 * sen,
-        }
+        await self.signal_repo.upsert_signals(rows)
+        return out
 
     async def combine(self, symbol: str) -> dict:
         """Backward compatibility: compute signals without persisting."""
         mom = await self.momentum_signal(symbol)
         sen = await self.sentiment_signal(symbol)
-        # weighted sum baseline
-        value = 0.7 * mom + 0.3 * sen
+        value = combined_score(mom, sen)
         return {"symbol": symbol, "momentum": mom, "sentiment": sen, "score": value}
 
 
 class UniverseService:
     def __init__(self, universe: UniverseProvider, market: MarketProvider):
         self.universe = universe
-        self.asset_repo = AssetRepo()
-        self.price_repo = PriceRepo()
+        self.asset_repo = AsyncAssetRepo()
+        self.price_repo = AsyncPriceRepo()
         self.market = market
 
-    async def ensure_assets_and_backfill(self, count: int = 100, lookback_days: int = 365 * 3) -> dict:
+    async def ensure_universe(self, count: int = 100) -> list[str]:
+        """Current universe (core ETFs + top volume), persisted as assets."""
         symbols = await self.universe.expanded_universe(count=count)
-        # 1) persist assets
-        self.asset_repo.ensure_assets([{"symbol": s, "name": s, "asset_class": "equity"} for s in symbols])
+        await self.asset_repo.ensure_assets(
+            [{"symbol": s, "name": s, "asset_class": "equity"} for s in symbols]
+        )
+        return symbols
 
-        # 2) get asset_ids
-        with SessionLocal() as s:
-            ids = {s: self.asset_repo.get_by_symbol(s).id for s in symbols}
+    async def ensure_assets_and_backfill(
+        self, count: int = 100, lookback_days: int = 365 * 3, full_refresh: bool = False
+    ) -> dict:
+        # 1) pick the universe and persist assets
+        symbols = await self.ensure_universe(count=count)
 
-        # 3) batch backfill concurrently
-        end, start = date.today(), date.today() - timedelta(days=lookback_days)
+        # 2) get asset_ids (filled from ensure_assets' RETURNING, no extra queries)
+        ids = await self.asset_repo.resolve_many(symbols)
 
-        async def fetch_and_upsert(sym: str) -> tuple[str, int]:
-            try:
-                df = await self.market.fetch_daily_prices(sym, start, end)
-                if df is None or df.empty:
-                    return (sym, 0)
-
-                rows = []
-                for _, row in df.iterrows():
-                    date_val = row["date"]
-                    # Handle different date formats
-                    if isinstance(date_val, pd.Timestamp):
-                        date_val = date_val.date()
-                    elif isinstance(date_val, date):
-                        pass  # Already a date object
-                    else:
-                        # Convert string or other types to date
-                        if hasattr(date_val, "date"):
-                            date_val = date_val.date()
-                        else:
-                            date_val = pd.to_datetime(str(date_val)).date()
-
-                    rows.append(
-                        {
-                            "asset_id": ids[sym],
-                            "date": date_val,
-                            "close": float(row["close"]),
-                            "volume": float(row["volume"]),
-                        }
-                    )
-                n = self.price_repo.upsert_prices(rows)
-                return (sym, n)
-            except Exception:
-                return (sym, 0)
-
-        sem = asyncio.Semaphore(10)  # limit concurrency
-
-        async def guarded(sym: str):
-            async with sem:
-                return await fetch_and_upsert(sym)
-
-        results = await asyncio.gather(*[guarded(s) for s in symbols])
-        return {"symbols": symbols, "upserts": {k: v for k, v in results}}
+        # 3) batch backfill, each symbol only from its watermark onwards
+        end, start = date.today(), date.today() - timedelta(days=lookback_days)
+        upserts = await backfill_many(
+            self.market, self.price_repo, ids, start, end, full_refresh=full_refresh
+        )
+        return {"symbols": symbols, "upserts": {s: upserts.get(s, 0) for s in symbols}}
@@ -0,0 +1,185 @@
+"""Adaptive (AIMD) concurrency limits for provider fan-out, one per upstream."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from ...core.config import settings
+from .errors import is_overload
+
+LATENCY_ALPHA = 0.2  # EWMA weight of each latency sample
+BASELINE_DRIFT = 0.01  # how fast the no-load latency baseline follows slower samples
+
+
+def _wake(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that follows what the upstream can take (AIMD, like TCP).
+
+    Every request holds a slot while in flight. A healthy response while at least half
+    the slots are busy adds 1/limit (about +1 per round of requests); a throttled or
+    failed one (429, 5xx, timeout) or an EWMA latency above latency_tolerance times
+    the baseline multiplies the limit by backoff, at most once per observed latency so
+    a burst of 429s from one round counts once.
+
+    Waiters are futures on their own loop and the state is guarded by a thread lock,
+    so one limiter serves every event loop in the process (API, worker loop, tests).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: float | None = None,
+        min_limit: float | None = None,
+        max_limit: float | None = None,
+        backoff: float | None = None,
+        latency_tolerance: float | None = None,
+    ):
+        self.name = name
+        self.min_limit = min_limit if min_limit is not None else settings.adaptive_concurrency_min
+        self.max_limit = max_limit if max_limit is not None else settings.adaptive_concurrency_max
+        self.backoff = backoff if backoff is not None else settings.adaptive_concurrency_backoff
+        self.latency_tolerance = (
+            latency_tolerance
+            if latency_tolerance is not None
+            else settings.adaptive_latency_tolerance
+        )
+        initial = initial if initial is not None else settings.adaptive_concurrency_initial
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.latency: float | None = None  # EWMA of healthy responses, seconds
+        self.baseline: float | None = None  # latency without queueing at the upstream
+        self.successes = 0
+        self.drops = 0
+        self.backoffs = 0
+        self.max_in_flight = 0
+        self._next_backoff = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._handed: set[asyncio.Future] = set()  # granted a slot, not yet woken
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self._take()
+                return
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                handed = fut in self._handed
+                self._handed.discard(fut)
+            if handed:  # a slot was handed over as we were cancelled
+                self.release(None, dropped=False)
+            raise
+        with self._lock:
+            self._handed.discard(fut)
+
+    def release(self, latency: float | None, dropped: bool) -> None:
+        """Free a slot; latency None (cancelled request) leaves the limit as it is."""
+        with self._lock:
+            self.in_flight -= 1
+            if latency is not None or dropped:
+                self._update(latency, dropped)
+            while self._waiters and self.in_flight < int(self.limit):
+                fut = self._waiters.popleft()
+                if fut.cancelled():
+                    continue
+                self._take()
+                self._handed.add(fut)
+                fut.get_loop().call_soon_threadsafe(_wake, fut)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot around one upstream request; its outcome adjusts the limit."""
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.release(None, dropped=False)
+            raise
+        except BaseException as e:
+            self.release(time.perf_counter() - started, dropped=is_overload(e))
+            raise
+        else:
+            self.release(time.perf_counter() - started, dropped=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "max_in_flight": self.max_in_flight,
+                "latency_ms": round(self.latency * 1e3, 1) if self.latency is not None else None,
+                "baseline_ms": round(self.baseline * 1e3, 1) if self.baseline is not None else None,
+                "successes": self.successes,
+                "drops": self.drops,
+                "backoffs": self.backoffs,
+            }
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _update(self, latency: float | None, dropped: bool) -> None:
+        congested = dropped
+        if dropped:
+            self.drops += 1
+        else:
+            self.successes += 1
+            self.latency = latency if self.latency is None else (
+                self.latency + LATENCY_ALPHA * (latency - self.latency)
+            )
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += BASELINE_DRIFT * (latency - self.baseline)
+            congested = self.latency > self.latency_tolerance * self.baseline
+
+        if congested:
+            now = time.monotonic()
+            if now >= self._next_backoff:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.backoffs += 1
+                self._next_backoff = now + (self.latency or latency or 0.0)
+        elif self.in_flight + 1 >= self.limit / 2:
+            # only grow a limit that is actually being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class ConcurrencyLimits:
+    """One AdaptiveLimiter per upstream, created on first use with the given settings."""
+
+    def __init__(self, **limiter_kwargs):
+        self._kwargs = limiter_kwargs
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, upstream: str) -> AdaptiveLimiter:
+        with self._lock:
+            if upstream not in self._limiters:
+                self._limiters[upstream] = AdaptiveLimiter(upstream, **self._kwargs)
+            return self._limiters[upstream]
+
+    def stats(self) -> dict:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {"upstreams": {lim.name: lim.stats() for lim in limiters}}
+
+
+concurrency_limits = ConcurrencyLimits()
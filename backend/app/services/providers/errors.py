@@ -0,0 +1,52 @@
+"""Classified provider errors: what is worth retrying and what is not."""
+
+from __future__ import annotations
+
+import httpx
+
+
+class ProviderError(Exception):
+    """Base class of classified provider failures."""
+
+
+class PermanentProviderError(ProviderError):
+    """A failure retrying will not fix (bad request, auth, unknown symbol)."""
+
+
+class NoDataError(PermanentProviderError, ValueError):
+    """The provider has no bars for the symbol (delisted, unknown or bad ticker)."""
+
+
+class UnconfirmedNoDataError(NoDataError):
+    """No bars and no reason given: yfinance answers outages and throttling the same way,
+    so this is not negatively cached."""
+
+
+class TransientProviderError(ProviderError):
+    """Timeouts, connection failures, throttling (429) and 5xx: worth retrying."""
+
+
+def classify_http_error(exc: Exception) -> Exception:
+    """Map an httpx failure onto the classified errors (anything else is returned as is)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status == 429 or status >= 500:
+            return TransientProviderError(str(exc))
+        if status == 404:
+            return NoDataError(str(exc))
+        return PermanentProviderError(str(exc))
+    if isinstance(exc, httpx.TransportError):  # timeouts, connect and read errors
+        return TransientProviderError(str(exc))
+    return exc
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Retry everything except errors classified as permanent."""
+    return not isinstance(exc, PermanentProviderError)
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Throttling, 5xx, timeouts and connection failures: the upstream wants less load."""
+    if isinstance(exc, httpx.HTTPError):
+        exc = classify_http_error(exc)
+    return isinstance(exc, TransientProviderError)
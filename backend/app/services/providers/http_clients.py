@@ -0,0 +1,120 @@
+"""Shared pooled HTTP clients, one long-lived httpx.AsyncClient per upstream host."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+
+import httpx
+from loguru import logger
+
+from ...core.config import settings
+
+
+def upstream_base_urls() -> dict[str, str]:
+    return {
+        "polygon": settings.polygon_base_url,
+        "newsapi": settings.newsapi_base_url,
+        "google_news": settings.google_news_base_url,
+    }
+
+
+class HttpClientManager:
+    """
+    Keeps one pooled AsyncClient per upstream so keep-alive connections (and their
+    TCP/TLS handshakes) are reused across requests.
+
+    httpx connections belong to the event loop that opened them, so clients are held
+    per running loop: the API has one loop for its lifetime, while Celery tasks that run
+    on a fresh loop share clients for that task and close them before the loop ends.
+    """
+
+    def __init__(
+        self,
+        base_urls: dict[str, str] | None = None,
+        max_connections: int | None = None,
+        max_keepalive: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool | None = None,
+        timeout: float | None = None,
+        **client_kwargs,
+    ):
+        self.base_urls = base_urls if base_urls is not None else upstream_base_urls()
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.http_max_connections,
+            max_keepalive_connections=max_keepalive or settings.http_max_keepalive,
+            keepalive_expiry=(
+                keepalive_expiry if keepalive_expiry is not None
+                else settings.http_keepalive_expiry_secs
+            ),
+        )
+        self.http2 = settings.http_http2 if http2 is None else http2
+        self.timeout = timeout or settings.http_timeout_secs
+        self.client_kwargs = client_kwargs
+        self.opened = 0
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """Pooled client for upstream on the running loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(upstream)
+            if client is None or client.is_closed:
+                client = clients[upstream] = self._open(upstream)
+            return client
+
+    async def open(self) -> None:
+        """Create the clients for every upstream up front on the running loop."""
+        for upstream in self.base_urls:
+            self.get(upstream)
+
+    async def aclose(self) -> None:
+        """Close the clients bound to the running loop."""
+        with self._lock:
+            clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+    def reset(self) -> None:
+        """Forget every client without closing it (e.g. in a forked child process)."""
+        with self._lock:
+            self._clients = weakref.WeakKeyDictionary()
+
+    def stats(self) -> dict:
+        with self._lock:
+            live = sum(
+                not c.is_closed for clients in self._clients.values() for c in clients.values()
+            )
+            return {
+                "opened": self.opened,
+                "live": live,
+                "http2": self.http2,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive": self.limits.max_keepalive_connections,
+            }
+
+    def _open(self, upstream: str) -> httpx.AsyncClient:
+        if upstream not in self.base_urls:
+            raise KeyError(f"Unknown upstream {upstream!r}; expected one of {list(self.base_urls)}")
+        kwargs = dict(
+            base_url=self.base_urls[upstream],
+            limits=self.limits,
+            timeout=self.timeout,
+            **self.client_kwargs,
+        )
+        self.opened += 1
+        if self.http2:
+            try:
+                return httpx.AsyncClient(http2=True, **kwargs)
+            except ImportError as e:
+                logger.warning(f"HTTP/2 unavailable, using HTTP/1.1 ({e}); pip install .[http2]")
+                self.http2 = False
+        return httpx.AsyncClient(**kwargs)
+
+
+http_clients = HttpClientManager()
@@ -2,70 +2,325 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import date, datetime, timedelta
 import pandas as pd
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from loguru import logger
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 import os
 
+from ...core.config import settings
+from ...core.executors import thread_pool
+from .concurrency import AdaptiveLimiter, ConcurrencyLimits, concurrency_limits
+from .errors import (
+    NoDataError,
+    UnconfirmedNoDataError,
+    classify_http_error,
+    is_overload,
+    is_retryable,
+)
+from .http_clients import HttpClientManager, http_clients
+from .negative_cache import NegativeCache, negative_cache
+from .rate_limiter import RateLimiter, rate_limiter
+
 try:
     import yfinance as yf
 except Exception:
     yf = None
 
 
+def yfinance_pool():
+    """Process-wide bounded thread pool for blocking yfinance calls."""
+    return thread_pool("yfinance", settings.yfinance_threads)
+
+
+def _timed_download(tickers, **kwargs) -> tuple[pd.DataFrame | None, float, Exception | None]:
+    # runs on a yfinance pool thread; the duration excludes the wait for a pool thread
+    started = time.perf_counter()
+    try:
+        return yf.download(tickers, **kwargs), time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, e
+
+
+async def _yahoo_download(
+    limiter: RateLimiter, slots: AdaptiveLimiter, tickers, **kwargs
+) -> pd.DataFrame:
+    """
+    yf.download on the bounded yfinance pool, after taking a yahoo token per ticker
+    (it requests each ticker separately) and within an adaptive yahoo slot. Only the
+    download itself is reported to the slot, so the token wait and pool queueing are
+    not mistaken for upstream latency.
+    """
+    await limiter.acquire_async("yahoo", len(tickers) if isinstance(tickers, list) else 1)
+    await slots.acquire()
+    secs, dropped = None, False
+    try:
+        df, secs, error = await yfinance_pool().run(_timed_download, tickers, **kwargs)
+        if error is not None:
+            dropped = is_overload(error)
+            raise error
+        return df
+    finally:
+        slots.release(secs, dropped)
+
+
+def _yfinance_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """One ticker's flat yfinance frame (Date index, Close/Volume columns) as date/close/volume."""
+    # Reset index to get Date as a column
+    df = df.reset_index()
+
+    # Rename columns
+    df = df.rename(columns={"Close": "close", "Volume": "volume", "Date": "date"})
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+
+    # Select only needed columns
+    return df[["date", "close", "volume"]].dropna()
+
+
+def split_yfinance_download(df: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """
+    Split a multi-ticker yf.download(group_by="ticker") result, whose columns are a
+    (ticker, field) MultiIndex, into per-symbol date/close/volume frames. Tickers that
+    failed or have no bars in the window are omitted.
+    """
+    if df is None or df.empty:
+        return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        # a single ticker may come back flat
+        frame = _yfinance_frame(df) if len(symbols) == 1 else pd.DataFrame()
+        return {symbols[0]: frame} if not frame.empty else {}
+
+    present = set(df.columns.get_level_values(0))
+    out = {}
+    for sym in symbols:
+        if sym not in present:
+            continue
+        frame = _yfinance_frame(df[sym])
+        if not frame.empty:
+            out[sym] = frame
+    return out
+
+
+async def fetch_yfinance_many(
+    symbols: list[str],
+    start: date,
+    end: date,
+    chunk_size: int | None = None,
+    limiter: RateLimiter | None = None,
+    concurrency: ConcurrencyLimits | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Download symbols with one threaded yf.download call per chunk_size tickers; chunks
+    run on the bounded yfinance pool, each after taking its tickers' worth of the yahoo
+    rate limit, with no more in flight than the adaptive yahoo concurrency limit.
+    Returns {symbol: date/close/volume frame}.
+    """
+    if yf is None:
+        raise RuntimeError("yfinance not installed")
+    limiter = limiter or rate_limiter
+    slots = (concurrency or concurrency_limits).get("yahoo")
+    chunk_size = chunk_size or settings.yfinance_chunk_size
+    chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    async def download(chunk: list[str]) -> dict[str, pd.DataFrame]:
+        df = await _yahoo_download(
+            limiter, slots, chunk, start=start, end=end, group_by="ticker",
+            threads=True, progress=False, auto_adjust=False,
+        )
+        return split_yfinance_download(df, chunk)
+
+    out: dict[str, pd.DataFrame] = {}
+    for frames in await asyncio.gather(*[download(c) for c in chunks]):
+        out.update(frames)
+    return out
+
+
+def _conclusive_window(start: date, end: date) -> bool:
+    # a short gap (weekend, holiday, provider lag) can be legitimately empty
+    return (end - start).days >= settings.negative_cache_min_window_days
+
+
 class MarketProvider:
-    def __init__(self, polygon_api_key: str | None = None):
+    def __init__(
+        self,
+        polygon_api_key: str | None = None,
+        clients: HttpClientManager | None = None,
+        no_data: NegativeCache | None = None,
+        limiter: RateLimiter | None = None,
+        concurrency: ConcurrencyLimits | None = None,
+    ):
         self.polygon_api_key = polygon_api_key or os.getenv("POLYGON_API_KEY")
+        self.clients = clients or http_clients
+        self.no_data = no_data or negative_cache
+        self.limiter = limiter or rate_limiter
+        self.concurrency = concurrency or concurrency_limits
+
+    @property
+    def source(self) -> str:
+        return "polygon" if self.polygon_api_key else "yfinance"
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
     async def fetch_daily_prices(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        """
+        Daily date/close/volume bars for [start, end). Raises NoDataError without a
+        request for symbols cached as having no data, and caches new no-data symbols
+        when the window was long enough for "empty" to mean "no such data" and the
+        provider's answer was conclusive (not an unexplained empty yfinance frame).
+        """
+        if await self.no_data.contains_async(self.source, symbol):
+            raise NoDataError(f"No {self.source} data for {symbol} (cached)")
+        try:
+            return await self._fetch_daily_prices(symbol, start, end)
+        except UnconfirmedNoDataError:
+            raise
+        except NoDataError:
+            if _conclusive_window(start, end):
+                await self.no_data.add_async(self.source, [symbol])
+            raise
+
+    # only transient failures are retried; NoDataError and other permanent errors are not
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=8),
+        reraise=True,  # surface the classified error, not tenacity's RetryError
+    )
+    async def _fetch_daily_prices(self, symbol: str, start: date, end: date) -> pd.DataFrame:
         # Prefer Polygon if key provided; otherwise yfinance
         if self.polygon_api_key:
             return await self._fetch_polygon(symbol, start, end)
         return await self._fetch_yfinance(symbol, start, end)
 
+    @property
+    def grouped_daily_available(self) -> bool:
+        return bool(self.polygon_api_key) and settings.polygon_grouped_daily
+
+    async def fetch_grouped_daily(self, day: date) -> pd.DataFrame:
+        """
+        Every US stock's bar for one day from a single Polygon grouped-daily request, as
+        symbol/date/close/volume rows. Empty on weekends and market holidays.
+        """
+        if not self.polygon_api_key:
+            raise RuntimeError("Grouped daily bars need POLYGON_API_KEY")
+        return await self._fetch_polygon_grouped(day)
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=8),
+        reraise=True,
+    )
+    async def _fetch_polygon_grouped(self, day: date) -> pd.DataFrame:
+        url = f"/v2/aggs/grouped/locale/us/market/stocks/{day}"
+        params = {"adjusted": "true", "apiKey": self.polygon_api_key}
+
+        await self.limiter.acquire_async("polygon")
+        try:
+            async with self.concurrency.get("polygon").slot():
+                r = await self.clients.get("polygon").get(url, params=params, timeout=60)
+                r.raise_for_status()
+        except httpx.HTTPError as e:
+            raise classify_http_error(e) from e
+        results = r.json().get("results") or []
+
+        return pd.DataFrame(
+            {
+                "symbol": [x["T"] for x in results],
+                "date": [day] * len(results),
+                "close": [float(x["c"]) for x in results],
+                "volume": [float(x.get("v", 0)) for x in results],
+            }
+        )
+
+    async def fetch_daily_prices_many(
+        self,
+        symbols: list[str],
+        start: date,
+        end: date,
+        chunk_size: int | None = None,
+        errors: dict[str, Exception] | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Daily date/close/volume frames for many symbols: {symbol: frame}. yfinance
+        downloads chunk_size tickers per call; Polygon fetches per symbol concurrently,
+        as many at a time as the adaptive polygon concurrency limit allows. Symbols
+        without data are omitted. Other per-symbol failures are logged and, when an
+        errors dict is given, collected there so the caller can store the frames that did
+        arrive before acting on them; without one the first retryable failure is raised.
+        """
+        symbols, _ = await self.no_data.filter_async(self.source, dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        if not self.polygon_api_key:
+            # yfinance reports per-ticker failures (throttling and network errors included)
+            # as missing tickers, so batch misses are never negatively cached
+            return await fetch_yfinance_many(
+                symbols, start, end, chunk_size, self.limiter, self.concurrency
+            )
+
+        results = await asyncio.gather(
+            *[self.fetch_daily_prices(s, start, end) for s in symbols], return_exceptions=True
+        )
+        out: dict[str, pd.DataFrame] = {}
+        failed: dict[str, Exception] = {}
+        for sym, res in zip(symbols, results, strict=True):
+            if isinstance(res, pd.DataFrame):
+                out[sym] = res
+            elif not isinstance(res, Exception):
+                raise res  # cancellation
+            elif not isinstance(res, NoDataError):
+                failed[sym] = res
+        if failed:
+            sym, first = next(iter(failed.items()))
+            logger.warning(
+                f"Polygon fetch {start}..{end} failed for {len(failed)} of {len(symbols)} "
+                f"symbols (first: {sym}: {first!r})"
+            )
+            if errors is not None:
+                errors.update(failed)
+            else:
+                retryable = [e for e in failed.values() if is_retryable(e)]
+                if retryable:
+                    raise retryable[0]
+        return out
+
     async def _fetch_yfinance(self, symbol: str, start: date, end: date) -> pd.DataFrame:
         if yf is None:
             raise RuntimeError("yfinance not installed")
-        # yfinance is sync; call in thread if you wish; here keep simple
-        df = yf.download(symbol, start=start, end=end, progress=False, auto_adjust=False)
+        # yfinance is sync: run it on the bounded pool so the event loop keeps serving
+        df = await _yahoo_download(
+            self.limiter, self.concurrency.get("yahoo"), symbol,
+            start=start, end=end, progress=False, auto_adjust=False,
+        )
         if df.empty:
-            raise ValueError(f"No yfinance data for {symbol}")
-        
+            # yf.download also returns an empty frame for network errors and throttling
+            raise UnconfirmedNoDataError(f"No yfinance data for {symbol}")
+
         # Handle MultiIndex columns (yfinance returns MultiIndex when single symbol)
         if isinstance(df.columns, pd.MultiIndex):
             # Flatten MultiIndex columns
             df.columns = df.columns.droplevel(1) if df.columns.nlevels > 1 else df.columns
-        
-        # Reset index to get Date as a column
-        df = df.reset_index()
-        
-        # Rename columns
-        df = df.rename(columns={"Close": "close", "Volume": "volume", "Date": "date"})
-        
-        # Ensure date column is datetime, then convert to date
-        if "date" not in df.columns and "Date" in df.columns:
-            df["date"] = pd.to_datetime(df["Date"]).dt.date
-        elif "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"]).dt.date
-        
-        # Select only needed columns
-        df = df[["date", "close", "volume"]].dropna()
-        return df
+
+        return _yfinance_frame(df)
 
     async def _fetch_polygon(self, symbol: str, start: date, end: date) -> pd.DataFrame:
-        url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/day/{start}/{end}"
+        url = f"/v2/aggs/ticker/{symbol}/range/1/day/{start}/{end}"
         params = {"adjusted": "true", "sort": "asc", "apiKey": self.polygon_api_key, "limit": 50000}
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(url, params=params)
-            r.raise_for_status()
-            data = r.json()
+        await self.limiter.acquire_async("polygon")
+        try:
+            async with self.concurrency.get("polygon").slot():
+                r = await self.clients.get("polygon").get(url, params=params, timeout=30)
+                r.raise_for_status()
+        except httpx.HTTPError as e:
+            raise classify_http_error(e) from e
+        data = r.json()
 
         results = data.get("results", [])
         if not results:
-            raise ValueError(f"No Polygon data for {symbol}")
+            raise NoDataError(f"No Polygon data for {symbol}")
 
         rows = []
         for x in results:
@@ -0,0 +1,141 @@
+"""TTL'd negative cache of symbols a provider has no data for, shared through Redis."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Iterable
+
+from loguru import logger
+
+from ...core.config import settings
+
+# after a Redis error, use the in-process fallback for this long before trying again
+REDIS_RETRY_SECS = 30.0
+
+
+class NegativeCache:
+    """
+    Remembers (source, symbol) pairs that returned no data so they are skipped until
+    ttl_secs expire. Entries live in Redis (shared by the API and Celery workers) under
+    "{prefix}:{source}:{symbol}"; while Redis is unreachable an in-process TTL map is
+    used instead. The *_async methods are for event-loop code: their Redis round
+    trips run on a worker thread.
+    """
+
+    def __init__(
+        self,
+        ttl_secs: int | None = None,
+        client=None,
+        redis_url: str | None = None,
+        prefix: str = "nodata",
+    ):
+        self.ttl_secs = ttl_secs if ttl_secs is not None else settings.negative_cache_ttl_secs
+        self.prefix = prefix
+        self._client = client
+        self._redis_url = redis_url or settings.redis_url
+        self._redis_down_until = 0.0
+        self._local: dict[str, float] = {}  # key -> expiry (monotonic seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.added = 0
+
+    def filter(self, source: str, symbols: Iterable[str]) -> tuple[list[str], list[str]]:
+        """Split symbols into (to fetch, known to have no data) with one lookup."""
+        symbols = list(symbols)
+        if not symbols or self.ttl_secs <= 0:
+            return symbols, []
+        keys = [self._key(source, s) for s in symbols]
+        cached = self._redis_call(lambda r: [v is not None for v in r.mget(keys)])
+        if cached is None:
+            now = time.monotonic()
+            with self._lock:
+                cached = [self._local.get(k, 0.0) > now for k in keys]
+        keep = [s for s, c in zip(symbols, cached) if not c]
+        skip = [s for s, c in zip(symbols, cached) if c]
+        with self._lock:
+            self.hits += len(skip)
+        return keep, skip
+
+    def contains(self, source: str, symbol: str) -> bool:
+        return bool(self.filter(source, [symbol])[1])
+
+    async def filter_async(
+        self, source: str, symbols: Iterable[str]
+    ) -> tuple[list[str], list[str]]:
+        return await self._off_loop(self.filter, source, list(symbols))
+
+    async def contains_async(self, source: str, symbol: str) -> bool:
+        return await self._off_loop(self.contains, source, symbol)
+
+    async def add_async(self, source: str, symbols: Iterable[str]) -> None:
+        await self._off_loop(self.add, source, list(symbols))
+
+    def add(self, source: str, symbols: Iterable[str]) -> None:
+        keys = [self._key(source, s) for s in symbols]
+        if not keys or self.ttl_secs <= 0:
+            return
+        with self._lock:
+            self.added += len(keys)
+
+        def _set(r):
+            pipe = r.pipeline(transaction=False)
+            for k in keys:
+                pipe.set(k, 1, ex=self.ttl_secs)
+            pipe.execute()
+            return True
+
+        if self._redis_call(_set) is None:
+            expiry = time.monotonic() + self.ttl_secs
+            with self._lock:
+                self._local.update((k, expiry) for k in keys)
+
+    def discard(self, source: str, symbols: Iterable[str]) -> None:
+        keys = [self._key(source, s) for s in symbols]
+        if not keys:
+            return
+        self._redis_call(lambda r: r.delete(*keys))
+        with self._lock:
+            for k in keys:
+                self._local.pop(k, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "added": self.added,
+                "ttl_secs": self.ttl_secs,
+                "backend": "local" if time.monotonic() < self._redis_down_until else "redis",
+            }
+
+    async def _off_loop(self, fn, *args):
+        if self.ttl_secs <= 0 or time.monotonic() < self._redis_down_until:
+            return fn(*args)  # no Redis round trip to wait for
+        return await asyncio.to_thread(fn, *args)
+
+    def _key(self, source: str, symbol: str) -> str:
+        return f"{self.prefix}:{source}:{symbol}"
+
+    def _redis_call(self, fn):
+        """fn(client), or None when Redis is unavailable (then the local map is used)."""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            return fn(self._redis())
+        except Exception as e:
+            logger.warning(f"Negative cache: Redis unavailable, using in-process map ({e})")
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECS
+            return None
+
+    def _redis(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(
+                self._redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return self._client
+
+
+negative_cache = NegativeCache()
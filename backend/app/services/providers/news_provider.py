@@ -6,14 +6,26 @@ import os
 import re
 import html
 
-import httpx
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .concurrency import ConcurrencyLimits, concurrency_limits
+from .http_clients import HttpClientManager, http_clients
+from .rate_limiter import RateLimiter, rate_limiter
+
 
 class NewsProvider:
-    def __init__(self, newsapi_key: str | None = None):
+    def __init__(
+        self,
+        newsapi_key: str | None = None,
+        clients: HttpClientManager | None = None,
+        limiter: RateLimiter | None = None,
+        concurrency: ConcurrencyLimits | None = None,
+    ):
         self.newsapi_key = newsapi_key or os.getenv("NEWSAPI_API_KEY")
+        self.clients = clients or http_clients
+        self.limiter = limiter or rate_limiter
+        self.concurrency = concurrency or concurrency_limits
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=6))
     async def fetch_headlines(self, symbol: str, limit: int = 25) -> list[dict]:
@@ -22,15 +34,16 @@ class NewsProvider:
         return await self._google_news(symbol, limit)
 
     async def _newsapi(self, symbol: str, limit: int) -> list[dict]:
-        url = "https://newsapi.org/v2/everything"
+        url = "/v2/everything"
         q = f'"{symbol}" OR {symbol}'
         params = {"q": q, "language": "en", "pageSize": min(limit, 100), "sortBy": "publishedAt"}
         headers = {"X-Api-Key": self.newsapi_key}
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(url, params=params, headers=headers)
+        await self.limiter.acquire_async("newsapi")
+        async with self.concurrency.get("newsapi").slot():
+            r = await self.clients.get("newsapi").get(url, params=params, headers=headers)
             r.raise_for_status()
-            data = r.json()
+        data = r.json()
 
         arts = data.get("articles", [])
         out = []
@@ -50,13 +63,14 @@ class NewsProvider:
         return out
 
     async def _google_news(self, symbol: str, limit: int) -> list[dict]:
-        url = "https://news.google.com/rss/search"
+        url = "/rss/search"
         params = {"q": symbol, "hl": "en-US", "gl": "US", "ceid": "US:en"}
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(url, params=params)
+        await self.limiter.acquire_async("google_news")
+        async with self.concurrency.get("google_news").slot():
+            r = await self.clients.get("google_news").get(url, params=params)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "xml")
+        soup = BeautifulSoup(r.text, "xml")
 
         out, seen = [], set()
 
@@ -0,0 +1,170 @@
+"""Token-bucket rate limits per upstream, shared by the API and every worker through Redis."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from loguru import logger
+
+from ...core.config import settings
+
+# after a Redis error, use the in-process buckets for this long before trying again
+REDIS_RETRY_SECS = 30.0
+
+_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+# take() as one atomic Redis step: KEYS[1] = bucket hash, ARGV = rate, capacity, tokens.
+# Redis TIME keeps every client on one clock; numbers are returned as strings because
+# Redis truncates Lua numbers to integers.
+_TAKE_LUA = """
+local rate, capacity, n = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or capacity
+local ts = tonumber(b[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - n
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(math.max(0, -tokens / rate))
+"""
+
+
+def parse_rate(spec: str | float | None) -> float:
+    """Requests per second from "30/m"-style specs (Celery's rate_limit format); 0 = unlimited."""
+    if not spec:
+        return 0.0
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    count, _, unit = str(spec).partition("/")
+    return float(count) / _UNITS[unit.strip() or "s"]
+
+
+def configured_limits() -> dict[str, float]:
+    return {
+        "polygon": parse_rate(settings.rate_limit_polygon),
+        "newsapi": parse_rate(settings.rate_limit_newsapi),
+        "yahoo": parse_rate(settings.rate_limit_yahoo),
+        "google_news": parse_rate(settings.rate_limit_google_news),
+    }
+
+
+def take(
+    state: tuple[float, float] | None, now: float, rate: float, capacity: float, n: float
+) -> tuple[tuple[float, float], float]:
+    """
+    Reserve n tokens from a bucket holding state = (tokens, last refill time): returns
+    the new state and the seconds to wait before using them. Tokens go negative while
+    reservations queue up, so every caller learns its slot from a single update.
+    """
+    tokens, ts = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - ts) * rate) - n
+    return (tokens, now), max(0.0, -tokens / rate)
+
+
+class RateLimiter:
+    """
+    One token bucket per upstream (polygon, newsapi, yahoo, google_news), refilled at
+    its configured rate and holding up to burst_secs of quota. Buckets live in Redis
+    under "{prefix}:{upstream}" so the limit holds across the API and all Celery
+    workers; while Redis is unreachable each process limits itself with local buckets.
+    Upstreams without a limit cost nothing.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, float] | None = None,
+        burst_secs: float | None = None,
+        client=None,
+        redis_url: str | None = None,
+        prefix: str = "ratelimit",
+    ):
+        self.limits = limits if limits is not None else configured_limits()
+        self.burst_secs = burst_secs if burst_secs is not None else settings.rate_limit_burst_secs
+        self.prefix = prefix
+        self._client = client
+        self._script = None
+        self._redis_url = redis_url or settings.redis_url
+        self._redis_down_until = 0.0
+        self._local: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._waited: dict[str, float] = {}
+
+    def reserve(self, upstream: str, n: float = 1) -> float:
+        """Take n tokens for upstream; returns how long to wait before the request."""
+        rate = self.limits.get(upstream, 0.0)
+        if rate <= 0:
+            return 0.0
+        capacity = max(1.0, rate * self.burst_secs)
+        key = f"{self.prefix}:{upstream}"
+
+        wait = self._redis_call(lambda script: float(script(keys=[key], args=[rate, capacity, n])))
+        with self._lock:
+            if wait is None:
+                self._local[key], wait = take(
+                    self._local.get(key), time.monotonic(), rate, capacity, n
+                )
+            self._requests[upstream] = self._requests.get(upstream, 0) + 1
+            self._waited[upstream] = self._waited.get(upstream, 0.0) + wait
+        return wait
+
+    def acquire(self, upstream: str, n: float = 1) -> float:
+        """Blocking acquire, for sync code and worker threads."""
+        wait = self.reserve(upstream, n)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, upstream: str, n: float = 1) -> float:
+        """acquire for event-loop code: the Redis round trip runs on a worker thread."""
+        if self.limits.get(upstream, 0.0) <= 0 or time.monotonic() < self._redis_down_until:
+            wait = self.reserve(upstream, n)  # no Redis round trip to wait for
+        else:
+            wait = await asyncio.to_thread(self.reserve, upstream, n)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            upstreams = {
+                u: {
+                    "rate_per_sec": rate,
+                    "requests": self._requests.get(u, 0),
+                    "waited_secs": round(self._waited.get(u, 0.0), 3),
+                }
+                for u, rate in self.limits.items()
+            }
+        return {
+            "backend": "local" if time.monotonic() < self._redis_down_until else "redis",
+            "burst_secs": self.burst_secs,
+            "upstreams": upstreams,
+        }
+
+    def _redis_call(self, fn):
+        """fn(take script), or None when Redis is unavailable (then local buckets are used)."""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            return fn(self._take_script())
+        except Exception as e:
+            logger.warning(f"Rate limiter: Redis unavailable, limiting per process ({e})")
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECS
+            return None
+
+    def _take_script(self):
+        if self._script is None:
+            if self._client is None:
+                import redis
+
+                self._client = redis.Redis.from_url(
+                    self._redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+                )
+            self._script = self._client.register_script(_TAKE_LUA)
+        return self._script
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,137 @@
+"""Cross-call micro-batching in front of SentimentProvider."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from statistics import mean
+
+from ...core.config import settings
+from .sentiment_provider import SentimentProvider
+
+
+class SentimentBatcher:
+    """
+    Collects texts from concurrent score_texts calls and scores them in micro-batches.
+
+    A micro-batch is dispatched once it holds max_batch texts or its oldest text has
+    waited max_latency_ms, whichever comes first. The provider then sorts it by token
+    length and runs FinBERT off the event loop; scores are fanned back to the callers.
+    One batch runs at a time, so the model sees few, large batches instead of many
+    small per-symbol ones. The dispatching task only lives while texts are queued, so
+    short-lived owners do not leave it pending; share one batcher per process (the
+    API's get_sentiment_batcher, the worker's SignalService) so callers share batches.
+    """
+
+    def __init__(
+        self,
+        provider: SentimentProvider,
+        max_batch: int = settings.sentiment_max_batch,
+        max_latency_ms: float = settings.sentiment_max_latency_ms,
+    ):
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self.batches = 0
+        self.texts = 0
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def score_texts(self, texts: Iterable[str]) -> float:
+        """Mean score of the non-blank texts, like SentimentProvider.score_texts."""
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            return 0.0
+        return float(mean(await self.score_each(texts)))
+
+    async def score_each(self, texts: list[str]) -> list[float]:
+        if not texts:
+            return []
+        queue = self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, fut in zip(texts, futures, strict=True):
+            queue.put_nowait((text, fut))
+        return list(await asyncio.gather(*futures))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch": self.texts / self.batches if self.batches else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        """Stop the dispatching task; callers still waiting for scores get an error."""
+        if self._queue is not None:
+            while not self._queue.empty():
+                _fail([self._queue.get_nowait()], _closed())
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()  # the worker fails the batch it holds
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # queues and tasks are bound to one loop; Celery runs each task in a fresh one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        # exits once the queue is drained; _ensure_worker starts a new one on demand
+        batch: list[tuple[str, asyncio.Future]] = []
+        try:
+            while not queue.empty():
+                batch = [queue.get_nowait()]
+                await self._fill(batch, queue)
+                await self._dispatch(batch)
+        except asyncio.CancelledError:
+            _fail(batch, _closed())
+            raise
+
+    async def _fill(self, batch: list, queue: asyncio.Queue) -> None:
+        """Add queued texts to batch until it holds max_batch or max_latency has passed."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                return
+
+    async def _dispatch(self, batch: list) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            scores = await asyncio.to_thread(self.provider.score_each, texts)
+        except Exception as e:
+            _fail(batch, e)
+            return
+
+        self.batches += 1
+        self.texts += len(texts)
+        for (_, fut), score in zip(batch, scores, strict=True):
+            if not fut.done():
+                fut.set_result(score)
+
+
+def _closed() -> RuntimeError:
+    return RuntimeError("SentimentBatcher closed")
+
+
+def _fail(batch: list, error: BaseException) -> None:
+    for _, fut in batch:
+        if not fut.done():
+            fut.set_exception(error)
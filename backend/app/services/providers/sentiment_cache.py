@@ -0,0 +1,98 @@
+"""Content-addressed cache of per-text sentiment scores."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from loguru import logger
+
+from ...core.config import settings
+from ...db.repositories.sentiment_repo import SentimentScoreRepo
+
+_WS = re.compile(r"\s+")
+
+
+def text_key(text: str) -> str:
+    """sha256 of the text after NFKC normalization and whitespace collapsing."""
+    norm = _WS.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+
+class SentimentScoreCache:
+    """
+    Two-tier score cache keyed by (text_key, model): a bounded in-process LRU in front
+    of the sentiment_scores table. Database errors degrade to memory-only caching.
+    """
+
+    def __init__(self, repo: SentimentScoreRepo | None = None, max_entries: int = 50_000):
+        self.repo = repo
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str], model: str) -> dict[str, float]:
+        """Cached scores for the keys under one model; misses are omitted."""
+        found, missing = {}, []
+        with self._lock:
+            for k in dict.fromkeys(keys):
+                score = self._scores.get((k, model))
+                if score is None:
+                    missing.append(k)
+                else:
+                    self._scores.move_to_end((k, model))
+                    found[k] = score
+            self.memory_hits += len(found)
+
+        stored = {}
+        if missing and self.repo is not None:
+            try:
+                stored = self.repo.get_many(missing, model)
+            except Exception as e:
+                logger.warning(f"sentiment cache lookup failed: {e}")
+            self._remember(stored, model)
+            found.update(stored)
+
+        with self._lock:
+            self.store_hits += len(stored)
+            self.misses += len(missing) - len(stored)
+        return found
+
+    def put_many(self, scores: dict[str, float], model: str) -> None:
+        self._remember(scores, model)
+        if scores and self.repo is not None:
+            try:
+                self.repo.put_many(scores, model)
+            except Exception as e:
+                logger.warning(f"sentiment cache write failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.store_hits + self.misses
+            return {
+                "entries": len(self._scores),
+                "memory_hits": self.memory_hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, scores: dict[str, float], model: str) -> None:
+        with self._lock:
+            for k, v in scores.items():
+                self._scores[(k, model)] = v
+                self._scores.move_to_end((k, model))
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+
+sentiment_cache = SentimentScoreCache(
+    SentimentScoreRepo() if settings.sentiment_cache_db else None,
+    max_entries=settings.sentiment_cache_entries,
+)
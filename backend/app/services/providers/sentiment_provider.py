@@ -2,27 +2,86 @@
 
 from __future__ import annotations
 
-from typing import Iterable
 import os
 from statistics import mean
+from typing import Iterable
+
+from loguru import logger
+
+from ...core.config import settings
+from ...core.executors import MeteredExecutor, can_spawn_processes, process_pool
+from .sentiment_cache import SentimentScoreCache, sentiment_cache, text_key
+
+FINBERT_BATCH_SIZE = int(os.getenv("FINBERT_BATCH_SIZE", "32"))
+FINBERT_BACKENDS = ("torch", "int8", "onnx")
+
+
+def load_finbert_pipeline(
+    model_id: str = settings.finbert_model, backend: str = settings.finbert_backend
+):
+    """Build the text-classification pipeline for one of FINBERT_BACKENDS."""
+    if backend not in FINBERT_BACKENDS:
+        raise ValueError(f"Unknown FINBERT_BACKEND {backend!r}; expected one of {FINBERT_BACKENDS}")
+
+    from transformers import AutoTokenizer, pipeline
+
+    # top_k=None: scores for every label (return_all_scores is gone in v5)
+    if backend == "torch":
+        return pipeline("text-classification", model=model_id, top_k=None)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    if backend == "int8":
+        import torch
+        from transformers import AutoModelForSequenceClassification
 
-FINBERT_MODEL = os.getenv("FINBERT_MODEL", "ProsusAI/finbert")
+        model = AutoModelForSequenceClassification.from_pretrained(model_id)
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        path = os.path.join(settings.finbert_onnx_dir, model_id.strip("/").replace("/", "--"))
+        if os.path.isdir(path):
+            model = ORTModelForSequenceClassification.from_pretrained(path)
+        else:
+            model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+            model.save_pretrained(path)
+
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=None)
+
+
+def _finbert_score(row: list[dict]) -> float:
+    # FinBERT returns scores for labels: positive/negative/neutral
+    d = {x["label"].lower(): x["score"] for x in row}
+    return d.get("positive", 0) - d.get("negative", 0)  # [-1, 1]
 
 
 class SentimentProvider:
-    def __init__(self):
+    """
+    Scores texts with FinBERT (VADER fallback). With processes > 0 the model runs in a
+    shared process pool, loaded once per pool process, and this process only does
+    cache lookups; daemonic processes (Celery prefork children) always score in-process.
+    """
+
+    def __init__(
+        self,
+        cache: SentimentScoreCache | None = sentiment_cache,
+        backend: str = settings.finbert_backend,
+        max_length: int = settings.finbert_max_length,
+        processes: int = settings.sentiment_processes,
+    ):
         self._pipe = None
         self._vader = None
+        self.cache = cache
+        self.backend = backend
+        self.max_length = max_length
+        self.processes = processes if can_spawn_processes() else 0
 
     def _ensure_finbert(self):
         if self._pipe is None:
             try:
-                from transformers import pipeline
-
-                self._pipe = pipeline(
-                    "text-classification", model=FINBERT_MODEL, return_all_scores=True
-                )
-            except Exception:
+                self._pipe = load_finbert_pipeline(settings.finbert_model, self.backend)
+            except Exception as e:
+                logger.warning(f"FinBERT ({self.backend}) unavailable, falling back: {e}")
                 self._pipe = False  # mark unavailable
 
     def _ensure_vader(self):
@@ -38,23 +97,105 @@ class SentimentProvider:
         texts = [t for t in texts if t and t.strip()]
         if not texts:
             return 0.0
+        return float(mean(self.score_each(texts)))
+
+    def model_name(self) -> str | None:
+        """Identity of the backend that scores texts (cache key part); None if neither loads."""
+        if self.processes:
+            pool = self._pool()
+            if pool.name not in _pool_models:
+                _pool_models[pool.name] = pool.submit(_worker_model_name).result()
+            return _pool_models[pool.name]
 
         self._ensure_finbert()
         if self._pipe:
-            # FinBERT returns scores for labels: positive/negative/neutral
-            scores = []
-            batch = 16
-            for i in range(0, len(texts), batch):
-                out = self._pipe(texts[i : i + batch])
-                for row in out:
-                    d = {x["label"].lower(): x["score"] for x in row}
-                    scores.append(d.get("positive", 0) - d.get("negative", 0))  # [-1, 1]
-            return float(mean(scores))
-
-        # fallback VADER
+            # quantization and truncation change scores: keep their cache entries apart
+            if self.backend == "torch" and self.max_length == 512:
+                return settings.finbert_model
+            return f"{settings.finbert_model}[{self.backend},{self.max_length}]"
         self._ensure_vader()
         if self._vader:
-            vals = [self._vader.polarity_scores(t)["compound"] for t in texts]
-            return float(mean(vals))
+            return "vader"
+        return None
+
+    def score_each(self, texts: list[str], batch_size: int = FINBERT_BATCH_SIZE) -> list[float]:
+        """
+        Per-text scores in [-1, 1], in input order; blank texts should be filtered by
+        the caller. Only texts missing from the score cache reach the model.
+        """
+        if not texts:
+            return []
+
+        model = self.model_name()
+        if model is None:
+            return [0.0] * len(texts)
+
+        keys = [text_key(t) for t in texts]
+        scores = self.cache.get_many(keys, model) if self.cache is not None else {}
+        todo: dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in scores:
+                todo.setdefault(k, t)
+        if todo:
+            fresh = dict(zip(todo, self._score_uncached(list(todo.values()), batch_size)))
+            if self.cache is not None:
+                self.cache.put_many(fresh, model)
+            scores.update(fresh)
+        return [scores[k] for k in keys]
+
+    def _pool(self) -> MeteredExecutor:
+        return process_pool(
+            f"sentiment[{self.backend},{self.max_length}]",
+            self.processes,
+            initializer=_init_worker,
+            initargs=(self.backend, self.max_length),
+        )
+
+    def _score_uncached(self, texts: list[str], batch_size: int) -> list[float]:
+        if self.processes:
+            return self._pool().submit(_worker_score, texts, batch_size).result()
+
+        if self._pipe:
+            # sorted by token length, so each batch pads to similar lengths
+            ids = self._pipe.tokenizer(texts, truncation=True, max_length=self.max_length)[
+                "input_ids"
+            ]
+            lengths = [len(x) for x in ids]
+            order = sorted(range(len(texts)), key=lengths.__getitem__)
+            scores = [0.0] * len(texts)
+            for i in range(0, len(order), batch_size):
+                idx = order[i : i + batch_size]
+                out = self._pipe(
+                    [texts[j] for j in idx],
+                    batch_size=len(idx),
+                    truncation=True,
+                    max_length=self.max_length,
+                )
+                for j, row in zip(idx, out):
+                    scores[j] = _finbert_score(row)
+            return scores
+
+        # fallback VADER
+        return [self._vader.polarity_scores(t)["compound"] for t in texts]
+
+
+# --- process-pool side: one provider per pool process, loaded by the initializer ---
+
+_pool_models: dict[str, str | None] = {}  # pool name -> model_name() reported by its workers
+_worker_provider: SentimentProvider | None = None
+
+
+def _init_worker(backend: str, max_length: int) -> None:
+    global _worker_provider
+    _worker_provider = SentimentProvider(
+        cache=None, backend=backend, max_length=max_length, processes=0
+    )
+    _worker_provider.model_name()  # preload the model before the first request
+
+
+def _worker_model_name() -> str | None:
+    return _worker_provider.model_name()
+
 
-        return 0.0
+def _worker_score(texts: list[str], batch_size: int) -> list[float]:
+    return _worker_provider.score_each(texts, batch_size)
@@ -2,19 +2,74 @@
 
 from __future__ import annotations
 
-import os, asyncio
-
-import httpx
+import os
+import time
 
 from datetime import date, timedelta
 
+import pandas as pd
+from loguru import logger
+
+from .concurrency import ConcurrencyLimits, concurrency_limits
+from .http_clients import HttpClientManager, http_clients
+from .rate_limiter import RateLimiter, rate_limiter
+from ...core.config import settings
+from ...db.repositories.asset_repo import AsyncAssetRepo
+from ...db.repositories.price_repo import AsyncPriceRepo
+
 
 ETF_CORE = ["VOO", "QQQM", "IWM", "EFA", "EMB", "AGG"]
 
+# days of bars averaged for the volume ranking (~30 sessions)
+VOLUME_WINDOW_DAYS = 45
+
+# (fetched_at monotonic seconds, symbols)
+_constituents: tuple[float, list[str]] | None = None
+
+
+async def sp500_constituents(ttl_secs: float | None = None) -> list[str]:
+    """
+    S&P 500 members from yahoo_fin, cached in-process for UNIVERSE_CONSTITUENTS_TTL_SECS.
+    A failed refresh keeps serving the expired list when there is one.
+    """
+    global _constituents
+    ttl = settings.universe_constituents_ttl_secs if ttl_secs is None else ttl_secs
+    if _constituents is not None and time.monotonic() - _constituents[0] < ttl:
+        return _constituents[1]
+
+    try:
+        from yahoo_fin import stock_info as si
+    except Exception as e:
+        raise RuntimeError("Install yahoo_fin: pip install yahoo_fin --upgrade") from e
+
+    from .market_provider import yfinance_pool
+
+    try:
+        symbols = list(await yfinance_pool().run(si.tickers_sp500))
+    except Exception:
+        if _constituents is None:
+            raise
+        return _constituents[1]
+    _constituents = (time.monotonic(), symbols)
+    return symbols
+
 
 class UniverseProvider:
-    def __init__(self, polygon_api_key: str | None = None):
+    def __init__(
+        self,
+        polygon_api_key: str | None = None,
+        clients: HttpClientManager | None = None,
+        price_repo: AsyncPriceRepo | None = None,
+        limiter: RateLimiter | None = None,
+        concurrency: ConcurrencyLimits | None = None,
+        asset_repo: AsyncAssetRepo | None = None,
+    ):
         self.polygon_api_key = polygon_api_key or os.getenv("POLYGON_API_KEY")
+        self.clients = clients or http_clients
+        self.price_repo = price_repo or AsyncPriceRepo()
+        self.asset_repo = asset_repo or AsyncAssetRepo()
+        self.limiter = limiter or rate_limiter
+        self.concurrency = concurrency or concurrency_limits
 
     async def top_volume(self, count: int = 100) -> list[str]:
         if self.polygon_api_key:
@@ -22,8 +77,11 @@ class UniverseProvider:
                 return await self._polygon_top_volume(count)
             except Exception:
                 pass
-        # fallback to Yahoo (screened via yfinance: top volume last ~30d across a known basket, e.g., S&P500)
+        # fallback to the S&P 500 ranked by ~30d average volume, from stored prices
+        # (local) or downloaded for every member (yahoo)
         try:
+            if settings.universe_ranking == "local":
+                return await self._local_top_volume_sp500(count)
             return await self._yahoo_top_volume_sp500(count)
         except Exception:
             # final fallback: return ETFs only
@@ -32,13 +90,14 @@ class UniverseProvider:
     async def _polygon_top_volume(self, count: int) -> list[str]:
         # Use Polygon "most active" aggregates today
         # Docs: /v2/snapshot/locale/us/markets/stocks/most-active
-        url = "https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/most-active"
+        url = "/v2/snapshot/locale/us/markets/stocks/most-active"
         params = {"apiKey": self.polygon_api_key}
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(url, params=params)
+        await self.limiter.acquire_async("polygon")
+        async with self.concurrency.get("polygon").slot():
+            r = await self.clients.get("polygon").get(url, params=params)
             r.raise_for_status()
-            data = r.json()
+        data = r.json()
 
         tickers = []
         for item in data.get("tickers", []):
@@ -55,33 +114,79 @@ class UniverseProvider:
         # include ETFs at the end (dedup later)
         return tickers
 
-    async def _yahoo_top_volume_sp500(self, count: int) -> list[str]:
-        # Pull S&P500 list then rank by 30d avg volume
+    async def _local_top_volume_sp500(self, count: int) -> list[str]:
+        """
+        Rank S&P 500 members by average volume over stored bars; only members whose
+        stored bars are stale or missing are downloaded (and are ranked on their stale
+        stored volume if that download fails). Downloaded bars are stored, so the next
+        ranking finds those members fresh.
+        """
+        spx = await sp500_constituents()
+
+        end = date.today()
+        start = end - timedelta(days=VOLUME_WINDOW_DAYS)
+        fresh_since = end - timedelta(days=settings.universe_stale_days)
+
+        stats = await self.price_repo.volume_stats(spx, start)
+        vols = {s: v for s, (v, last) in stats.items() if last >= fresh_since}
+        stale = [s for s in spx if s not in vols]
+        if stale:
+            from .market_provider import fetch_yfinance_many
+
+            try:
+                frames = await fetch_yfinance_many(
+                    stale, start, end, limiter=self.limiter, concurrency=self.concurrency
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Universe ranking: download of {len(stale)} stale members failed, "
+                    f"using stored volume ({e})"
+                )
+                frames = {}
+            if frames:
+                await self._store_frames(frames)
+            for s in stale:
+                if s in frames:
+                    vols[s] = float(frames[s]["volume"].tail(30).mean())
+                elif s in stats:
+                    vols[s] = stats[s][0]
+
+        rows = sorted(vols.items(), key=lambda x: x[1], reverse=True)
+        return [s for s, _ in rows[:count]]
+
+    async def _store_frames(self, frames: dict[str, pd.DataFrame]) -> None:
+        """Persist ranking downloads (creating assets for new members); failures only log."""
+        from ..features.price_ingest import store_price_frames_async
+
         try:
-            from yahoo_fin import stock_info as si
+            ids = await self.asset_repo.resolve_many(frames)
+            missing = [s for s in frames if s not in ids]
+            if missing:
+                await self.asset_repo.ensure_assets(
+                    [{"symbol": s, "name": s, "asset_class": "equity"} for s in missing]
+                )
+                ids = await self.asset_repo.resolve_many(frames)
+            await store_price_frames_async(
+                self.price_repo, {ids[s]: df for s, df in frames.items() if s in ids}
+            )
         except Exception as e:
-            raise RuntimeError("Install yahoo_fin: pip install yahoo_fin --upgrade") from e
+            logger.warning(f"Universe ranking: storing bars for {len(frames)} members failed ({e})")
 
-        spx = si.tickers_sp500()
+    async def _yahoo_top_volume_sp500(self, count: int) -> list[str]:
+        # Pull S&P500 list then rank by 30d avg volume
+        spx = await sp500_constituents()
 
-        # yfinance is sync; we'll fetch volumes in parallel with threads via asyncio.to_thread
-        import yfinance as yf
+        # one threaded yf.download per chunk of tickers, on the bounded yfinance pool and
+        # within the adaptive yahoo concurrency limit
+        from .market_provider import fetch_yfinance_many
 
         end = date.today()
-        start = end - timedelta(days=45)
-
-        async def vol_for(sym: str) -> tuple[str, float]:
-            def _job():
-                df = yf.download(sym, start=start, end=end, progress=False, auto_adjust=False)
-                if df.empty:
-                    return (sym, 0.0)
-                return (sym, float(df["Volume"].tail(30).mean()))
-
-            return await asyncio.to_thread(_job)
+        start = end - timedelta(days=VOLUME_WINDOW_DAYS)
 
-        tasks = [vol_for(s) for s in spx]
-        vols = await asyncio.gather(*tasks, return_exceptions=True)
-        rows = [(s, v) for (s, v) in vols if not isinstance((s, v), Exception)]
+        frames = await fetch_yfinance_many(
+            spx, start, end, limiter=self.limiter, concurrency=self.concurrency
+        )
+        rows = [(s, float(df["volume"].tail(30).mean())) for s, df in frames.items()]
         rows = sorted(rows, key=lambda x: x[1], reverse=True)
         top = [s for s, _ in rows[:count]]
 
@@ -1,10 +1,16 @@
 # backend/app/services/tasks/celery_app.py
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 import os
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# network-bound tasks (downloads, DB writes, DAG bookkeeping) vs FinBERT signal tasks;
+# each queue has its own workers so neither waits behind the other (see docker-compose)
+IO_QUEUE = "io"
+CPU_QUEUE = "cpu"
+
 app = Celery(
     "invest",
     broker=REDIS_URL,
@@ -25,5 +31,30 @@ app.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
+    task_default_queue=IO_QUEUE,
+    task_routes={
+        "price.*": {"queue": IO_QUEUE},
+        "orchestrate.*": {"queue": IO_QUEUE},
+        "schedule.*": {"queue": IO_QUEUE},
+        "signal.*": {"queue": CPU_QUEUE},
+    },
 )
 
+
+@worker_process_init.connect
+def _init_worker_process(**_):
+    # prefork children inherit the parent's client registry; its connections belong to
+    # the parent, so each child starts with its own pooled upstream clients
+    from ..providers.http_clients import http_clients
+    from .worker_state import init_worker
+
+    http_clients.reset()
+    # providers, FinBERT and one event loop live as long as the process, not the task
+    init_worker()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**_):
+    from .worker_state import shutdown_worker
+
+    shutdown_worker()
@@ -2,33 +2,102 @@
 
 from __future__ import annotations
 
-from celery import group
+import time
+
+from celery import chord, group
+from loguru import logger
 
 from .celery_app import app
-from .price_tasks import fetch_and_store_prices
-from .signal_tasks import compute_signal_task
+from .price_tasks import fetch_and_store_prices_many
+from .signal_tasks import compute_signals_batch_task
+from .task_utils import run_async
+from .worker_state import worker_resources
+from ...core.config import settings
+from ...db.repositories.price_repo import PriceRepo
+
+
+def chunks(symbols: list[str], size: int) -> list[list[str]]:
+    return [symbols[i : i + size] for i in range(0, len(symbols), max(1, size))]
 
 
-@app.task(name="orchestrate.backfill_then_signals")
-def universe_backfill_and_signals(symbols: list[str], lookback_days: int = 365 * 3) -> dict:
+def stage_report(name: str, enqueued: float, results: list[dict]) -> dict:
     """
-    1) Fan out price backfill tasks for all symbols
-    2) After they complete, fan out signal compute tasks
+    Wall time of a fan-out stage, from enqueueing its chord to the last chunk finishing,
+    next to the summed task time (their ratio is the achieved parallelism).
+    """
+    finished = max((r.get("finished", enqueued) for r in results), default=enqueued)
+    task_secs = sum(r.get("finished", 0) - r.get("started", 0) for r in results)
+    return {
+        "stage": name,
+        "tasks": len(results),
+        "wall_secs": round(finished - enqueued, 3),
+        "task_secs": round(task_secs, 3),
+    }
+
 
-    Returns task ids so you can inspect if desired.
+def refresh_dag(symbols: list[str], lookback_days: int, stages: list[dict] | None = None):
+    """
+    Canvas for prices -> signals over symbols: a chord of chunked price backfills whose
+    body (prices_done) replaces itself with the chord of chunked signal computes.
+    Nothing in it waits on another task.
     """
-    # 1) Prices
-    g_price = group(fetch_and_store_prices.s(sym, lookback_days) for sym in symbols)
-    r_price = g_price.apply_async()
-    r_price.join()  # Wait here in orchestration (you could skip waiting and return job ids)
+    header = group(
+        fetch_and_store_prices_many.si(chunk, lookback_days)
+        for chunk in chunks(symbols, settings.pipeline_price_chunk)
+    )
+    return chord(header, prices_done.s(symbols, stages or [], time.time()))
 
-    # 2) Signals
-    g_sig = group(compute_signal_task.s(sym) for sym in symbols)
-    r_sig = g_sig.apply_async()
 
-    return {
-        "price_task_ids": [x.id for x in r_price.results],
-        "signal_task_ids": [x.id for x in r_sig.results],
-        "count": len(symbols),
-    }
+@app.task(bind=True, name="orchestrate.universe")
+def build_universe(self, count: int = 100, lookback_days: int = 365 * 3) -> dict:
+    """Stage 1: pick and persist the universe, then continue with the prices stage."""
+    from ..features.signals import UniverseService
+    from ..providers.universe_provider import UniverseProvider
+
+    started = time.time()
+    svc = UniverseService(UniverseProvider(), worker_resources().market)
+    symbols = run_async(svc.ensure_universe(count=count))
+    stages = [{"stage": "universe", "tasks": 1, "symbols": len(symbols),
+               "wall_secs": round(time.time() - started, 3)}]
+    raise self.replace(refresh_dag(symbols, lookback_days, stages))
+
+
+@app.task(bind=True, name="orchestrate.backfill_then_signals")
+def universe_backfill_and_signals(self, symbols: list[str], lookback_days: int = 365 * 3) -> dict:
+    """
+    Backfill prices for symbols in chunks, then compute their signals in chunks.
+
+    The task replaces itself with the DAG and returns immediately; the final
+    orchestrate.report task carries the per-stage timings.
+    """
+    raise self.replace(refresh_dag(symbols, lookback_days))
+
+
+@app.task(bind=True, name="orchestrate.prices_done")
+def prices_done(self, results: list[dict], symbols: list[str], stages: list[dict],
+                enqueued: float) -> dict:
+    """Chord body of the prices stage: roll volume stats forward, start the signals stage."""
+    PriceRepo().refresh_volume_stats()
+    stage = stage_report("prices", enqueued, results)
+    stage["rows"] = sum(r.get("rows", 0) for r in results)
+    stages = stages + [stage]
+
+    header = group(
+        compute_signals_batch_task.si(chunk)
+        for chunk in chunks(symbols, settings.pipeline_signal_chunk)
+    )
+    raise self.replace(chord(header, report.s(len(symbols), stages, time.time())))
+
 
+@app.task(name="orchestrate.report")
+def report(results: list[dict], count: int, stages: list[dict], enqueued: float) -> dict:
+    """Chord body of the signals stage: per-stage wall times for the whole run."""
+    stage = stage_report("signals", enqueued, results)
+    stage["signals"] = sum(r.get("count", 0) for r in results)
+    stages = stages + [stage]
+    logger.info(
+        "refresh of {} symbols: {}",
+        count,
+        ", ".join(f"{s['stage']} {s['wall_secs']:.1f}s" for s in stages),
+    )
+    return {"count": count, "stages": stages}
@@ -2,66 +2,136 @@
 
 from __future__ import annotations
 
+import time
 from datetime import date, timedelta
 
-import pandas as pd
-import asyncio
+from loguru import logger
 
+from ...core.config import settings
+from ...db.repositories.asset_repo import AssetRepo, AsyncAssetRepo
+from ...db.repositories.price_repo import AsyncPriceRepo, PriceRepo
+from ..features.price_ingest import (
+    backfill_many,
+    grouped_catch_up,
+    missing_window,
+    store_price_frame,
+)
+from ..providers.errors import NoDataError
 from .celery_app import app
-from .task_utils import RetriableTask, respectful_sleep
-from ..providers.market_provider import MarketProvider
-from ...db.repositories.asset_repo import AssetRepo
-from ...db.repositories.price_repo import PriceRepo
-from ...db.session import SessionLocal
+from .task_utils import RetriableTask, run_async
+from .worker_state import worker_resources
 
 
-@app.task(bind=True, base=RetriableTask, name="price.fetch_and_store", rate_limit="30/m")
-def fetch_and_store_prices(self, symbol: str, lookback_days: int = 365 * 3) -> dict:
+@app.task(bind=True, base=RetriableTask, name="price.fetch_and_store")
+def fetch_and_store_prices(
+    self, symbol: str, lookback_days: int = 365 * 3, full_refresh: bool = False
+) -> dict:
     """
     Download daily OHLCV (we use close+volume) and upsert into Postgres.
 
+    Only the dates after the asset's last stored bar are fetched unless full_refresh.
     Idempotent via unique (asset_id, date).
     """
-    market = MarketProvider()
+    market = worker_resources().market
     asset_repo, price_repo = AssetRepo(), PriceRepo()
 
     # Ensure asset exists
-    asset_repo.ensure_assets([{"symbol": symbol, "name": symbol, "asset_class": "equity"}])
-    with SessionLocal() as s:
-        asset_id = asset_repo.get_by_symbol(symbol).id
+    asset_id = asset_repo.resolve_many([symbol]).get(symbol)
+    if asset_id is None:
+        asset_id = asset_repo.ensure_assets(
+            [{"symbol": symbol, "name": symbol, "asset_class": "equity"}]
+        )[0]
 
     end, start = date.today(), date.today() - timedelta(days=lookback_days)
+    if not full_refresh:
+        start = missing_window(price_repo.latest_dates([asset_id]).get(asset_id), start, end)
+        if start is None:
+            return {"symbol": symbol, "rows": 0, "note": "up to date"}
 
     # Celery workers are sync; bridge to async provider
-    df = asyncio.run(market.fetch_daily_prices(symbol, start, end))
+    try:
+        df = run_async(market.fetch_daily_prices(symbol, start, end))
+    except NoDataError:
+        return {"symbol": symbol, "rows": 0, "note": "no data"}
 
     if df is None or df.empty:
         return {"symbol": symbol, "rows": 0, "note": "no data"}
 
-    rows = []
-    for _, row in df.iterrows():
-        date_val = row["date"]
-        # Handle different date formats
-        if isinstance(date_val, pd.Timestamp):
-            date_val = date_val.date()
-        elif isinstance(date_val, date):
-            pass  # Already a date object
-        else:
-            # Convert string or other types to date
-            if hasattr(date_val, "date"):
-                date_val = date_val.date()
-            else:
-                date_val = pd.to_datetime(str(date_val)).date()
-
-        rows.append(
-            {
-                "asset_id": asset_id,
-                "date": date_val,
-                "close": float(row["close"]),
-                "volume": float(row["volume"]),
-            }
+    n = store_price_frame(price_repo, asset_id, df)
+    return {"symbol": symbol, "rows": int(n)}
+
+
+@app.task(bind=True, base=RetriableTask, name="price.fetch_and_store_many")
+def fetch_and_store_prices_many(
+    self, symbols: list[str], lookback_days: int = 365 * 3, full_refresh: bool = False
+) -> dict:
+    """
+    Backfill a chunk of symbols in one task: batched downloads from each watermark and
+    one bulk upsert (see price_ingest.backfill_many). Unknown symbols become assets.
+    Runs on the worker's long-lived providers and event loop.
+
+    A transient provider failure is retried (only what is still missing is fetched
+    again); once retries run out the chunk reports the error instead of failing, so
+    the refresh DAG still reaches the signals stage.
+    """
+    started = time.time()
+    worker = worker_resources()
+    market = worker.market
+
+    async def _run():
+        asset_repo, price_repo = AsyncAssetRepo(), AsyncPriceRepo()
+        ids = await asset_repo.resolve_many(symbols)
+        missing = [s for s in symbols if s not in ids]
+        if missing:
+            await asset_repo.ensure_assets(
+                [{"symbol": s, "name": s, "asset_class": "equity"} for s in missing]
+            )
+            ids = await asset_repo.resolve_many(symbols)
+        end = date.today()
+        return await backfill_many(
+            market, price_repo, ids, end - timedelta(days=lookback_days), end, full_refresh
         )
 
-    n = price_repo.upsert_prices(rows)
-    return {"symbol": symbol, "rows": int(n)}
+    try:
+        upserts = run_async(_run())
+    except Exception as e:
+        if self.request.retries < self.retry_kwargs["max_retries"]:
+            raise
+        logger.error(f"Price backfill of {symbols} failed after retries: {e!r}")
+        upserts, error = {}, repr(e)
+    else:
+        error = None
+    finished = time.time()
+    return {
+        "symbols": len(symbols),
+        "rows": int(sum(upserts.values())),
+        "error": error,
+        "worker": worker.record(len(symbols), finished - started),
+        "started": started,
+        "finished": finished,
+    }
+
+
+@app.task(bind=True, base=RetriableTask, name="price.ingest_grouped_daily")
+def ingest_grouped_daily(self, max_days: int | None = None) -> dict:
+    """
+    Catch every stored asset up to the last complete bar with Polygon grouped daily
+    bars: one request per missed weekday for the whole market, filtered to our assets
+    and bulk-upserted in one pass. Assets without history or more than max_days
+    weekdays behind are reported as leftovers for a per-symbol backfill.
+    """
+    market = worker_resources().market
+    if not market.grouped_daily_available:
+        return {"rows": 0, "note": "grouped daily needs POLYGON_API_KEY"}
+
+    async def _run():
+        asset_repo, price_repo = AsyncAssetRepo(), AsyncPriceRepo()
+        ids = await asset_repo.all_ids()
+        watermarks = await price_repo.latest_dates(list(ids.values()))
+        return await grouped_catch_up(
+            market, price_repo, ids, watermarks, date.today(),
+            max_days or settings.polygon_grouped_max_days,
+        )
 
+    upserts, leftovers = run_async(_run())
+    return {"rows": sum(upserts.values()), "assets": len(upserts), "leftovers": leftovers}
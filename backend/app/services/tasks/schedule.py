@@ -3,9 +3,7 @@
 from __future__ import annotations
 
 from .celery_app import app
-from .orchestrate import universe_backfill_and_signals
-from ..providers.universe_provider import UniverseProvider
-import asyncio
+from .orchestrate import build_universe
 
 
 @app.on_after_configure.connect
@@ -18,19 +16,10 @@ def setup_periodic_tasks(sender, **kwargs):
     )
 
 
-@app.task(name="schedule.nightly_universe_refresh")
-def nightly_universe_refresh(count: int = 100, lookback_days: int = 365 * 3):
-    # Build current universe (same as your /universe/build behavior)
-    from ..providers.market_provider import MarketProvider
-    from ..features.signals import UniverseService
-
-    uni = UniverseProvider()
-    mkt = MarketProvider()
-    svc = UniverseService(uni, mkt)
-
-    result = asyncio.run(svc.ensure_assets_and_backfill(count=count, lookback_days=lookback_days))
-    # Kick signal compute in bulk
-    symbols = result.get("symbols", [])
-    universe_backfill_and_signals.delay(symbols, lookback_days)
-    return {"scheduled": len(symbols)}
-
+@app.task(bind=True, name="schedule.nightly_universe_refresh")
+def nightly_universe_refresh(self, count: int = 100, lookback_days: int = 365 * 3):
+    """
+    Nightly DAG: universe -> chunked price backfill -> chunked signal compute (see
+    orchestrate). Each stage runs once; the last task reports per-stage wall times.
+    """
+    raise self.replace(build_universe.si(count, lookback_days))
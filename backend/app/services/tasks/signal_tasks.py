@@ -2,23 +2,41 @@
 
 from __future__ import annotations
 
-import asyncio
+import time
 
+from ..providers.sentiment_cache import sentiment_cache
 from .celery_app import app
-from .task_utils import RetriableTask
-from ..providers.sentiment_provider import SentimentProvider
-from ..providers.news_provider import NewsProvider
-from ..providers.market_provider import MarketProvider
-from ..features.signals import SignalService
+from .task_utils import RetriableTask, run_async
+from .worker_state import worker_resources
 
 
-@app.task(bind=True, base=RetriableTask, name="signal.compute", rate_limit="90/m")
+@app.task(bind=True, base=RetriableTask, name="signal.compute")
 def compute_signal_task(self, symbol: str) -> dict:
     """
     Computes momentum + sentiment for a symbol (today) and upserts signals table.
     """
-    svc = SignalService(MarketProvider(), NewsProvider(), SentimentProvider())
+    svc = worker_resources().signals
 
     # Call the async service method from sync Celery
-    return asyncio.run(svc.compute_and_persist(symbol))
+    return run_async(svc.compute_and_persist(symbol))
 
+
+@app.task(bind=True, base=RetriableTask, name="signal.compute_batch")
+def compute_signals_batch_task(self, symbols: list[str]) -> dict:
+    """
+    Momentum for all symbols from one price-matrix load, sentiment per symbol,
+    persisted with a single upsert. Runs on the worker's long-lived SignalService,
+    so FinBERT and pooled connections are reused across chunks.
+    """
+    started = time.time()
+    worker = worker_resources()
+    signals = run_async(worker.signals.compute_and_persist_many(symbols))
+    finished = time.time()
+    return {
+        "count": len(signals),
+        "signals": signals,
+        "sentiment_cache": sentiment_cache.stats(),
+        "worker": worker.record(len(symbols), finished - started),
+        "started": started,
+        "finished": finished,
+    }
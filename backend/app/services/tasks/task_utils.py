@@ -1,11 +1,21 @@
 # backend/app/services/tasks/task_utils.py
 
+import asyncio
+from typing import Any, Coroutine
+
 from celery import Task
 from time import sleep
 
+from ..providers.errors import PermanentProviderError
+from ..providers.http_clients import http_clients
+from .worker_state import current_worker
+from ...db.session import async_engine
+
 
 class RetriableTask(Task):
     autoretry_for = (Exception,)
+    # no data / bad request: another attempt gets the same answer
+    dont_autoretry_for = (PermanentProviderError,)
     retry_kwargs = {"max_retries": 3, "countdown": 5}
     retry_backoff = True
     retry_jitter = True
@@ -18,3 +28,27 @@ def respectful_sleep(seconds: float):
     except Exception:
         pass
 
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run an async service call from a sync Celery task.
+
+    Inside a worker with initialized resources (see worker_state) the call runs on the
+    process's long-lived loop, keeping pooled DB and HTTP connections between tasks
+    and sharing them between the threads of a threads pool.
+    Otherwise each asyncio.run() gets a fresh event loop, and pooled asyncio DB and
+    HTTP connections are bound to the loop that opened them, so the async engine pool
+    and the loop's upstream clients are closed before the loop closes.
+    """
+    worker = current_worker()
+    if worker is not None:
+        return worker.run(coro)
+
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await http_clients.aclose()
+            await async_engine.dispose()
+
+    return asyncio.run(_main())
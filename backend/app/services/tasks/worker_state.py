@@ -0,0 +1,122 @@
+# backend/app/services/tasks/worker_state.py
+
+"""
+Per-worker-process resources for Celery tasks: one event loop, the providers, the
+FinBERT model and a SignalService, created once in worker_process_init instead of
+per task.
+
+The loop runs in its own thread and tasks submit coroutines to it, so the pool
+threads of a threads-pool worker (the io queue) share one loop, one async DB pool
+and one set of upstream clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Coroutine
+
+from loguru import logger
+
+from ..features.signals import SignalService
+from ..providers.http_clients import http_clients
+from ..providers.market_provider import MarketProvider
+from ..providers.news_provider import NewsProvider
+from ..providers.sentiment_provider import SentimentProvider
+from ...core.config import settings
+from ...db.session import async_engine
+
+
+class WorkerResources:
+    """
+    What a worker process keeps between tasks. Pooled asyncio DB and HTTP connections
+    are bound to the loop that opened them; with one long-lived loop they stay open
+    across tasks instead of being torn down after each one.
+    """
+
+    def __init__(self, preload_model: bool = settings.worker_preload_model):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="worker-loop",
+                                        daemon=True)
+        self._thread.start()
+        self._stats_lock = threading.Lock()
+        self.market = MarketProvider()
+        self.news = NewsProvider()
+        self.sentiment = SentimentProvider()
+        self.signals = SignalService(self.market, self.news, self.sentiment)
+        self.tasks = 0
+        self.symbols = 0
+        self.busy_secs = 0.0
+        if preload_model:
+            started = time.perf_counter()
+            model = self.sentiment.model_name()
+            logger.info("worker sentiment model {} loaded in {:.1f}s", model,
+                        time.perf_counter() - started)
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run coro on the worker loop and wait for it (never call from the loop thread)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def record(self, symbols: int, secs: float) -> dict:
+        """Account one chunk; returns this worker's throughput so far."""
+        with self._stats_lock:
+            self.tasks += 1
+            self.symbols += symbols
+            self.busy_secs += secs
+            return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "tasks": self.tasks,
+            "symbols": self.symbols,
+            "busy_secs": round(self.busy_secs, 3),
+            "symbols_per_sec": round(self.symbols / self.busy_secs, 2) if self.busy_secs else 0.0,
+        }
+
+    def close(self) -> None:
+        if self.loop.is_closed():
+            return
+
+        async def _close():
+            await self.signals.sentiment_batcher.aclose()
+            await http_clients.aclose()
+            await async_engine.dispose()
+
+        try:
+            self.run(_close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+
+
+_resources: WorkerResources | None = None
+_lock = threading.Lock()
+
+
+def init_worker(preload_model: bool = settings.worker_preload_model) -> WorkerResources:
+    global _resources
+    with _lock:
+        if _resources is None:
+            _resources = WorkerResources(preload_model)
+        return _resources
+
+
+def worker_resources() -> WorkerResources:
+    """The process's resources; created on first use where worker_process_init is not
+    sent (solo and threads pools, eager tasks)."""
+    return _resources or init_worker(preload_model=False)
+
+
+def current_worker() -> WorkerResources | None:
+    """The process's resources if they were created; run_async then uses their loop."""
+    return _resources
+
+
+def shutdown_worker() -> None:
+    global _resources
+    with _lock:
+        res, _resources = _resources, None
+    if res is not None:
+        res.close()
@@ -1,12 +1,29 @@
 #!/bin/bash
-# Run Celery worker
+# Run Celery worker(s)
+#   ./run_celery_worker.sh        one worker consuming both queues (local development)
+#   ./run_celery_worker.sh io     downloads / DB writes / DAG bookkeeping: many threads
+#   ./run_celery_worker.sh cpu    FinBERT signal tasks: one process per core
 
 cd "$(dirname "$0")/.."
 source backend/venv/bin/activate
 
-echo "⚙️  Starting Celery worker..."
-echo "   Concurrency: 4"
+APP=backend.app.services.tasks.celery_app.app
+QUEUE=${1:-all}
+
+echo "⚙️  Starting Celery worker ($QUEUE)..."
 echo "   Broker: Redis"
 echo ""
 
-celery -A backend.app.services.tasks.celery_app.app worker -l INFO --concurrency=4
+case "$QUEUE" in
+  io)
+    exec celery -A $APP worker -l INFO -Q io -n io@%h \
+      --pool=threads --concurrency=${CELERY_IO_CONCURRENCY:-32}
+    ;;
+  cpu)
+    exec celery -A $APP worker -l INFO -Q cpu -n cpu@%h \
+      --pool=prefork --concurrency=${CELERY_CPU_CONCURRENCY:-$(nproc)}
+    ;;
+  *)
+    exec celery -A $APP worker -l INFO -Q io,cpu --concurrency=4
+    ;;
+esac
@@ -0,0 +1,46 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.asset import Asset
+from app.db.repositories import asset_repo
+from app.db.repositories.asset_repo import AssetRepo, SymbolMap
+
+
+def test_symbol_map_hits_and_misses():
+    m = SymbolMap()
+    m.update([("AAA", 1), ("BBB", 2)])
+    hits, misses = m.get_many(["AAA", "CCC", "BBB", "CCC"])
+    assert hits == {"AAA": 1, "BBB": 2}
+    assert misses == ["CCC"]
+
+
+def test_symbol_map_invalidate():
+    m = SymbolMap()
+    m.update([("AAA", 1), ("BBB", 2)])
+    m.invalidate(["AAA"])
+    assert m.get_many(["AAA", "BBB"]) == ({"BBB": 2}, ["AAA"])
+    m.invalidate()
+    assert len(m) == 0
+
+
+def test_resolve_many_mixes_cached_stored_and_unknown_symbols(monkeypatch):
+    monkeypatch.setattr(asset_repo, "symbol_map", SymbolMap())
+    engine = create_engine("sqlite://")
+    Asset.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add_all([Asset(id=1, symbol="AAA"), Asset(id=2, symbol="BBB")])
+        s.commit()
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *a: queries.append(a[2]))
+    repo = AssetRepo(session_factory=Session)
+    asset_repo.symbol_map.update([("AAA", 1)])
+
+    assert repo.resolve_many(["AAA", "BBB", "ZZZ", "BBB"]) == {"AAA": 1, "BBB": 2}
+    assert len(queries) == 1  # one query, for the misses only
+
+    # stored symbols are cached now; unknown ones are not, so they are looked up again
+    assert repo.resolve_many(["BBB", "ZZZ"]) == {"BBB": 2}
+    assert len(queries) == 2
+    assert repo.resolve_many(["AAA", "BBB"]) == {"AAA": 1, "BBB": 2}
+    assert len(queries) == 2
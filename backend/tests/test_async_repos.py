@@ -0,0 +1,149 @@
+import inspect
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.deps import get_database
+from app.api.v1.assets import list_assets
+from app.db.models.asset import Asset
+from app.db.repositories import asset_repo, price_repo
+from app.db.repositories.asset_repo import AsyncAssetRepo, SymbolMap
+from app.db.repositories.price_repo import AsyncPriceRepo
+from app.main import app
+from app.services.features import prices_cov
+
+
+class _Result:
+    def __init__(self, rows=(), rowcount=-1):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def all(self):
+        return self.rows
+
+    fetchall = all
+
+    def scalars(self):
+        return self
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+
+class _FakeAsyncSession:
+    """AsyncSession stand-in: answers execute() with queued results, records statements."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.commits = 0
+
+    def __call__(self):  # doubles as the session factory
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.executed.append(stmt)
+        return self.results.pop(0) if self.results else _Result()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect())).replace("\n", " ")
+
+
+@pytest.mark.asyncio
+async def test_latest_dates_is_one_grouped_query():
+    session = _FakeAsyncSession(_Result([(1, date(2024, 6, 3)), (2, date(2024, 6, 5))]))
+    repo = AsyncPriceRepo(session_factory=session)
+
+    assert await repo.latest_dates([1, 2, 3]) == {1: date(2024, 6, 3), 2: date(2024, 6, 5)}
+    sql = _sql(session.executed[0])
+    assert len(session.executed) == 1 and "max(prices.date)" in sql and "GROUP BY" in sql
+    assert await repo.latest_dates([]) == {} and len(session.executed) == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_prices_merges_refreshes_volume_and_commits_once(monkeypatch):
+    monkeypatch.setattr(price_repo, "_data_version", 0)
+    session = _FakeAsyncSession(_Result(rowcount=2))
+    repo = AsyncPriceRepo(session_factory=session)
+    rows = [
+        {"asset_id": 7, "date": date(2024, 6, 3), "close": 10.0, "volume": 100.0},
+        {"asset_id": 7, "date": date(2024, 6, 4), "close": 11.0, "volume": 120.0},
+    ]
+
+    assert await repo.upsert_prices(rows) == 2
+    upsert, refresh = session.executed
+    assert "ON CONFLICT ON CONSTRAINT uq_prices_asset_date DO UPDATE" in _sql(upsert)
+    assert "asset_volume_stats" in str(refresh)
+    assert session.commits == 1 and price_repo.price_data_version() == 1
+    assert await repo.upsert_prices([]) == 0 and len(session.executed) == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_queries_only_cache_misses(monkeypatch):
+    monkeypatch.setattr(asset_repo, "symbol_map", SymbolMap())
+    asset_repo.symbol_map.update([("AAA", 1)])
+    session = _FakeAsyncSession(_Result([("BBB", 2)]))
+    repo = AsyncAssetRepo(session_factory=session)
+
+    assert await repo.resolve_many(["AAA", "BBB", "ZZZ"]) == {"AAA": 1, "BBB": 2}
+    assert len(session.executed) == 1
+    params = session.executed[0].compile().params
+    assert sorted(v for p in params.values() for v in p) == ["BBB", "ZZZ"]
+
+    # the first call cached BBB, so resolving only known symbols runs no query
+    assert await repo.resolve_many(["AAA", "BBB"]) == {"AAA": 1, "BBB": 2}
+    assert len(session.executed) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_price_matrix_async_pivots_the_rows(monkeypatch):
+    rows = [("AAA", date(2024, 6, 3), 10.0), ("BBB", date(2024, 6, 3), 20.0),
+            ("AAA", date(2024, 6, 4), 11.0)]
+    session = _FakeAsyncSession(_Result(rows))
+    monkeypatch.setattr(prices_cov, "AsyncReadSessionLocal", session)
+
+    pm = await prices_cov.load_price_matrix_async(
+        ["AAA", "BBB"], date(2024, 6, 1), date(2024, 6, 5), use_cache=False
+    )
+    assert list(pm.columns) == ["AAA", "BBB"] and len(pm) == 2
+    assert pm["AAA"].tolist() == [10.0, 11.0]
+    assert pm["BBB"].tolist() == [20.0, 20.0]  # forward-filled
+    assert len(session.executed) == 1
+
+
+def test_assets_route_is_a_threadpool_route_on_the_sync_session():
+    asset = Asset(id=1, symbol="VOO", name="Vanguard 500", asset_class="etf",
+                  created_at=datetime(2024, 1, 2))
+    executed = []
+
+    class _Session:
+        def execute(self, stmt):
+            executed.append(stmt)
+            return _Result([asset])
+
+    def override():
+        yield _Session()
+
+    assert not inspect.iscoroutinefunction(list_assets)  # run in the threadpool, off the loop
+    app.dependency_overrides[get_database] = override
+    try:
+        r = TestClient(app).get("/api/v1/assets/?limit=5")
+    finally:
+        app.dependency_overrides.pop(get_database)
+
+    assert r.status_code == 200
+    assert r.json() == [{"id": 1, "symbol": "VOO", "name": "Vanguard 500", "asset_class": "etf",
+                         "created_at": "2024-01-02T00:00:00"}]
+    assert "LIMIT" in _sql(executed[0])
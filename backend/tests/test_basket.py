@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.repositories.price_repo import _refresh_volume_stmts
+from app.services.features.basket import _top_by_rolling_volume_query, _uses_rolling_table
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect())).replace("\n", " ")
+
+
+def test_default_window_is_a_top_k_lookup_on_the_summary():
+    assert _uses_rolling_table(None) and _uses_rolling_table(60)
+    assert not _uses_rolling_table(30)
+
+    sql = _sql(_top_by_rolling_volume_query(5, 60))
+    assert "FROM assets JOIN asset_volume_stats" in sql
+    assert "ORDER BY asset_volume_stats.avg_volume DESC" in sql and "GROUP BY" not in sql
+
+
+def test_rolling_lookup_skips_stale_summary_rows():
+    query = _top_by_rolling_volume_query(5, 60)
+    sql = _sql(query)
+    assert "asset_volume_stats.window_start >= " in sql
+    assert "asset_volume_stats.last_date >= " in sql
+
+    start = date.today() - timedelta(days=60)
+    params = query.compile(dialect=postgresql.dialect()).params
+    assert sorted(v for v in params.values() if isinstance(v, date)) == [
+        start - timedelta(days=1), start
+    ]
+
+
+def test_refresh_statements_touch_only_written_assets():
+    (stmt, params), = _refresh_volume_stmts([3, 1, 3])
+    assert params["ids"] == [1, 3] and "ANY(:ids)" in str(stmt)
+    assert _refresh_volume_stmts([]) == []
+
+    upsert, drop = _refresh_volume_stmts(None)
+    assert "ANY" not in str(upsert[0]) and "DELETE" in str(drop[0])
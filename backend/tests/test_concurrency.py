@@ -0,0 +1,144 @@
+import asyncio
+import time
+import types
+from datetime import date
+
+import httpx
+import pandas as pd
+import pytest
+from tenacity import stop_after_attempt, wait_none
+
+from app.services.providers.concurrency import AdaptiveLimiter, ConcurrencyLimits
+from app.services.providers import market_provider
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider, fetch_yfinance_many
+from app.services.providers.negative_cache import NegativeCache
+from app.services.providers.rate_limiter import RateLimiter
+
+
+class _ThrottlingUpstream:
+    """Mock Polygon that answers 429 beyond `capacity` concurrent requests."""
+
+    def __init__(self, capacity: int, latency: float = 0.01):
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.throttled = 0
+
+    async def __call__(self, request):
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                return httpx.Response(429)
+            await asyncio.sleep(self.latency)
+            return httpx.Response(200, json={"results": [{"t": 1704153600000, "c": 1.0, "v": 2}]})
+        finally:
+            self.in_flight -= 1
+
+
+async def _run(limiter: AdaptiveLimiter, n: int, latency: float = 0.005, fail=None):
+    async def one(i):
+        try:
+            async with limiter.slot():
+                await asyncio.sleep(latency)
+                if fail and fail(i):
+                    raise httpx.ConnectTimeout("t")
+        except httpx.ConnectTimeout:
+            pass
+
+    await asyncio.gather(*[one(i) for i in range(n)])
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_healthy_and_is_never_exceeded():
+    limiter = AdaptiveLimiter("test", initial=2, max_limit=8)
+    await _run(limiter, 200)
+    stats = limiter.stats()
+    assert stats["limit"] == 8 and stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["max_in_flight"] <= 8 and stats["drops"] == 0
+    assert stats["latency_ms"] >= 5 and stats["baseline_ms"] >= 5
+
+
+@pytest.mark.asyncio
+async def test_overload_halves_the_limit_once_per_round():
+    limiter = AdaptiveLimiter("test", initial=16, min_limit=1, backoff=0.5)
+    # one round of 16 requests, all timing out together: one decrease, not sixteen
+    await _run(limiter, 16, fail=lambda i: True)
+    assert limiter.limit == 8 and limiter.drops == 16 and limiter.backoffs == 1
+
+
+def test_latency_above_tolerance_backs_off():
+    limiter = AdaptiveLimiter("test", initial=10, latency_tolerance=2.0)
+    for latency in (0.01, 0.01, 0.01):
+        limiter.in_flight += 1
+        limiter.release(latency, dropped=False)
+    assert limiter.backoffs == 0
+    for _ in range(10):
+        limiter.in_flight += 1
+        limiter.release(0.2, dropped=False)
+    assert limiter.backoffs >= 1 and limiter.limit < 10
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_do_not_leak_slots():
+    limiter = AdaptiveLimiter("test", initial=1, max_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(None, dropped=False)
+    assert limiter.stats()["in_flight"] == 0 and limiter.stats()["queued"] == 0
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_polygon_fan_out_adapts_to_a_throttling_upstream(monkeypatch):
+    monkeypatch.setattr(MarketProvider._fetch_daily_prices.retry, "wait", wait_none())
+    monkeypatch.setattr(MarketProvider._fetch_daily_prices.retry, "stop", stop_after_attempt(10))
+    upstream = _ThrottlingUpstream(capacity=6)
+    clients = HttpClientManager(
+        base_urls={"polygon": "https://polygon.test"}, transport=httpx.MockTransport(upstream)
+    )
+    concurrency = ConcurrencyLimits(initial=20, max_limit=64)
+    market = MarketProvider(polygon_api_key="k", clients=clients, no_data=NegativeCache(0),
+                            limiter=RateLimiter({}), concurrency=concurrency)
+
+    symbols = [f"S{i}" for i in range(300)]
+    frames = await market.fetch_daily_prices_many(symbols, date(2024, 1, 1), date(2024, 3, 1))
+
+    stats = concurrency.stats()["upstreams"]["polygon"]
+    assert len(frames) == 300
+    assert upstream.throttled > 0 and stats["backoffs"] > 0
+    # settles around what the upstream accepts instead of the fixed 20
+    assert stats["limit"] < 20 and stats["in_flight"] == 0
+
+
+class _NoRedis:
+    def register_script(self, script):
+        raise ConnectionError("no redis in tests")
+
+
+@pytest.mark.asyncio
+async def test_yahoo_slots_time_the_download_not_the_quota_wait(monkeypatch):
+    def download(tickers, **kwargs):
+        time.sleep(0.02)  # steady upstream: never slower under load
+        cols = pd.MultiIndex.from_product([tickers, ["Close", "Volume"]])
+        return pd.DataFrame([[1.0, 2.0] * len(tickers)], columns=cols,
+                            index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+    monkeypatch.setattr(market_provider, "yf", types.SimpleNamespace(download=download))
+    # the token bucket spaces the 40 chunks over ~0.4 s: waits far above the 20 ms download
+    limiter = RateLimiter({"yahoo": 100.0}, burst_secs=0.01, client=_NoRedis())
+    concurrency = ConcurrencyLimits(initial=10, max_limit=10)
+    symbols = [f"S{i}" for i in range(40)]
+
+    frames = await fetch_yfinance_many(symbols, date(2024, 1, 1), date(2024, 1, 5), chunk_size=1,
+                                       limiter=limiter, concurrency=concurrency)
+
+    stats = concurrency.stats()["upstreams"]["yahoo"]
+    assert len(frames) == 40 and stats["in_flight"] == 0
+    assert stats["backoffs"] == 0 and stats["limit"] == 10
+    assert stats["latency_ms"] < 100
@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.executors import MeteredExecutor
+
+
+def test_queue_depth_counts_work_waiting_for_a_worker():
+    release = threading.Event()
+    pool = MeteredExecutor("t", ThreadPoolExecutor(max_workers=2), max_workers=2)
+
+    futures = [pool.submit(release.wait) for _ in range(5)]
+    stats = pool.stats()
+    assert stats["in_flight"] == 5 and stats["queued"] == 3 and stats["max_queued"] == 3
+
+    release.set()
+    pool.shutdown()  # joins the workers, so every done-callback has run
+    assert all(f.done() for f in futures)
+    stats = pool.stats()
+    assert stats["in_flight"] == 0 and stats["queued"] == 0 and stats["completed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_run_awaits_result_and_counts_failures():
+    pool = MeteredExecutor("t", ThreadPoolExecutor(max_workers=1), max_workers=1)
+
+    assert await pool.run(sum, [1, 2, 3]) == 6
+    with pytest.raises(ZeroDivisionError):
+        await pool.run(divmod, 1, 0)
+    pool.shutdown()
+    assert pool.stats()["failed"] == 1
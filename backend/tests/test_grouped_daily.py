@@ -0,0 +1,128 @@
+"""Polygon grouped-daily catch-up against a local server replaying recorded responses."""
+
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.features.price_ingest import grouped_catch_up, weekdays
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider
+
+FIXTURES = Path(__file__).parent / "fixtures" / "polygon"
+GROUPED_PREFIX = "/v2/aggs/grouped/locale/us/market/stocks/"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    requests: list[str] = []
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        self.requests.append(path)
+        if not path.startswith(GROUPED_PREFIX):
+            self.send_error(404)
+            return
+        fixture = FIXTURES / f"grouped_{path[len(GROUPED_PREFIX):]}.json"
+        if not fixture.exists():  # market holiday: Polygon answers with no results
+            fixture = FIXTURES / "grouped_empty.json"
+        body = fixture.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def polygon_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    _FixtureHandler.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _FixtureHandler.requests
+    server.shutdown()
+
+
+class _RecordingPriceRepo:
+    def __init__(self):
+        self.calls = []
+
+    async def bulk_upsert(self, asset_ids, dates, close, volume):
+        self.calls.append((asset_ids, dates, close, volume))
+        return len(asset_ids)
+
+
+def test_weekdays_skips_weekends():
+    assert weekdays(date(2024, 6, 7), date(2024, 6, 12)) == [
+        date(2024, 6, 7), date(2024, 6, 10), date(2024, 6, 11)
+    ]
+    assert weekdays(date(2024, 6, 12), date(2024, 6, 12)) == []
+
+
+@pytest.mark.asyncio
+async def test_grouped_catch_up_filters_to_universe_and_upserts_once(polygon_server):
+    base_url, requests = polygon_server
+    clients = HttpClientManager(base_urls={"polygon": base_url})
+    market = MarketProvider(polygon_api_key="k", clients=clients)
+    repo = _RecordingPriceRepo()
+
+    ids = {"AAA": 1, "BBB": 2, "CCC": 3, "DDD": 4, "EEE": 5}
+    watermarks = {
+        1: date(2024, 6, 11),  # missing 12-14
+        2: date(2024, 6, 13),  # missing 14 only
+        4: date(2024, 5, 1),  # too far behind for grouped catch-up
+        5: date(2024, 6, 14),  # current
+    }
+    end = date(2024, 6, 15)  # Saturday: last complete bar is Friday 14th
+    upserts, leftovers = await grouped_catch_up(market, repo, ids, watermarks, end, max_days=10)
+    await clients.aclose()
+
+    # one request per missed weekday for the whole market (the 13th replays a holiday)
+    assert requests == [GROUPED_PREFIX + d for d in ("2024-06-12", "2024-06-13", "2024-06-14")]
+    assert upserts == {"AAA": 2, "BBB": 1}
+    assert sorted(leftovers) == ["CCC", "DDD"]
+
+    assert len(repo.calls) == 1
+    asset_ids, dates, close, _ = repo.calls[0]
+    got = sorted(zip(asset_ids.tolist(), dates.astype(str).tolist(), close.tolist()))
+    assert got == [
+        (1, "2024-06-12", 101.5), (1, "2024-06-14", 103.0), (2, "2024-06-14", 54.0)
+    ]
+    assert dates.dtype == np.dtype("datetime64[D]")
+
+
+@pytest.mark.asyncio
+async def test_grouped_catch_up_skips_current_universe(polygon_server):
+    base_url, requests = polygon_server
+    market = MarketProvider(
+        polygon_api_key="k", clients=HttpClientManager(base_urls={"polygon": base_url})
+    )
+    repo = _RecordingPriceRepo()
+
+    upserts, leftovers = await grouped_catch_up(
+        market, repo, {"AAA": 1}, {1: date(2024, 6, 14)}, date(2024, 6, 17), max_days=10
+    )
+    assert (upserts, leftovers, requests, repo.calls) == ({}, [], [], [])
+
+
+@pytest.mark.asyncio
+async def test_fetch_grouped_daily_parses_recorded_response(polygon_server):
+    base_url, _ = polygon_server
+    clients = HttpClientManager(base_urls={"polygon": base_url})
+    market = MarketProvider(polygon_api_key="k", clients=clients)
+
+    df = await market.fetch_grouped_daily(date(2024, 6, 12))
+    holiday = await market.fetch_grouped_daily(date(2024, 6, 13))
+    await clients.aclose()
+
+    recorded = json.loads((FIXTURES / "grouped_2024-06-12.json").read_text())["results"]
+    assert df["symbol"].tolist() == [r["T"] for r in recorded]
+    assert set(df["date"]) == {date(2024, 6, 12)}
+    assert df.loc[df["symbol"] == "AAA", "volume"].item() == 1200300.0
+    assert holiday.empty and list(holiday.columns) == ["symbol", "date", "close", "volume"]
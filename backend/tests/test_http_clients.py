@@ -0,0 +1,75 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider
+
+
+def _manager(handler) -> HttpClientManager:
+    return HttpClientManager(
+        base_urls={"polygon": "https://polygon.test", "newsapi": "https://news.test"},
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_upstream_reused_until_closed():
+    clients = _manager(lambda request: httpx.Response(200))
+
+    polygon = clients.get("polygon")
+    assert clients.get("polygon") is polygon
+    assert clients.get("newsapi") is not polygon
+    with pytest.raises(KeyError):
+        clients.get("unknown")
+    assert clients.stats()["opened"] == 2 and clients.stats()["live"] == 2
+
+    await clients.aclose()
+    assert polygon.is_closed and clients.stats()["live"] == 0
+    assert clients.get("polygon") is not polygon
+
+
+def test_clients_are_bound_to_their_event_loop():
+    clients = _manager(lambda request: httpx.Response(200))
+
+    async def grab():
+        return clients.get("polygon")
+
+    async def grab_and_close():
+        try:
+            return clients.get("polygon")
+        finally:
+            await clients.aclose()
+
+    loop = asyncio.new_event_loop()
+    try:
+        first = loop.run_until_complete(grab())
+        assert loop.run_until_complete(grab()) is first
+        # a different loop (e.g. the next Celery task) gets its own client
+        other = asyncio.run(grab_and_close())
+        assert other is not first and other.is_closed and not first.is_closed
+        loop.run_until_complete(clients.aclose())
+    finally:
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_polygon_fetch_goes_through_the_shared_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url)
+        return httpx.Response(200, json={"results": [{"t": 1704153600000, "c": 10.5, "v": 100}]})
+
+    clients = _manager(handler)
+    market = MarketProvider(polygon_api_key="k", clients=clients)
+    for _ in range(3):
+        df = await market.fetch_daily_prices("AAPL", date(2024, 1, 1), date(2024, 1, 5))
+    await clients.aclose()
+
+    assert df.to_dict("records") == [{"date": date(2024, 1, 2), "close": 10.5, "volume": 100.0}]
+    assert seen[0].host == "polygon.test"
+    assert seen[0].path == "/v2/aggs/ticker/AAPL/range/1/day/2024-01-01/2024-01-05"
+    assert clients.stats()["opened"] == 1
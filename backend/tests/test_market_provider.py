@@ -0,0 +1,64 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.providers import market_provider
+from app.services.providers.market_provider import MarketProvider, split_yfinance_download
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def _download(tickers: list[str], start, end, **kwargs) -> pd.DataFrame:
+    """Shape of yf.download(tickers, group_by="ticker"); "BAD" failed, "NEW" listed late."""
+    idx = pd.DatetimeIndex(pd.bdate_range(start, end, inclusive="left"), name="Date")
+    cols = pd.MultiIndex.from_product([tickers, FIELDS], names=["Ticker", "Price"])
+    df = pd.DataFrame(np.nan, index=idx, columns=cols)
+    for i, t in enumerate(tickers):
+        if t == "BAD":
+            continue
+        rows = slice(2, None) if t == "NEW" else slice(None)
+        df.loc[df.index[rows], (t, "Close")] = 100.0 + i
+        df.loc[df.index[rows], (t, "Volume")] = 1000.0 * (i + 1)
+    return df
+
+
+def test_split_yfinance_download_per_symbol_frames():
+    raw = _download(["AAA", "BAD", "NEW"], date(2024, 1, 1), date(2024, 1, 8))
+    frames = split_yfinance_download(raw, ["AAA", "BAD", "NEW", "MISSING"])
+
+    assert sorted(frames) == ["AAA", "NEW"]
+    assert list(frames["AAA"].columns) == ["date", "close", "volume"]
+    assert frames["AAA"]["date"].tolist()[0] == date(2024, 1, 1)
+    assert len(frames["AAA"]) == 5 and len(frames["NEW"]) == 3
+    assert frames["NEW"]["close"].tolist() == [102.0] * 3
+
+
+def test_split_yfinance_download_flat_single_ticker():
+    raw = _download(["AAA"], date(2024, 1, 1), date(2024, 1, 3))["AAA"]
+    assert len(split_yfinance_download(raw, ["AAA"])["AAA"]) == 2
+    assert split_yfinance_download(pd.DataFrame(), ["AAA"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_fetch_daily_prices_many_downloads_in_chunks(monkeypatch):
+    calls = []
+
+    class FakeYF:
+        @staticmethod
+        def download(tickers, start, end, **kwargs):
+            calls.append(list(tickers))
+            assert kwargs["group_by"] == "ticker"
+            return _download(list(tickers), start, end)
+
+    monkeypatch.setattr(market_provider, "yf", FakeYF)
+    symbols = [f"S{i}" for i in range(7)] + ["BAD", "S0"]
+
+    frames = await MarketProvider(polygon_api_key="").fetch_daily_prices_many(
+        symbols, date(2024, 1, 1), date(2024, 1, 6), chunk_size=3
+    )
+
+    assert sorted(map(len, calls)) == [2, 3, 3]
+    assert sorted(sum(calls, [])) == sorted(set(symbols))
+    assert sorted(frames) == [f"S{i}" for i in range(7)]
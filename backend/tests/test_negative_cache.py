@@ -0,0 +1,195 @@
+import asyncio
+import time
+import types
+from datetime import date
+
+import httpx
+import pandas as pd
+import pytest
+from tenacity import wait_none
+
+from app.services.providers.errors import (
+    NoDataError,
+    PermanentProviderError,
+    TransientProviderError,
+    classify_http_error,
+    is_retryable,
+)
+from app.services.providers import market_provider
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider
+from app.services.providers.negative_cache import NegativeCache
+from app.services.providers.rate_limiter import RateLimiter
+
+START, END = date(2024, 1, 1), date(2024, 3, 1)
+
+
+class _DictRedis:
+    """Just the commands NegativeCache uses (TTLs are not simulated)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def execute(self):
+        return []
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+
+class _DownRedis:
+    def mget(self, keys):
+        raise ConnectionError("redis down")
+
+    pipeline = mget
+
+
+def test_classify_http_errors():
+    req = httpx.Request("GET", "https://x")
+
+    def status(code):
+        resp = httpx.Response(code, request=req)
+        return classify_http_error(httpx.HTTPStatusError("e", request=req, response=resp))
+
+    assert isinstance(status(404), NoDataError)
+    assert isinstance(status(401), PermanentProviderError) and not is_retryable(status(401))
+    assert isinstance(status(429), TransientProviderError) and is_retryable(status(503))
+    assert isinstance(classify_http_error(httpx.ConnectTimeout("t")), TransientProviderError)
+    assert is_retryable(RuntimeError("unclassified"))
+
+
+def test_entries_shared_through_redis():
+    client = _DictRedis()
+    api, worker = NegativeCache(60, client=client), NegativeCache(60, client=client)
+
+    api.add("yfinance", ["DEAD"])
+    assert worker.filter("yfinance", ["AAPL", "DEAD"]) == (["AAPL"], ["DEAD"])
+    assert not worker.contains("polygon", "DEAD")  # per source
+    worker.discard("yfinance", ["DEAD"])
+    assert not api.contains("yfinance", "DEAD")
+
+
+def test_falls_back_to_in_process_map_when_redis_is_down():
+    cache = NegativeCache(60, client=_DownRedis())
+    cache.add("yfinance", ["DEAD"])
+    assert cache.contains("yfinance", "DEAD") and cache.stats()["backend"] == "local"
+
+    expiring = NegativeCache(0.01, client=_DownRedis())
+    expiring.add("yfinance", ["DEAD"])
+    time.sleep(0.02)
+    assert not expiring.contains("yfinance", "DEAD")
+    assert NegativeCache(0, client=_DownRedis()).filter("yfinance", ["X"]) == (["X"], [])
+
+
+def _market(handler, monkeypatch) -> tuple[MarketProvider, NegativeCache]:
+    monkeypatch.setattr(MarketProvider._fetch_daily_prices.retry, "wait", wait_none())
+    cache = NegativeCache(60, client=_DictRedis())
+    clients = HttpClientManager(
+        base_urls={"polygon": "https://polygon.test"}, transport=httpx.MockTransport(handler)
+    )
+    return MarketProvider(polygon_api_key="k", clients=clients, no_data=cache), cache
+
+
+@pytest.mark.asyncio
+async def test_no_data_is_not_retried_and_short_circuits_next_time(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"resultsCount": 0})
+
+    market, cache = _market(handler, monkeypatch)
+    with pytest.raises(NoDataError):
+        await market.fetch_daily_prices("DEAD", START, END)
+    assert len(calls) == 1
+
+    with pytest.raises(NoDataError):
+        await market.fetch_daily_prices("DEAD", START, END)
+    assert len(calls) == 1 and cache.stats()["hits"] == 1
+    assert await market.fetch_daily_prices_many(["DEAD"], START, END) == {}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_short_windows_are_not_cached(monkeypatch):
+    market, cache = _market(lambda r: httpx.Response(200, json={}), monkeypatch)
+    with pytest.raises(NoDataError):
+        await market.fetch_daily_prices("AAPL", date(2024, 1, 5), date(2024, 1, 8))
+    assert not cache.contains("polygon", "AAPL")
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"results": [{"t": 1704153600000, "c": 1.0, "v": 2}]})
+
+    market, cache = _market(handler, monkeypatch)
+    df = await market.fetch_daily_prices("AAPL", START, END)
+    assert len(calls) == 3 and len(df) == 1
+    assert cache.stats()["added"] == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_yfinance_answers_are_not_cached(monkeypatch):
+    calls = []
+
+    def download(tickers, **kwargs):
+        calls.append(tickers)
+        return pd.DataFrame()  # what yfinance returns for a delisting and an outage alike
+
+    monkeypatch.setattr(market_provider, "yf", types.SimpleNamespace(download=download))
+    cache = NegativeCache(60, client=_DictRedis())
+    market = MarketProvider(polygon_api_key="", no_data=cache, limiter=RateLimiter({}))
+
+    for _ in range(2):
+        with pytest.raises(NoDataError):
+            await market.fetch_daily_prices("AAPL", START, END)
+    assert len(calls) == 2 and not cache.contains("yfinance", "AAPL")
+
+
+@pytest.mark.asyncio
+async def test_yfinance_batch_misses_are_not_cached(monkeypatch):
+    def download(tickers, **kwargs):
+        # a partly throttled chunk: AAPL came back, MSFT is simply missing
+        cols = pd.MultiIndex.from_product([["AAPL"], ["Close", "Volume"]])
+        return pd.DataFrame([[1.0, 2.0]], columns=cols,
+                            index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+    monkeypatch.setattr(market_provider, "yf", types.SimpleNamespace(download=download))
+    cache = NegativeCache(60, client=_DictRedis())
+    market = MarketProvider(polygon_api_key="", no_data=cache, limiter=RateLimiter({}))
+
+    frames = await market.fetch_daily_prices_many(["AAPL", "MSFT"], START, END)
+    assert list(frames) == ["AAPL"] and not cache.contains("yfinance", "MSFT")
+
+
+@pytest.mark.asyncio
+async def test_async_lookups_keep_redis_off_the_event_loop():
+    class _SlowRedis(_DictRedis):
+        def mget(self, keys):
+            time.sleep(0.2)  # a Redis round trip at its socket timeout
+            return super().mget(keys)
+
+    cache = NegativeCache(60, client=_SlowRedis())
+    await cache.add_async("yfinance", ["DEAD"])
+    t0 = time.perf_counter()
+    task = asyncio.create_task(cache.filter_async("yfinance", ["AAPL", "DEAD"]))
+    await asyncio.sleep(0.01)
+    assert not task.done() and time.perf_counter() - t0 < 0.1  # the loop kept running
+    assert await task == (["AAPL"], ["DEAD"])
+    assert await cache.contains_async("yfinance", "DEAD")
@@ -0,0 +1,90 @@
+"""Parity tests for the numpy and ECOS mean-variance backends."""
+
+import numpy as np
+import pytest
+
+from app.services.features.optimizer import mean_variance_opt
+from app.services.features.projected_gradient import (
+    project_capped_simplex,
+    solve_mean_variance_pg,
+)
+
+
+def _inputs(n: int, seed: int, obs: int = 252, mu_scale: float = 0.1):
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0.0005, 0.01, size=(obs, n))
+    return rng.normal(0.02, mu_scale, size=n), np.cov(rets, rowvar=False)
+
+
+def _objective(w, mu, cov, gamma=1.0):
+    return float(mu @ w - gamma * w @ cov @ w)
+
+
+@pytest.mark.parametrize(
+    "n,max_w,seed,mu_scale,gamma",
+    [
+        (6, 0.35, 0, 0.1, 1.0),
+        (6, 0.25, 1, 0.001, 1.0),
+        (20, 0.10, 2, 0.01, 5.0),
+        (60, 0.05, 3, 0.1, 1.0),
+        (60, 0.30, 4, 0.0005, 20.0),
+        (300, 0.02, 5, 0.01, 1.0),  # fewer observations than assets: singular cov
+    ],
+)
+def test_numpy_matches_ecos(n, max_w, seed, mu_scale, gamma):
+    mu, cov = _inputs(n, seed, mu_scale=mu_scale)
+    w_np = mean_variance_opt(mu, cov, max_w=max_w, gamma=gamma, solver="numpy")
+    w_ecos = mean_variance_opt(mu, cov, max_w=max_w, gamma=gamma, solver="ecos")
+
+    assert w_np.sum() == pytest.approx(1.0, abs=1e-8)
+    assert w_np.min() >= 0.0
+    assert w_np.max() <= max_w + 1e-9
+    assert _objective(w_np, mu, cov, gamma) == pytest.approx(
+        _objective(w_ecos, mu, cov, gamma), abs=1e-7
+    )
+    np.testing.assert_allclose(w_np, w_ecos, atol=1e-4)
+
+
+def test_infeasible_cap_falls_back_to_equal_weights():
+    mu, cov = _inputs(6, 0)
+    for solver in ("numpy", "ecos"):
+        np.testing.assert_allclose(
+            mean_variance_opt(mu, cov, max_w=0.1, solver=solver), np.ones(6) / 6
+        )
+
+
+def test_non_convergence_falls_back_to_ecos(monkeypatch):
+    import app.services.features.optimizer as opt
+
+    monkeypatch.setattr(opt, "solve_mean_variance_pg", lambda *a, **k: None)
+    mu, cov = _inputs(10, 7)
+    np.testing.assert_allclose(
+        opt.mean_variance_opt(mu, cov, max_w=0.3, solver="numpy"),
+        opt.mean_variance_opt(mu, cov, max_w=0.3, solver="ecos"),
+    )
+
+
+def test_unknown_solver_rejected():
+    with pytest.raises(ValueError):
+        mean_variance_opt(np.zeros(3), np.eye(3), solver="gurobi")
+
+
+def test_capped_simplex_projection_is_exact():
+    rng = np.random.default_rng(11)
+    for _ in range(50):
+        n = int(rng.integers(2, 40))
+        cap = float(rng.uniform(1.0 / n, 1.0))
+        v = rng.normal(0, 1, size=n)
+        p = project_capped_simplex(v, cap)
+        assert p.sum() == pytest.approx(1.0, abs=1e-10)
+        assert p.min() >= 0.0 and p.max() <= cap + 1e-12
+        # KKT: free coordinates share one shift tau
+        free = (p > 1e-12) & (p < cap - 1e-12)
+        if free.any():
+            shifts = v[free] - p[free]
+            assert np.ptp(shifts) < 1e-9
+
+
+def test_zero_covariance_fills_highest_mu():
+    w = solve_mean_variance_pg(np.array([0.1, 0.3, 0.2]), np.zeros((3, 3)), max_w=0.5)
+    np.testing.assert_allclose(w, [0.0, 0.5, 0.5])
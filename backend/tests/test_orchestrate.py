@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+
+import celery.contrib.testing.tasks  # noqa: F401  (celery.ping, used by start_worker)
+from app.services.tasks import orchestrate
+from app.services.tasks.celery_app import app
+from app.services.tasks.orchestrate import chunks, refresh_dag, stage_report
+
+
+@app.task(name="test.fake_prices")
+def fake_prices(symbols, lookback_days):
+    started = time.time()
+    return {"rows": 10 * len(symbols), "started": started, "finished": time.time()}
+
+
+@app.task(name="test.fake_signals")
+def fake_signals(symbols):
+    started = time.time()
+    return {"count": len(symbols), "started": started, "finished": time.time()}
+
+
+def test_chunks_and_stage_report():
+    assert chunks(list("abcde"), 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert chunks([], 2) == []
+
+    rep = stage_report("prices", 100.0, [
+        {"started": 100.5, "finished": 102.0},
+        {"started": 100.5, "finished": 103.0},
+    ])
+    assert rep == {"stage": "prices", "tasks": 2, "wall_secs": 3.0, "task_secs": 4.0}
+
+
+def test_refresh_dag_is_a_chord_of_price_chunks(monkeypatch):
+    monkeypatch.setattr(orchestrate.settings, "pipeline_price_chunk", 2)
+    dag = refresh_dag(["A", "B", "C"], 30)
+
+    assert [t.args for t in dag.tasks] == [(["A", "B"], 30), (["C"], 30)]
+    assert all(t.immutable for t in dag.tasks)
+    assert dag.body.name == "orchestrate.prices_done"
+
+
+def test_io_and_cpu_tasks_are_routed_to_their_queues():
+    def queue(name):
+        return app.amqp.router.route({}, name)["queue"].name
+
+    assert queue("price.fetch_and_store") == queue("price.fetch_and_store_many") == "io"
+    assert queue("orchestrate.prices_done") == queue("celery.chord_unlock") == "io"
+    assert queue("signal.compute") == queue("signal.compute_batch") == "cpu"
+
+
+class _NoopPriceRepo:
+    def refresh_volume_stats(self):
+        pass
+
+
+@pytest.fixture
+def single_slot_worker(monkeypatch):
+    monkeypatch.setattr(orchestrate, "fetch_and_store_prices_many", fake_prices)
+    monkeypatch.setattr(orchestrate, "compute_signals_batch_task", fake_signals)
+    monkeypatch.setattr(orchestrate, "PriceRepo", _NoopPriceRepo)
+    monkeypatch.setattr(orchestrate.settings, "pipeline_price_chunk", 2)
+    monkeypatch.setattr(orchestrate.settings, "pipeline_signal_chunk", 3)
+
+    saved = {k: app.conf[k] for k in ("broker_url", "result_backend")}
+    app.conf.update(broker_url="memory://", result_backend="cache+memory://")
+    try:
+        # one worker slot: a task blocking on join() would deadlock here
+        with start_worker(app, pool="solo", concurrency=1, perform_ping_check=False):
+            yield
+    finally:
+        app.conf.update(saved)
+
+
+def test_backfill_dag_runs_on_a_single_worker_slot(single_slot_worker):
+    symbols = [f"S{i}" for i in range(5)]
+    res = orchestrate.universe_backfill_and_signals.delay(symbols, 30)
+
+    out = res.get(timeout=30)
+    while not (isinstance(out, dict) and "stages" in out):  # follow replaced tasks
+        res = res.children[-1] if res.children else res
+        out = res.get(timeout=30)
+
+    assert out["count"] == 5
+    prices, signals = out["stages"]
+    assert (prices["stage"], prices["tasks"], prices["rows"]) == ("prices", 3, 50)
+    assert (signals["stage"], signals["tasks"], signals["signals"]) == ("signals", 2, 5)
+    assert prices["wall_secs"] >= 0 and signals["wall_secs"] >= 0
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.db.repositories import price_repo
+from app.services.features.price_cache import PriceMatrixCache, block_from_rows
+
+START = date(2024, 1, 1)
+
+
+def _rows(symbols, days):
+    rng = np.random.default_rng(0)
+    rows = []
+    for i, sym in enumerate(symbols):
+        for d in range(days):
+            if (d + i) % 7 == 0:  # gaps, so forward-fill matters
+                continue
+            rows.append((sym, START + timedelta(days=d), float(rng.uniform(10, 100))))
+    return rows
+
+
+def _pivot(rows, symbols, start, end):
+    """What a fresh load_price_matrix query returns for this window."""
+    rows = [r for r in rows if r[0] in symbols and start <= r[1] <= end]
+    df = pd.DataFrame(rows, columns=["symbol", "date", "close"])
+    return df.pivot(index="date", columns="symbol", values="close").sort_index().ffill()
+
+
+@pytest.mark.parametrize(
+    "symbols,start,end",
+    [
+        (["AAA", "BBB", "CCC"], START, START + timedelta(days=59)),
+        (["BBB"], START + timedelta(days=10), START + timedelta(days=30)),
+        (["CCC", "AAA"], START + timedelta(days=3), START + timedelta(days=3)),
+    ],
+)
+def test_sliced_block_matches_fresh_query(symbols, start, end):
+    all_syms = ["AAA", "BBB", "CCC", "NODATA"]
+    rows = _rows(all_syms[:3], 60)
+    block = block_from_rows(rows, all_syms, START, START + timedelta(days=59), version=0)
+
+    got = block.frame(frozenset(symbols), start, end)
+    pd.testing.assert_frame_equal(got, _pivot(rows, symbols, start, end), check_names=False)
+
+
+def test_cache_serves_subsets_and_invalidates_on_write(monkeypatch):
+    monkeypatch.setattr(price_repo, "_data_version", 0)
+    cache = PriceMatrixCache(max_bytes=1 << 20, ttl_secs=60)
+    end = START + timedelta(days=59)
+    cache.put(block_from_rows(_rows(["AAA", "BBB"], 60), ["AAA", "BBB"], START, end, 0))
+
+    assert list(cache.get(["BBB"], START + timedelta(days=5), end).columns) == ["BBB"]
+    assert cache.get(["AAA", "ZZZ"], START, end) is None  # symbol not loaded
+    assert cache.get(["AAA"], START - timedelta(days=1), end) is None  # wider window
+
+    price_repo._bump_data_version()
+    assert cache.get(["AAA"], START, end) is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_lru_over_budget():
+    one = block_from_rows(_rows(["AAA"], 60), ["AAA"], START, START + timedelta(days=59), 0)
+    cache = PriceMatrixCache(max_bytes=2 * one.nbytes, ttl_secs=60)
+    for sym in ("AAA", "BBB", "CCC"):
+        cache.put(block_from_rows(_rows([sym], 60), [sym], START, START + timedelta(days=59), 0))
+
+    assert cache.stats()["blocks"] == 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
@@ -0,0 +1,202 @@
+"""Tests for price ingestion helpers."""
+
+from datetime import date
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from tenacity import wait_none
+
+from app.services.features.price_ingest import (
+    backfill_many,
+    last_complete_bar,
+    missing_window,
+    normalize_price_frame,
+)
+from app.services.providers.errors import NoDataError, TransientProviderError
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider
+from app.services.providers.negative_cache import NegativeCache
+from app.services.providers.rate_limiter import RateLimiter
+
+START, END = date(2024, 1, 1), date(2024, 6, 12)  # END is a Wednesday
+
+
+def test_last_complete_bar_skips_weekends():
+    assert last_complete_bar(date(2024, 6, 12)) == date(2024, 6, 11)
+    assert last_complete_bar(date(2024, 6, 10)) == date(2024, 6, 7)  # Monday -> Friday
+    assert last_complete_bar(date(2024, 6, 9)) == date(2024, 6, 7)  # Sunday -> Friday
+
+
+def test_missing_window_without_history_fetches_full_window():
+    assert missing_window(None, START, END) == START
+    assert missing_window(date(2023, 5, 1), START, END) == START
+
+
+def test_missing_window_fetches_only_the_gap():
+    assert missing_window(date(2024, 6, 5), START, END) == date(2024, 6, 6)
+
+
+def test_missing_window_skips_current_symbols():
+    assert missing_window(date(2024, 6, 11), START, END) is None
+    assert missing_window(date(2024, 6, 7), START, date(2024, 6, 10)) is None
+
+
+def test_normalize_price_frame_coerces_mixed_dates():
+    df = pd.DataFrame(
+        {
+            "date": [pd.Timestamp("2024-01-03"), date(2024, 1, 2), "2024-01-04", None],
+            "close": [101.0, "100.5", np.nan, 99.0],
+            "volume": [1000, 2000, 3000, None],
+        }
+    )
+    cols = normalize_price_frame(df)
+    assert cols.dates.dtype == np.dtype("datetime64[D]")
+    assert cols.dates.tolist() == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert cols.close.tolist() == [100.5, 101.0]
+    assert cols.volume.tolist() == [2000.0, 1000.0]
+
+
+def test_normalize_price_frame_dedups_dates_and_handles_tz():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-02", "2024-01-02", "2024-01-03"]).tz_localize(
+                "America/New_York"
+            ),
+            "close": [1.0, 2.0, 3.0],
+            "volume": [0, 0, None],
+        }
+    )
+    cols = normalize_price_frame(df)
+    assert cols.dates.tolist() == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert cols.close.tolist() == [2.0, 3.0]
+    assert cols.volume.tolist() == [0.0, 0.0]
+
+
+def test_normalize_price_frame_empty():
+    assert normalize_price_frame(None).dates.size == 0
+    assert normalize_price_frame(pd.DataFrame()).dates.size == 0
+
+
+class _FakeMarket:
+    grouped_daily_available = False
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_daily_prices_many(self, symbols, start, end, errors=None):
+        self.calls.append((sorted(symbols), start))
+        days = pd.bdate_range(start, end, inclusive="left")
+        return {
+            s: pd.DataFrame({"date": days, "close": 10.0, "volume": 1.0})
+            for s in symbols if s != "GONE"
+        }
+
+
+class _FakePriceRepo:
+    def __init__(self, watermarks):
+        self.watermarks = watermarks
+        self.upserts = []
+
+    async def latest_dates(self, asset_ids):
+        return {a: d for a, d in self.watermarks.items() if a in asset_ids}
+
+    async def bulk_upsert(self, asset_ids, dates, close, volume):
+        self.upserts.append(sorted(set(asset_ids.tolist())))
+        return len(asset_ids)
+
+
+@pytest.mark.asyncio
+async def test_backfill_many_groups_downloads_by_start_and_upserts_once():
+    market = _FakeMarket()
+    ids = {"NEW1": 1, "NEW2": 2, "LAG1": 3, "LAG2": 4, "CUR": 5, "GONE": 6}
+    repo = _FakePriceRepo({3: date(2024, 6, 5), 4: date(2024, 6, 5), 5: date(2024, 6, 11)})
+
+    got = await backfill_many(market, repo, ids, START, END)
+
+    assert sorted(market.calls) == [
+        (["GONE", "NEW1", "NEW2"], START), (["LAG1", "LAG2"], date(2024, 6, 6))
+    ]
+    assert repo.upserts == [[1, 2, 3, 4]]
+    assert got["LAG1"] == 4 and got["NEW1"] == len(pd.bdate_range(START, date(2024, 6, 11)))
+    assert got["CUR"] == 0 and got["GONE"] == 0
+
+
+class _FlakyMarket(_FakeMarket):
+    """Fails the download for every start date in `errors` with that error."""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = errors
+
+    async def fetch_daily_prices_many(self, symbols, start, end, errors=None):
+        if start in self.errors:
+            raise self.errors[start]
+        return await super().fetch_daily_prices_many(symbols, start, end)
+
+
+@pytest.mark.asyncio
+async def test_backfill_many_stores_the_rest_then_raises_transient_failures():
+    market = _FlakyMarket({START: TransientProviderError("429")})
+    repo = _FakePriceRepo({3: date(2024, 6, 5)})
+
+    with pytest.raises(TransientProviderError):
+        await backfill_many(market, repo, {"NEW": 1, "LAG": 3}, START, END)
+    assert repo.upserts == [[3]]  # the healthy chunk was stored before raising
+
+
+@pytest.mark.asyncio
+async def test_backfill_many_raises_per_symbol_polygon_failures(monkeypatch):
+    def handler(request):
+        if "/DOWN/" in request.url.path:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"results": [{"t": 1704153600000, "c": 1.0, "v": 2}]})
+
+    monkeypatch.setattr(MarketProvider._fetch_daily_prices.retry, "wait", wait_none())
+    clients = HttpClientManager(
+        base_urls={"polygon": "https://polygon.test"}, transport=httpx.MockTransport(handler)
+    )
+    market = MarketProvider(polygon_api_key="k", clients=clients, no_data=NegativeCache(0),
+                            limiter=RateLimiter({}))
+    repo = _FakePriceRepo({})
+
+    with pytest.raises(TransientProviderError):
+        await backfill_many(market, repo, {"UP": 1, "DOWN": 2}, START, END)
+    assert repo.upserts == [[1]]  # the symbol that did answer was stored before raising
+
+
+@pytest.mark.asyncio
+async def test_backfill_many_does_not_raise_permanent_failures():
+    market = _FlakyMarket({START: NoDataError("delisted")})
+    repo = _FakePriceRepo({3: date(2024, 6, 5)})
+
+    got = await backfill_many(market, repo, {"NEW": 1, "LAG": 3}, START, END)
+    assert got == {"NEW": 0, "LAG": 4}
+
+
+def test_price_chunk_task_retries_transient_failures_then_reports(monkeypatch):
+    from app.services.tasks import price_tasks, worker_state
+
+    calls = []
+
+    class _Assets:
+        async def resolve_many(self, symbols):
+            return {s: i for i, s in enumerate(symbols)}
+
+    async def failing_backfill(*args, **kwargs):
+        calls.append(1)
+        raise TransientProviderError("yahoo down")
+
+    monkeypatch.setattr(price_tasks, "AsyncAssetRepo", _Assets)
+    monkeypatch.setattr(price_tasks, "backfill_many", failing_backfill)
+    monkeypatch.setattr(worker_state, "_resources", None)
+    worker_state.init_worker(preload_model=False)
+    try:
+        out = price_tasks.fetch_and_store_prices_many.apply(args=[["AAA"], 30]).get()
+    finally:
+        worker_state.shutdown_worker()
+
+    # first attempt plus max_retries eager retries, then the chunk reports the error
+    assert len(calls) == 1 + price_tasks.RetriableTask.retry_kwargs["max_retries"]
+    assert out["rows"] == 0 and "yahoo down" in out["error"]
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+import types
+from datetime import date
+
+import httpx
+import pandas as pd
+import pytest
+
+from app.services.providers import market_provider
+from app.services.providers.http_clients import HttpClientManager
+from app.services.providers.market_provider import MarketProvider, fetch_yfinance_many
+from app.services.providers.negative_cache import NegativeCache
+from app.services.providers.news_provider import NewsProvider
+from app.services.providers.rate_limiter import RateLimiter, parse_rate, take
+
+
+class _BucketRedis:
+    """Stand-in for Redis running the take script: the same update, on a shared dict."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def register_script(self, script):
+        def run(keys, args):
+            rate, capacity, n = (float(a) for a in args)
+            with self._lock:
+                self.calls += 1
+                self.buckets[keys[0]], wait = take(
+                    self.buckets.get(keys[0]), time.time(), rate, capacity, n
+                )
+            return str(wait)
+
+        return run
+
+
+class _DownRedis:
+    def register_script(self, script):
+        raise ConnectionError("redis down")
+
+
+class _Recording(RateLimiter):
+    def __init__(self, **kwargs):
+        super().__init__(client=_BucketRedis(), **kwargs)
+        self.taken = []
+
+    def reserve(self, upstream, n=1):
+        self.taken.append((upstream, n))
+        return super().reserve(upstream, n)
+
+
+def test_parse_rate():
+    assert parse_rate("30/m") == 0.5
+    assert parse_rate("5/s") == parse_rate("5") == 5.0
+    assert parse_rate("3600/h") == 1.0
+    assert parse_rate("") == parse_rate(None) == 0.0
+
+
+def test_take_bursts_then_queues_reservations():
+    state, waits = None, []
+    for _ in range(4):
+        state, wait = take(state, 100.0, rate=10, capacity=2, n=1)
+        waits.append(round(wait, 6))
+    assert waits == [0.0, 0.0, 0.1, 0.2]
+
+    # refills at rate, up to capacity
+    assert take(state, 100.3, rate=10, capacity=2, n=1)[1] == pytest.approx(0.0)
+    assert take(state, 150.0, rate=10, capacity=2, n=1)[0][0] == pytest.approx(1.0)
+
+
+def test_buckets_are_shared_through_redis():
+    client = _BucketRedis()
+    api = RateLimiter({"polygon": 10.0, "newsapi": 10.0}, burst_secs=0.1, client=client)
+    worker = RateLimiter({"polygon": 10.0, "newsapi": 10.0}, burst_secs=0.1, client=client)
+
+    assert api.reserve("polygon") == 0.0
+    assert worker.reserve("polygon") == pytest.approx(0.1, abs=0.02)
+    assert worker.reserve("newsapi") == 0.0  # per upstream
+    assert api.stats()["upstreams"]["polygon"]["requests"] == 1
+
+
+def test_unlimited_upstreams_skip_redis():
+    client = _BucketRedis()
+    limiter = RateLimiter({"polygon": 0.0}, client=client)
+    assert limiter.reserve("polygon") == limiter.reserve("yahoo") == 0.0
+    assert client.calls == 0
+
+
+def test_falls_back_to_local_buckets_when_redis_is_down():
+    limiter = RateLimiter({"polygon": 10.0}, burst_secs=0.1, client=_DownRedis())
+    assert limiter.reserve("polygon") == 0.0
+    assert limiter.reserve("polygon") == pytest.approx(0.1, abs=0.02)
+    assert limiter.stats()["backend"] == "local"
+
+
+def test_blocking_acquire_spaces_threads():
+    limiter = RateLimiter({"yahoo": 20.0}, burst_secs=0.05, client=_BucketRedis())
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=limiter.acquire, args=("yahoo",)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.perf_counter() - t0 >= 0.18  # 4 waits of 1/20 s after the first token
+
+
+@pytest.mark.asyncio
+async def test_providers_acquire_before_each_request():
+    def handler(request):
+        if request.url.path.startswith("/v2/aggs"):
+            return httpx.Response(200, json={"results": [{"t": 1704153600000, "c": 1.0, "v": 2}]})
+        rss = "<rss><channel><item><title>t</title></item></channel></rss>"
+        return httpx.Response(200, text=rss)
+
+    clients = HttpClientManager(
+        base_urls={"polygon": "https://polygon.test", "google_news": "https://news.test"},
+        transport=httpx.MockTransport(handler),
+    )
+    limiter = _Recording(limits={"polygon": 20.0, "google_news": 100.0}, burst_secs=0.05)
+    market = MarketProvider(polygon_api_key="k", clients=clients,
+                            no_data=NegativeCache(0), limiter=limiter)
+    news = NewsProvider(newsapi_key="", clients=clients, limiter=limiter)
+
+    t0 = time.perf_counter()
+    frames = await market.fetch_daily_prices_many(
+        [f"S{i}" for i in range(5)], date(2024, 1, 1), date(2024, 3, 1)
+    )
+    assert len(frames) == 5 and time.perf_counter() - t0 >= 0.18
+    await news.fetch_headlines("AAPL")
+    assert limiter.taken == [("polygon", 1)] * 5 + [("google_news", 1)]
+
+
+@pytest.mark.asyncio
+async def test_yfinance_downloads_take_a_token_per_ticker(monkeypatch):
+    def download(tickers, **kwargs):
+        cols = pd.MultiIndex.from_product([tickers, ["Close", "Volume"]])
+        return pd.DataFrame([[1.0, 2.0] * len(tickers)], columns=cols,
+                            index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+    monkeypatch.setattr(market_provider, "yf", types.SimpleNamespace(download=download))
+    limiter = _Recording(limits={"yahoo": 1000.0})
+    frames = await fetch_yfinance_many(list("ABCDE"), date(2024, 1, 1), date(2024, 1, 5),
+                                       chunk_size=2, limiter=limiter)
+    assert sorted(frames) == list("ABCDE")
+    assert sorted(limiter.taken) == [("yahoo", 1), ("yahoo", 2), ("yahoo", 2)]
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_keeps_redis_off_the_event_loop():
+    class _SlowRedis(_BucketRedis):
+        def register_script(self, script):
+            run = super().register_script(script)
+
+            def slow(keys, args):
+                time.sleep(0.2)  # a Redis round trip at its socket timeout
+                return run(keys, args)
+
+            return slow
+
+    limiter = RateLimiter({"polygon": 100.0}, client=_SlowRedis())
+    t0 = time.perf_counter()
+    task = asyncio.create_task(limiter.acquire_async("polygon"))
+    await asyncio.sleep(0.01)
+    assert not task.done() and time.perf_counter() - t0 < 0.1  # the loop kept running
+    assert await task == 0.0
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.asset import Asset
+from app.db.models.signal import Signal
+from app.db.repositories.signal_repo import SignalRepo
+from app.services.features import recommender
+from app.services.features.recommender import RecommenderService
+
+TODAY = date.today()
+OLD = TODAY - timedelta(days=30)
+
+
+class _FakeSignalRepo:
+    latest: dict = {}
+
+    async def latest_by_symbol(self, symbols, kinds):
+        return {s: v for s, v in self.latest.items() if s in symbols}
+
+
+@pytest.fixture
+def cached(monkeypatch):
+    queued = []
+
+    async def no_prices(symbols, start, end):
+        return pd.DataFrame()
+
+    monkeypatch.setattr(recommender, "AsyncSignalRepo", _FakeSignalRepo)
+    monkeypatch.setattr(recommender, "load_price_matrix_async", no_prices)
+    monkeypatch.setattr(recommender, "_enqueue_refresh", queued.append)
+    monkeypatch.setattr(recommender, "_refresh_queued_at", {})
+    monkeypatch.setattr(recommender.settings, "signal_max_age_days", 3)
+    monkeypatch.setattr(_FakeSignalRepo, "latest", {
+        "FRESH": {"momentum": (TODAY, 0.2), "sentiment": (TODAY, 0.5)},
+        "STALE": {"momentum": (OLD, 0.1), "sentiment": (TODAY, 0.0)},
+        "HALF": {"momentum": (TODAY, 0.3)},
+    })
+    return queued
+
+
+async def _recommend(symbols):
+    out = await RecommenderService(signal_service=None).recommend(
+        "balanced", 1000, symbols=symbols, solver="numpy", mode="cached"
+    )
+    await asyncio.gather(*recommender._background_tasks)
+    return out
+
+
+@pytest.mark.asyncio
+async def test_cached_mode_serves_stored_signals_and_queues_stale_ones(cached):
+    out = await _recommend(["FRESH", "STALE", "HALF", "NEW"])
+
+    sigs = {x["symbol"]: x for x in out["signals"]}
+    assert not sigs["FRESH"]["stale"] and sigs["FRESH"]["date"] == str(TODAY)
+    assert sigs["STALE"]["stale"] and sigs["STALE"]["date"] == str(OLD)  # oldest kind counts
+    assert sigs["HALF"]["stale"] and sigs["HALF"]["sentiment"] == 0.0
+    # never-scored symbols are queued and left out of the allocation
+    assert "NEW" not in sigs and set(out["allocation_weights"]) == {"FRESH", "STALE", "HALF"}
+    assert out["refresh_queued"] == ["STALE", "HALF", "NEW"]
+    assert cached == [["STALE", "HALF", "NEW"]]
+
+
+@pytest.mark.asyncio
+async def test_stale_symbols_are_requeued_only_after_the_interval(cached, monkeypatch):
+    await _recommend(["STALE", "FRESH"])
+    assert (await _recommend(["STALE", "FRESH"]))["refresh_queued"] == []
+
+    recommender._refresh_queued_at["STALE"] -= recommender.REFRESH_REQUEUE_SECS
+    assert (await _recommend(["STALE"]))["refresh_queued"] == ["STALE"]
+    assert cached == [["STALE"], ["STALE"]]
+
+
+@pytest.mark.asyncio
+async def test_nothing_scored_yet_returns_an_empty_allocation(cached):
+    out = await _recommend(["NEW1", "NEW2"])
+    assert out["signals"] == [] and out["allocation_weights"] == {}
+    assert out["inputs"]["symbols"] == ["NEW1", "NEW2"] and cached == [["NEW1", "NEW2"]]
+
+
+def test_latest_by_symbol_picks_the_newest_row_per_kind():
+    engine = create_engine("sqlite://")
+    Asset.__table__.create(engine)
+    Signal.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add_all([Asset(id=1, symbol="AAA"), Asset(id=2, symbol="BBB")])
+        s.add_all([
+            Signal(asset_id=1, date=OLD, kind="momentum", value=0.1, meta={}),
+            Signal(asset_id=1, date=TODAY, kind="momentum", value=0.2, meta={}),
+            Signal(asset_id=1, date=OLD, kind="sentiment", value=0.3, meta={}),
+            Signal(asset_id=1, date=TODAY, kind="value", value=9.0, meta={}),
+            Signal(asset_id=2, date=OLD, kind="sentiment", value=0.4, meta={}),
+        ])
+        s.commit()
+
+    latest = SignalRepo(session_factory=Session).latest_by_symbol(["AAA", "BBB", "CCC"])
+    assert latest == {
+        "AAA": {"momentum": (TODAY, 0.2), "sentiment": (OLD, 0.3)},
+        "BBB": {"sentiment": (OLD, 0.4)},
+    }
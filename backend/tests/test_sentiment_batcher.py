@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.providers.sentiment_batcher import SentimentBatcher
+
+
+class RecordingProvider:
+    """score_each stand-in: the score of a text is its length."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def score_each(self, texts):
+        self.calls.append(list(texts))
+        return [float(len(t)) for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_batches_and_fan_out():
+    provider = RecordingProvider()
+    batcher = SentimentBatcher(provider, max_batch=100, max_latency_ms=50)
+    groups = [[f"{i}" * (j + 1) for j in range(3)] for i in range(10)]
+
+    results = await asyncio.gather(*[batcher.score_each(g) for g in groups])
+
+    assert results == [[float(len(t)) for t in g] for g in groups]
+    assert len(provider.calls) == 1 and len(provider.calls[0]) == 30
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_size_bounded():
+    provider = RecordingProvider()
+    batcher = SentimentBatcher(provider, max_batch=8, max_latency_ms=50)
+
+    await asyncio.gather(*[batcher.score_each(["a", "bb", "ccc"]) for _ in range(10)])
+
+    assert max(len(c) for c in provider.calls) <= 8
+    assert batcher.stats()["texts"] == 30
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_score_texts_skips_blanks_and_propagates_errors():
+    class Failing(RecordingProvider):
+        def score_each(self, texts):
+            raise RuntimeError("model down")
+
+    assert await SentimentBatcher(RecordingProvider()).score_texts(["", "  ", "abcd"]) == 4.0
+    with pytest.raises(RuntimeError):
+        await SentimentBatcher(Failing()).score_texts(["x"])
+
+
+@pytest.mark.asyncio
+async def test_signal_services_share_one_batcher_and_leave_no_task(monkeypatch):
+    from app.api import deps
+
+    provider = RecordingProvider()
+    monkeypatch.setattr(deps, "_sentiment_batcher", SentimentBatcher(provider, max_latency_ms=50))
+    monkeypatch.setattr(deps, "SentimentProvider", lambda: provider)
+    a, b = deps.get_signal_service(), deps.get_signal_service()
+    assert a is not b and a.sentiment_batcher is b.sentiment_batcher
+
+    scores = await asyncio.gather(a.sentiment_batcher.score_texts(["aa"]),
+                                  b.sentiment_batcher.score_texts(["bbbb"]))
+
+    assert scores == [2.0, 4.0] and len(provider.calls) == 1
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    await deps.close_sentiment_batcher()
+
+
+@pytest.mark.asyncio
+async def test_batcher_worker_exits_when_idle():
+    from app.services.features.signals import SignalService
+
+    for _ in range(3):  # per-call services, as background code builds them
+        svc = SignalService(None, None, RecordingProvider())
+        assert await svc.sentiment_batcher.score_texts(["abc"]) == 3.0
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_aclose_fails_callers_instead_of_leaving_them_waiting():
+    class Slow(RecordingProvider):
+        def score_each(self, texts):
+            time.sleep(0.1)
+            return super().score_each(texts)
+
+    batcher = SentimentBatcher(Slow(), max_batch=1, max_latency_ms=1000)
+    first = asyncio.create_task(batcher.score_each(["in flight"]))
+    queued = asyncio.create_task(batcher.score_each(["queued"]))
+    await asyncio.sleep(0.02)
+
+    await batcher.aclose()
+    for task in (first, queued):
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(task, 1)
@@ -0,0 +1,93 @@
+import pytest
+
+from app.core.config import settings
+from app.services.providers.sentiment_cache import SentimentScoreCache, text_key
+from app.services.providers.sentiment_provider import SentimentProvider, load_finbert_pipeline
+
+
+class DictRepo:
+    """In-memory stand-in for SentimentScoreRepo."""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str], float] = {}
+
+    def get_many(self, hashes, model):
+        return {h: self.rows[(h, model)] for h in hashes if (h, model) in self.rows}
+
+    def put_many(self, scores, model):
+        for h, v in scores.items():
+            self.rows.setdefault((h, model), v)
+        return len(scores)
+
+
+class CountingVader:
+    def __init__(self):
+        self.seen: list[str] = []
+
+    def polarity_scores(self, text):
+        self.seen.append(text)
+        return {"compound": len(text) / 100}
+
+
+def _provider(cache):
+    p = SentimentProvider(cache=cache, processes=0)
+    p._pipe = False  # no FinBERT: score with the VADER path
+    p._vader = CountingVader()
+    return p
+
+
+def test_text_key_normalizes_whitespace_and_unicode():
+    assert text_key("Fed  holds\nrates ") == text_key("Fed holds rates")
+    assert text_key("ＡＡＰＬ beats") == text_key("AAPL beats")
+    assert text_key("Fed holds rates") != text_key("Fed cuts rates")
+
+
+def test_only_unseen_texts_reach_the_model():
+    provider = _provider(SentimentScoreCache(DictRepo()))
+
+    first = provider.score_each(["up big", "down", "up  big"])
+    second = provider.score_each(["down", "flat"])
+
+    assert provider._vader.seen == ["up big", "down", "flat"]
+    assert first[0] == first[2] and second[0] == first[1]
+    assert provider.cache.stats()["memory_hits"] == 1
+
+
+def test_store_tier_serves_other_processes_and_lru_is_bounded():
+    repo = DictRepo()
+    _provider(SentimentScoreCache(repo)).score_each(["a", "b", "c"])
+
+    cold = _provider(SentimentScoreCache(repo, max_entries=2))
+    cold.score_each(["a", "b", "c"])
+
+    stats = cold.cache.stats()
+    assert cold._vader.seen == []
+    assert stats["store_hits"] == 3 and stats["entries"] == 2 and stats["hit_rate"] == 1.0
+
+
+def test_cache_survives_store_errors():
+    class BrokenRepo(DictRepo):
+        def get_many(self, hashes, model):
+            raise RuntimeError("db down")
+
+        put_many = get_many
+
+    provider = _provider(SentimentScoreCache(BrokenRepo()))
+    assert provider.score_each(["x"]) == provider.score_each(["x"])
+    assert provider._vader.seen == ["x"]
+
+
+def test_cache_key_separates_backends_and_truncation():
+    def loaded(**kw):
+        p = SentimentProvider(cache=None, processes=0, **kw)
+        p._pipe = object()  # pretend the pipeline is loaded
+        return p
+
+    assert loaded().model_name() == settings.finbert_model
+    assert loaded(backend="int8").model_name() == f"{settings.finbert_model}[int8,512]"
+    assert loaded(max_length=128).model_name() == f"{settings.finbert_model}[torch,128]"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_finbert_pipeline(backend="fp8")
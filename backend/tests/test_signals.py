@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from app.services.features.signals import momentum_kind, trailing_returns
+
+
+def _reference(col: pd.Series, lb: int) -> float:
+    """SignalService.momentum_signal's per-symbol formula."""
+    s = col.dropna()
+    if len(s) < lb + 1:
+        return np.nan
+    return (s.iloc[-1] - s.iloc[-lb - 1]) / s.iloc[-lb - 1]
+
+
+def test_trailing_returns_matches_per_symbol_formula():
+    rng = np.random.default_rng(0)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=(200, 5)), axis=0)
+    prices[:150, 1] = np.nan  # short history
+    prices[rng.random(200) < 0.1, 2] = np.nan  # interior gaps
+    prices[:, 3] = np.nan  # no data
+    lookbacks = (5, 20, 60)
+
+    got = trailing_returns(prices, lookbacks)
+
+    df = pd.DataFrame(prices)
+    want = np.array([[_reference(df[j], lb) for j in df] for lb in lookbacks])
+    np.testing.assert_allclose(got, want, equal_nan=True)
+
+
+def test_trailing_returns_empty_matrix():
+    assert np.isnan(trailing_returns(np.empty((0, 3)), (60,))).all()
+
+
+def test_momentum_kind():
+    assert momentum_kind(60) == "momentum"
+    assert momentum_kind(120) == "momentum_120d"
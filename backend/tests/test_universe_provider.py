@@ -0,0 +1,109 @@
+import sys
+import types
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from app.services.providers import market_provider, universe_provider
+from app.services.providers.universe_provider import UniverseProvider, sp500_constituents
+
+
+@pytest.fixture
+def constituents(monkeypatch):
+    calls = []
+    members = ["AAA", "BBB", "CCC", "DDD"]
+
+    def tickers_sp500():
+        calls.append(1)
+        if members is None:
+            raise ConnectionError("offline")
+        return list(members)
+
+    fake = types.ModuleType("yahoo_fin")
+    fake.stock_info = types.SimpleNamespace(tickers_sp500=tickers_sp500)
+    monkeypatch.setitem(sys.modules, "yahoo_fin", fake)
+    monkeypatch.setattr(universe_provider, "_constituents", None)
+    return calls
+
+
+class _FakePriceRepo:
+    def __init__(self, stats):
+        self.stats = stats
+        self.stored = {}
+
+    async def volume_stats(self, symbols, start):
+        return {s: v for s, v in self.stats.items() if s in symbols}
+
+    async def bulk_upsert(self, asset_ids, dates, close, volume):
+        for a in asset_ids.tolist():
+            self.stored[a] = self.stored.get(a, 0) + 1
+        return len(asset_ids)
+
+
+class _FakeAssetRepo:
+    def __init__(self, ids):
+        self.ids = dict(ids)
+        self.created = []
+
+    async def resolve_many(self, symbols):
+        return {s: self.ids[s] for s in symbols if s in self.ids}
+
+    async def ensure_assets(self, assets):
+        for a in assets:
+            self.created.append(a["symbol"])
+            self.ids[a["symbol"]] = 100 + len(self.ids)
+        return [self.ids[a["symbol"]] for a in assets]
+
+
+@pytest.mark.asyncio
+async def test_constituents_cached_for_ttl(constituents):
+    assert await sp500_constituents() == ["AAA", "BBB", "CCC", "DDD"]
+    await sp500_constituents()
+    assert len(constituents) == 1
+    await sp500_constituents(ttl_secs=0)
+    assert len(constituents) == 2
+
+
+@pytest.mark.asyncio
+async def test_local_ranking_downloads_only_stale_members(constituents, monkeypatch):
+    today = date.today()
+    repo = _FakePriceRepo(
+        {
+            "AAA": (5e6, today - timedelta(days=1)),
+            "BBB": (9e6, today - timedelta(days=30)),  # stale: refreshed below
+            "CCC": (7e6, today - timedelta(days=2)),
+        }
+    )
+    downloaded = []
+
+    def bars(n, volume):
+        dates = pd.bdate_range(today - timedelta(days=60), periods=n).date
+        return pd.DataFrame({"date": dates, "close": 10.0, "volume": volume})
+
+    async def fetch_yfinance_many(symbols, start, end, limiter=None, concurrency=None):
+        downloaded.append(sorted(symbols))
+        return {"BBB": bars(40, 1e6), "DDD": bars(1, 8e6)}
+
+    monkeypatch.setattr(market_provider, "fetch_yfinance_many", fetch_yfinance_many)
+    assets = _FakeAssetRepo({"AAA": 1, "BBB": 2, "CCC": 3})
+    provider = UniverseProvider(polygon_api_key="", price_repo=repo, asset_repo=assets)
+    top = await provider._local_top_volume_sp500(3)
+
+    assert downloaded == [["BBB", "DDD"]]
+    assert top == ["DDD", "CCC", "AAA"]
+    # downloads are stored, creating the member that had no asset yet
+    assert assets.created == ["DDD"]
+    assert repo.stored == {2: 40, assets.ids["DDD"]: 1}
+
+
+@pytest.mark.asyncio
+async def test_local_ranking_falls_back_to_stored_volume_offline(constituents, monkeypatch):
+    repo = _FakePriceRepo({"AAA": (5e6, date.today()), "BBB": (9e6, date(2020, 1, 1))})
+
+    async def offline(symbols, start, end, limiter=None, concurrency=None):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(market_provider, "fetch_yfinance_many", offline)
+    top = await UniverseProvider(polygon_api_key="", price_repo=repo)._local_top_volume_sp500(5)
+    assert top == ["BBB", "AAA"]
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.tasks import worker_state
+from app.services.tasks.task_utils import run_async
+
+
+async def _loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(worker_state, "_resources", None)
+    res = worker_state.init_worker(preload_model=False)
+    yield res
+    worker_state.shutdown_worker()
+
+
+def test_tasks_share_the_worker_loop_and_providers(worker):
+    assert worker_state.worker_resources() is worker
+    assert run_async(_loop()) is run_async(_loop()) is worker.loop
+    assert worker.signals.market is worker.market
+
+    worker_state.shutdown_worker()
+    assert worker.loop.is_closed() and worker_state.current_worker() is None
+    assert run_async(_loop()) is not worker.loop  # fresh loop outside a worker
+
+
+def test_pool_threads_share_the_worker_loop(worker):
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(run_async(_loop()))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen == [worker.loop] * 4
+
+
+def test_throughput_accounting(worker):
+    worker.record(50, 2.0)
+    assert worker.record(30, 2.0) == {
+        "tasks": 2, "symbols": 80, "busy_secs": 4.0, "symbols_per_sec": 20.0
+    }
@@ -0,0 +1,80 @@
+"""Polygon fan-out against a throttling mock: fixed concurrency limits vs AIMD.
+
+The mock (an in-process httpx transport) serves CAPACITY concurrent requests with
+LATENCY each and answers 429 to anything beyond that, like an upstream's concurrency
+quota. MarketProvider.fetch_daily_prices_many fetches 300 symbols with the provider's
+real retry policy (exponential backoff from 1 s on 429) under:
+
+- fixed-10: the old Semaphore(10);
+- fixed-40: a larger fixed limit;
+- adaptive: AdaptiveLimiter starting at 10 (ADAPTIVE_CONCURRENCY_*).
+
+Run once for an upstream tighter than 10 (CAPACITY 6) and once for a roomier one (30).
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.providers.concurrency import ConcurrencyLimits  # noqa: E402
+from app.services.providers.http_clients import HttpClientManager  # noqa: E402
+from app.services.providers.market_provider import MarketProvider  # noqa: E402
+from app.services.providers.negative_cache import NegativeCache  # noqa: E402
+from app.services.providers.rate_limiter import RateLimiter  # noqa: E402
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(300)]
+LATENCY = 0.05
+START, END = date(2024, 1, 1), date(2024, 3, 1)
+_BARS = {"results": [{"t": 1704153600000 + i * 86400000, "c": 100.0 + i, "v": 1e6} for i in range(40)]}
+
+
+class ThrottlingUpstream:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.throttled = 0
+
+    async def __call__(self, request):
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                return httpx.Response(429)
+            await asyncio.sleep(LATENCY)
+            return httpx.Response(200, json=_BARS)
+        finally:
+            self.in_flight -= 1
+
+
+async def run(name: str, capacity: int, limits: ConcurrencyLimits) -> None:
+    upstream = ThrottlingUpstream(capacity)
+    clients = HttpClientManager(base_urls={"polygon": "https://polygon.test"},
+                                transport=httpx.MockTransport(upstream))
+    market = MarketProvider(polygon_api_key="k", clients=clients, no_data=NegativeCache(0),
+                            limiter=RateLimiter({}), concurrency=limits)
+    t0 = time.perf_counter()
+    frames = await market.fetch_daily_prices_many(SYMBOLS, START, END)
+    dt = time.perf_counter() - t0
+    stats = limits.stats()["upstreams"]["polygon"]
+    print(f"  {name:>8}: {dt:5.2f} s, {len(frames)}/{len(SYMBOLS)} symbols, "
+          f"{upstream.throttled:4d} x 429, final limit {stats['limit']:5.1f}, "
+          f"latency {stats['latency_ms']} ms")
+    await clients.aclose()
+
+
+async def main() -> None:
+    for capacity in (6, 30):
+        print(f"upstream capacity {capacity} concurrent requests, {LATENCY * 1e3:.0f} ms each")
+        await run("fixed-10", capacity, ConcurrencyLimits(initial=10, min_limit=10, max_limit=10))
+        await run("fixed-40", capacity, ConcurrencyLimits(initial=40, min_limit=40, max_limit=40))
+        await run("adaptive", capacity, ConcurrencyLimits(initial=10))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
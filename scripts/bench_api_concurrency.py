@@ -0,0 +1,63 @@
+"""Check API responsiveness under concurrent DB-bound load.
+
+Fires CONCURRENCY parallel requests at the DB-backed routes for ROUNDS rounds while
+probing /health, and reports throughput and probe latency. Run against a live server:
+
+    uvicorn app.main:app --port 8000   # from backend/
+    python scripts/bench_api_concurrency.py
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BASE = "http://localhost:8000"
+CONCURRENCY = 50
+ROUNDS = 10
+ROUTES = [
+    ("/api/v1/assets/", {"limit": 500}),
+    ("/api/v1/universe/list", {}),
+    ("/api/v1/portfolio/demo", {}),
+    ("/api/v1/recommend/", {"mode": "cached", "solver": "numpy"}),
+]
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, out: list[float]):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await client.get(f"{BASE}/api/v1/health/")
+        out.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def run():
+    limits = httpx.Limits(max_connections=CONCURRENCY + 5)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        for path, params in ROUTES:
+            r = await client.get(f"{BASE}{path}", params=params)  # warm-up
+            r.raise_for_status()
+
+            probes: list[float] = []
+            stop = asyncio.Event()
+            prober = asyncio.create_task(probe(client, stop, probes))
+
+            t0 = time.perf_counter()
+            for _ in range(ROUNDS):
+                await asyncio.gather(
+                    *[client.get(f"{BASE}{path}", params=params) for _ in range(CONCURRENCY)]
+                )
+            elapsed = time.perf_counter() - t0
+            stop.set()
+            await prober
+
+            p95 = statistics.quantiles(probes, n=20)[-1] if len(probes) > 1 else probes[0]
+            print(
+                f"{path:<26} {CONCURRENCY * ROUNDS / elapsed:8.1f} req/s   "
+                f"/health p50={statistics.median(probes):7.1f} ms  p95={p95:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,68 @@
+"""Event-loop lag while FinBERT scores a batch: inline vs worker thread vs process pool.
+
+A heartbeat coroutine sleeps 10 ms in a loop while 64 headlines are scored with the model
+named by FINBERT_MODEL; lag is how late each heartbeat wakes up. "inline" is the old
+behaviour (score_texts called inside async code), "thread" is asyncio.to_thread, and
+"process" is the SENTIMENT_PROCESSES pool (model preloaded before timing).
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.core.executors import shutdown_executors  # noqa: E402
+from app.services.providers.sentiment_provider import SentimentProvider  # noqa: E402
+
+TEXTS = 64
+TICK = 0.010
+WORDS = "shares rally earnings beat guidance cut outlook merger lawsuit record revenue".split()
+
+
+async def heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append((time.perf_counter() - t0 - TICK) * 1e3)
+
+
+async def measure(label: str, score) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    hb = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0.05)
+    t0 = time.perf_counter()
+    await score()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await hb
+    p95 = sorted(lags)[int(0.95 * (len(lags) - 1))]
+    print(
+        f"{label:<9}{elapsed:8.1f} s   heartbeats={len(lags):5d}   "
+        f"lag p95={p95:8.1f} ms  max={max(lags):8.1f} ms"
+    )
+
+
+async def run():
+    rng = random.Random(0)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(6, 40))) for _ in range(TEXTS)]
+
+    local = SentimentProvider(cache=None, processes=0)
+    local.model_name()  # load before timing
+    pooled = SentimentProvider(cache=None, processes=1)
+    pooled.model_name()  # spawns the pool process and loads the model there
+
+    async def inline():
+        local.score_each(texts)
+
+    await measure("inline", inline)
+    await measure("thread", lambda: asyncio.to_thread(local.score_each, texts))
+    await measure("process", lambda: asyncio.to_thread(pooled.score_each, texts))
+    shutdown_executors()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
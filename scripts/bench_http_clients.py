@@ -0,0 +1,119 @@
+"""Backfill fetch of 100 symbols against a local mock Polygon: client per request vs pooled.
+
+Starts an HTTPS mock of /v2/aggs (self-signed certificate made with openssl, ~750 daily
+bars per symbol) in a background thread and fetches every symbol 10 at a time, the same
+fan-out as UniverseService. "per-request" opens a new httpx.AsyncClient for each call
+(the old provider code: new TCP + TLS handshake every time); "pooled" goes through
+MarketProvider with a shared HttpClientManager.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.providers.http_clients import HttpClientManager  # noqa: E402
+from app.services.providers.market_provider import MarketProvider  # noqa: E402
+from app.services.providers.rate_limiter import RateLimiter  # noqa: E402
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(100)]
+CONCURRENCY = 10
+ROUNDS = 3
+END = date.today()
+START = END - timedelta(days=365 * 3)
+
+_BARS = json.dumps(
+    {
+        "results": [
+            {"t": int(time.mktime((START + timedelta(days=i)).timetuple())) * 1000,
+             "c": 100.0 + i * 0.1, "v": 1e6}
+            for i in range(750)
+        ]
+    }
+).encode()
+
+
+async def mock_polygon(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": _BARS})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(tmp: str) -> tuple[str, str]:
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    port = free_port()
+    config = uvicorn.Config(mock_polygon, host="127.0.0.1", port=port, log_level="warning",
+                            ssl_certfile=cert, ssl_keyfile=key)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"https://127.0.0.1:{port}", cert
+
+
+async def fan_out(fetch) -> float:
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def guarded(sym: str):
+        async with sem:
+            return await fetch(sym)
+
+    t0 = time.perf_counter()
+    frames = await asyncio.gather(*[guarded(s) for s in SYMBOLS])
+    assert all(len(df) == 750 for df in frames)
+    return time.perf_counter() - t0
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url, cert = start_server(tmp)
+
+        async def per_request(sym: str):
+            # old provider behaviour: a fresh client (and connection) per call
+            async with httpx.AsyncClient(base_url=base_url, timeout=30, verify=cert) as client:
+                r = await client.get(f"/v2/aggs/ticker/{sym}/range/1/day/{START}/{END}",
+                                     params={"apiKey": "k"})
+                r.raise_for_status()
+                return r.json()["results"]
+
+        clients = HttpClientManager(base_urls={"polygon": base_url}, verify=cert)
+        market = MarketProvider(polygon_api_key="k", clients=clients, limiter=RateLimiter({}))
+
+        async def pooled(sym: str):
+            return await market._fetch_polygon(sym, START, END)
+
+        print(f"{len(SYMBOLS)} symbols, concurrency {CONCURRENCY}, best of {ROUNDS}")
+        for label, fetch in (("per-request", per_request), ("pooled", pooled)):
+            best = min([await fan_out(fetch) for _ in range(ROUNDS)])
+            print(f"{label:12s} {best * 1e3:8.1f} ms  {len(SYMBOLS) / best:7.1f} symbols/s")
+        print(f"pooled clients opened: {clients.stats()['opened']}")
+        await clients.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Momentum for a 500-symbol universe: per-symbol momentum_signal vs momentum_signals batch.
+
+Seeds synthetic BENCH* assets with 400 days of closes into the database at
+DATABASE_URL (enough history that no provider backfill is triggered), then
+deletes them. The price-matrix cache is cleared before each run.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import PriceRepo  # noqa: E402
+from app.db.session import SessionLocal, async_engine  # noqa: E402
+from app.services.features.price_cache import price_matrix_cache  # noqa: E402
+from app.services.features.signals import SignalService  # noqa: E402
+
+ASSETS = 500
+DAYS = 400
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+async def run():
+    cleanup()
+    syms = [f"BENCH{i:04d}" for i in range(ASSETS)]
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": s, "name": s, "asset_class": "equity"} for s in syms]
+    )
+    end = date.today()
+    dates = np.arange(np.datetime64(end - timedelta(days=DAYS)), np.datetime64(end))
+    rng = np.random.default_rng(0)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, len(dates)),
+        np.tile(dates, len(ids)),
+        rng.uniform(10, 500, len(ids) * len(dates)),
+        np.zeros(len(ids) * len(dates)),
+    )
+    svc = SignalService(market=None, news=None, sentiment=None)  # providers unused here
+
+    try:
+        price_matrix_cache.clear()
+        t0 = time.perf_counter()
+        per_symbol = {s: await svc.momentum_signal(s) for s in syms}
+        loop = time.perf_counter() - t0
+
+        price_matrix_cache.clear()
+        t0 = time.perf_counter()
+        batch = (await svc.momentum_signals(syms, (20, 60, 120)))[60]
+        vec = time.perf_counter() - t0
+
+        assert np.allclose([per_symbol[s] for s in syms], [batch[s] for s in syms])
+        print(f"{ASSETS} symbols")
+        print(f"{'per-symbol momentum_signal (60d)':<40}{loop * 1e3:10.1f} ms")
+        print(f"{'momentum_signals (20/60/120d)':<40}{vec * 1e3:10.1f} ms  ({loop / vec:.0f}x)")
+    finally:
+        cleanup()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
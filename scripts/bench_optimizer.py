@@ -0,0 +1,68 @@
+"""Benchmark per-solve latency of mean_variance_opt.
+
+1) rebuild-per-call cvxpy vs cached parameterized cvxpy (ECOS)
+2) cached ECOS vs the pure-NumPy projected-gradient backend
+"""
+
+import os
+import sys
+import time
+from functools import partial
+
+import cvxpy as cp
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.features.optimizer import mean_variance_opt  # noqa: E402
+
+SIZES = [6, 60, 500]
+SOLVER_SIZES = [60, 500]
+SOLVES = {6: 50, 60: 20, 500: 5}
+MAX_W = {6: 0.35, 60: 0.10, 500: 0.02}
+
+
+def legacy_mean_variance_opt(mu: np.ndarray, cov: np.ndarray, max_w: float = 0.35):
+    """Previous implementation: builds and canonicalizes a fresh Problem per call."""
+    n = len(mu)
+    w = cp.Variable(n)
+    objective = cp.Maximize(mu @ w - 1.0 * cp.quad_form(w, cov))
+    prob = cp.Problem(objective, [cp.sum(w) == 1, w >= 0, w <= max_w])
+    prob.solve(solver=cp.ECOS, verbose=False)
+    if w.value is None or prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+        return np.ones(n) / n
+    return np.clip(np.array(w.value).flatten(), 0, 1)
+
+
+def make_inputs(n: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0.0005, 0.01, size=(252, n))
+    return rng.normal(0.05, 0.1, size=n), np.cov(rets, rowvar=False)
+
+
+def bench(fn, n: int) -> float:
+    inputs = [make_inputs(n, i) for i in range(SOLVES[n] + 1)]
+    fn(*inputs[0], max_w=MAX_W[n])  # warm-up (imports / first compile)
+    t0 = time.perf_counter()
+    for mu, cov in inputs[1:]:
+        fn(mu, cov, max_w=MAX_W[n])
+    return (time.perf_counter() - t0) / SOLVES[n] * 1000
+
+
+def run():
+    print(f"{'assets':>6}  {'legacy ms/solve':>16}  {'cached ms/solve':>16}  {'speedup':>8}")
+    for n in SIZES:
+        before = bench(legacy_mean_variance_opt, n)
+        after = bench(mean_variance_opt, n)
+        print(f"{n:>6}  {before:>16.2f}  {after:>16.2f}  {before / after:>7.1f}x")
+
+    print()
+    print(f"{'assets':>6}  {'ecos ms/solve':>16}  {'numpy ms/solve':>16}  {'speedup':>8}")
+    for n in SOLVER_SIZES:
+        ecos = bench(partial(mean_variance_opt, solver="ecos"), n)
+        numpy = bench(partial(mean_variance_opt, solver="numpy"), n)
+        print(f"{n:>6}  {ecos:>16.2f}  {numpy:>16.2f}  {ecos / numpy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
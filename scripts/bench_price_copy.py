@@ -0,0 +1,90 @@
+"""Throughput of PriceRepo loads: per-symbol multi-VALUES upserts vs COPY bulk_upsert.
+
+Writes 1M rows (1000 synthetic BENCH* assets x 1000 days) into the database at
+DATABASE_URL, once as fresh inserts and once as updates, then deletes the assets.
+"""
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import BULK_THRESHOLD, PriceRepo  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
+ASSETS = 1000
+DAYS = 1000
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+def per_symbol(repo: PriceRepo, ids, dates, close, volume):
+    """Current path: one INSERT ... VALUES ... ON CONFLICT per symbol."""
+    for i, asset_id in enumerate(ids):
+        rows = [
+            {"asset_id": asset_id, "date": d, "close": c, "volume": v}
+            for d, c, v in zip(dates, close[i].tolist(), volume[i].tolist())
+        ]
+        repo.upsert_prices(rows)
+
+
+def bulk(repo: PriceRepo, ids, dates, close, volume):
+    repo.bulk_upsert(
+        np.repeat(ids, len(dates)), np.tile(dates, len(ids)), close.ravel(), volume.ravel()
+    )
+
+
+def timed(label: str, fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    dt = time.perf_counter() - t0
+    print(f"{label:<28}{dt:8.2f} s  {ASSETS * DAYS / dt:>10,.0f} rows/s")
+
+
+def run():
+    assert DAYS <= BULK_THRESHOLD  # keep the per-symbol path on multi-VALUES
+    cleanup()
+    syms = [f"BENCH{i:04d}" for i in range(ASSETS)]
+    AssetRepo().ensure_assets([{"symbol": s, "name": s, "asset_class": "equity"} for s in syms])
+    with SessionLocal() as s:
+        ids = np.array(
+            s.execute(Asset.__table__.select().where(Asset.symbol.in_(syms))).scalars().all()
+        )
+
+    rng = np.random.default_rng(0)
+    dates = np.arange(np.datetime64(date(2020, 1, 1)), np.datetime64(date(2020, 1, 1)) + DAYS)
+    close = rng.uniform(10, 500, size=(ASSETS, DAYS))
+    volume = rng.integers(1e5, 1e7, size=(ASSETS, DAYS)).astype(float)
+    date_list = dates.tolist()
+
+    repo = PriceRepo()
+    print(f"{ASSETS * DAYS:,} rows")
+    try:
+        timed("per-symbol VALUES (insert)", per_symbol, repo, ids, date_list, close, volume)
+        timed("per-symbol VALUES (update)", per_symbol, repo, ids, date_list, close, volume)
+        cleanup()
+        AssetRepo().ensure_assets([{"symbol": s, "name": s, "asset_class": "equity"} for s in syms])
+        with SessionLocal() as s:
+            ids = np.array(
+                s.execute(Asset.__table__.select().where(Asset.symbol.in_(syms))).scalars().all()
+            )
+        timed("COPY bulk_upsert (insert)", bulk, repo, ids, dates, close, volume)
+        timed("COPY bulk_upsert (update)", bulk, repo, ids, dates, close, volume)
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    run()
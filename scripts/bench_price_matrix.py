@@ -0,0 +1,103 @@
+"""load_price_matrix: legacy Decimal rows + pandas pivot vs the columnar cache.
+
+Seeds 500 synthetic BENCH* assets x 3 years of closes into the database at
+DATABASE_URL, times a full-universe load (cold and warm) plus the per-symbol
+180-day loads momentum_signal does, then deletes the assets.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete, select  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.models.price import Price  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import PriceRepo  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.features.price_cache import price_matrix_cache  # noqa: E402
+from app.services.features.prices_cov import load_price_matrix  # noqa: E402
+
+ASSETS = 500
+DAYS = 3 * 365
+END = date.today()
+START = END - timedelta(days=DAYS)
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+def legacy_load(symbols):
+    """The previous implementation: ORM rows with Decimal closes, long frame, pivot."""
+    with SessionLocal() as s:
+        rows = s.execute(
+            select(Asset.symbol, Price.date, Price.close)
+            .join(Price, Price.asset_id == Asset.id)
+            .where(Asset.symbol.in_(symbols))
+            .where(Price.date >= START)
+            .where(Price.date <= END)
+        ).all()
+    df = pd.DataFrame(rows, columns=["symbol", "date", "close"])
+    return df.pivot(index="date", columns="symbol", values="close").sort_index().ffill()
+
+
+def timed(label, fn, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    dt = (time.perf_counter() - t0) / repeat
+    print(f"{label:<40}{dt * 1e3:10.1f} ms")
+    return dt
+
+
+def run():
+    cleanup()
+    syms = [f"BENCH{i:04d}" for i in range(ASSETS)]
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": s, "name": s, "asset_class": "equity"} for s in syms]
+    )
+    dates = np.arange(np.datetime64(START), np.datetime64(END))
+    rng = np.random.default_rng(0)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, len(dates)),
+        np.tile(dates, len(ids)),
+        rng.uniform(10, 500, len(ids) * len(dates)),
+        np.zeros(len(ids) * len(dates)),
+    )
+    print(f"{ASSETS} symbols x {len(dates)} days")
+
+    try:
+        timed("legacy full universe", lambda: legacy_load(syms))
+        timed("uncached full universe", lambda: load_price_matrix(syms, START, END, False))
+        price_matrix_cache.clear()
+        timed("cached full universe (cold)", lambda: load_price_matrix(syms, START, END))
+        timed("cached full universe (warm)", lambda: load_price_matrix(syms, START, END), 10)
+
+        mom_start = END - timedelta(days=180)
+        sample = syms[:50]
+        n = len(sample)
+        uncached = timed(
+            f"uncached per-symbol 180d x{n}",
+            lambda: [load_price_matrix([s], mom_start, END, False) for s in sample],
+        )
+        sliced = timed(
+            f"cached per-symbol 180d x{n} (sliced)",
+            lambda: [load_price_matrix([s], mom_start, END) for s in sample],
+        )
+        print(f"per-symbol speedup {uncached / sliced:.0f}x; {price_matrix_cache.stats()}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    run()
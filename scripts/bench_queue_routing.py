@@ -0,0 +1,235 @@
+"""Nightly refresh under load: one shared worker pool vs dedicated io and cpu workers.
+
+Starts real Celery workers as subprocesses (filesystem broker and file result backend,
+so no Redis is needed) against local mocks of Polygon aggregates and Google News RSS
+that answer after UPSTREAM_LATENCY, and the database at DATABASE_URL. Each run:
+
+- submits the refresh DAG (orchestrate.backfill_then_signals) for 60 BENCH* symbols;
+- meanwhile submits one on-demand price.fetch_and_store_many task every 0.5 s for 30
+  other symbols (what the API queues for stale symbols).
+
+It reports the DAG's end-to-end time and the on-demand tasks' queue-to-done latency for:
+
+- shared: `worker -Q io,cpu --concurrency=4` (the previous single-pool setup);
+- split: `worker -Q io --pool=threads --concurrency=16` + `worker -Q cpu
+  --concurrency=<cores>` (the worker-io / worker-cpu compose services).
+
+Set FINBERT_MODEL to a local checkpoint to run offline.
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import uvicorn
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+REFRESH = [f"BENCHR{i:03d}" for i in range(60)]
+ON_DEMAND = [f"BENCHD{i:03d}" for i in range(30)]
+ON_DEMAND_EVERY = 0.5
+UPSTREAM_LATENCY = 0.15
+HEADLINES = 4
+LOOKBACK = 400
+GAP_DAYS = 10
+END = date.today()
+_round = [0]  # fresh headlines per run: no sentiment cache hits
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _bars(start: date, end: date) -> bytes:
+    days = np.arange(np.datetime64(start), np.datetime64(end))
+    days = days[np.is_busday(days)]
+    ms = days.astype("datetime64[ms]").astype(np.int64)
+    rows = ",".join(f'{{"t":{t},"c":{100 + i * 0.1:.2f},"v":1000000}}' for i, t in enumerate(ms))
+    return f'{{"results":[{rows}]}}'.encode()
+
+
+def _rss(symbol: str) -> bytes:
+    items = "".join(
+        f"<item><title>{symbol} headline {i} round {_round[0]}: shares move on earnings "
+        f"outlook</title><description>Analysts update {symbol} guidance {i}.</description>"
+        f"<link>https://news.test/{symbol}/{i}</link></item>"
+        for i in range(HEADLINES)
+    )
+    return f"<rss><channel>{items}</channel></rss>".encode()
+
+
+async def upstream(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await asyncio.sleep(UPSTREAM_LATENCY)
+    path, query = scope["path"], scope["query_string"].decode()
+    if path.startswith("/v2/aggs/ticker/"):
+        parts = path.split("/")
+        body, ctype = _bars(date.fromisoformat(parts[-2]), date.fromisoformat(parts[-1])), b"application/json"
+    else:
+        symbol = dict(p.split("=", 1) for p in query.split("&"))["q"]
+        body, ctype = _rss(symbol), b"application/rss+xml"
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", ctype)]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def start_upstream() -> str:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(upstream, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+BASE_URL = start_upstream()
+BROKER_DIR = tempfile.mkdtemp(prefix="bench-celery-")
+os.environ.update(
+    POLYGON_API_KEY="bench",
+    POLYGON_BASE_URL=BASE_URL,
+    POLYGON_GROUPED_DAILY="false",
+    NEWSAPI_KEY="",
+    GOOGLE_NEWS_BASE_URL=BASE_URL,
+    NEGATIVE_CACHE_TTL_SECS="0",
+    RATE_LIMIT_POLYGON="",  # the mock has no quota
+    RATE_LIMIT_GOOGLE_NEWS="",
+    PIPELINE_PRICE_CHUNK="10",
+    PIPELINE_SIGNAL_CHUNK="5",
+    BENCH_BROKER_DIR=BROKER_DIR,
+    PYTHONPATH=os.pathsep.join([BROKER_DIR, BACKEND]),
+)
+sys.path[:0] = [BROKER_DIR, BACKEND]
+
+# the app the workers load: the real one, pointed at a filesystem broker
+with open(os.path.join(BROKER_DIR, "bench_celery.py"), "w") as f:
+    f.write(
+        "import os\n"
+        "from app.services.tasks.celery_app import app\n"
+        "d = os.environ['BENCH_BROKER_DIR']\n"
+        "app.conf.update(broker_url='filesystem://', result_backend=f'file://{d}/results',\n"
+        "    broker_transport_options={'data_folder_in': f'{d}/queue', 'data_folder_out':\n"
+        "        f'{d}/queue', 'processed_folder': f'{d}/done',\n"
+        "        'control_folder': f'{d}/control', 'polling_interval': 0.05})\n"
+    )
+for sub in ("queue", "done", "control", "results"):
+    os.makedirs(os.path.join(BROKER_DIR, sub))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.models.price import Price  # noqa: E402
+from app.db.models.signal import Signal  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import PriceRepo  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from bench_celery import app  # noqa: E402
+from app.services.tasks.orchestrate import universe_backfill_and_signals  # noqa: E402
+from app.services.tasks.price_tasks import fetch_and_store_prices_many  # noqa: E402
+
+CELERY = [sys.executable, "-m", "celery", "-A", "bench_celery", "worker", "-l", "INFO",
+          "--without-gossip", "--without-mingle", "--without-heartbeat"]
+CONFIGS = {
+    "shared": [["-Q", "io,cpu", "-n", "shared@%h", "--concurrency=4"]],
+    "split": [
+        ["-Q", "io", "-n", "io@%h", "--pool=threads", "--concurrency=16"],
+        ["-Q", "cpu", "-n", "cpu@%h", "--pool=prefork", f"--concurrency={os.cpu_count()}"],
+    ],
+}
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+def seed() -> list[int]:
+    symbols = REFRESH + ON_DEMAND
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": s, "name": s, "asset_class": "equity"} for s in symbols]
+    )
+    dates = np.arange(np.datetime64(END - timedelta(days=LOOKBACK)), np.datetime64(END))
+    dates = dates[np.is_busday(dates)]
+    n = len(dates)
+    rng = np.random.default_rng(0)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, n), np.tile(dates, len(ids)),
+        rng.uniform(10, 500, n * len(ids)), np.full(n * len(ids), 1e6),
+    )
+    return ids
+
+
+def reset(ids: list[int]) -> None:
+    """Same work for every run: drop the recent bars and today's signals."""
+    _round[0] += 1
+    with SessionLocal() as s:
+        s.execute(delete(Price).where(Price.asset_id.in_(ids),
+                                      Price.date >= END - timedelta(days=GAP_DAYS)))
+        s.execute(delete(Signal).where(Signal.asset_id.in_(ids), Signal.date == END))
+        s.commit()
+
+
+def start_workers(specs: list[list[str]], log_dir: str) -> list[subprocess.Popen]:
+    procs = []
+    for i, spec in enumerate(specs):
+        log = os.path.join(log_dir, f"worker{i}.log")
+        procs.append(subprocess.Popen(CELERY + spec + ["-f", log], cwd=BACKEND))
+    for i in range(len(specs)):  # wait until each worker consumes
+        log = os.path.join(log_dir, f"worker{i}.log")
+        while not (os.path.exists(log) and " ready." in open(log).read()):
+            time.sleep(0.2)
+    return procs
+
+
+def final_result(res, timeout: float = 600):
+    out = res.get(timeout=timeout)
+    while not (isinstance(out, dict) and "stages" in out):  # follow replaced tasks
+        res = res.children[-1] if res.children else res
+        out = res.get(timeout=timeout)
+    return out
+
+
+def run(name: str, ids: list[int]) -> None:
+    reset(ids)
+    log_dir = os.path.join(BROKER_DIR, name)
+    os.makedirs(log_dir)
+    procs = start_workers(CONFIGS[name], log_dir)
+    try:
+        t0 = time.time()
+        dag = universe_backfill_and_signals.delay(REFRESH, LOOKBACK)
+        on_demand = []
+        for s in ON_DEMAND:
+            on_demand.append((time.time(), fetch_and_store_prices_many.delay([s], LOOKBACK)))
+            time.sleep(ON_DEMAND_EVERY)
+        out = final_result(dag)
+        dag_secs = time.time() - t0
+        lat = np.array([r.get(timeout=600)["finished"] - sent for sent, r in on_demand])
+        stages = ", ".join(f"{s['stage']} {s['wall_secs']:.1f}s" for s in out["stages"])
+        print(f"{name:>6}: refresh of {len(REFRESH)} symbols {dag_secs:5.1f} s ({stages}); "
+              f"on-demand prices p50 {np.percentile(lat, 50):5.2f} s, "
+              f"p95 {np.percentile(lat, 95):5.2f} s, max {lat.max():5.2f} s")
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait()
+
+
+if __name__ == "__main__":
+    cleanup()
+    try:
+        asset_ids = seed()
+        for config in CONFIGS:
+            run(config, asset_ids)
+    finally:
+        cleanup()
+        shutil.rmtree(BROKER_DIR, ignore_errors=True)
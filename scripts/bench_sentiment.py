@@ -0,0 +1,77 @@
+"""CPU throughput of headline scoring: per-symbol FinBERT calls vs the SentimentBatcher.
+
+Scores SYMBOLS x HEADLINES synthetic headlines of mixed length with the model named by
+FINBERT_MODEL (a hub id or a local directory). The legacy path scores one symbol at a
+time in unsorted batches of 16; the batcher receives all symbols concurrently.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.providers.sentiment_batcher import SentimentBatcher  # noqa: E402
+from app.services.providers.sentiment_provider import (  # noqa: E402
+    SentimentProvider,
+    _finbert_score,
+)
+
+SYMBOLS = 10
+HEADLINES = 30
+WORDS = "shares rally earnings beat guidance cut outlook merger lawsuit record revenue".split()
+
+
+def make_texts() -> list[list[str]]:
+    rng = random.Random(0)
+    # title + optional summary, like NewsProvider items: 6..80 words
+    def headline() -> str:
+        k = rng.choice([rng.randint(6, 14), rng.randint(40, 80)])
+        return " ".join(rng.choices(WORDS, k=k))
+
+    return [[headline() for _ in range(HEADLINES)] for _ in range(SYMBOLS)]
+
+
+def legacy(provider: SentimentProvider, groups: list[list[str]]) -> None:
+    """The previous score_texts loop: per symbol, fixed batches of 16 in arrival order."""
+    for texts in groups:
+        for i in range(0, len(texts), 16):
+            for row in provider._pipe(texts[i : i + 16], truncation=True):
+                _finbert_score(row)
+
+
+async def batched(provider: SentimentProvider, groups: list[list[str]]) -> dict:
+    batcher = SentimentBatcher(provider)
+    await asyncio.gather(*[batcher.score_texts(g) for g in groups])
+    await batcher.aclose()
+    return batcher.stats()
+
+
+def run():
+    provider = SentimentProvider(cache=None, processes=0)  # the model itself, no cache
+    provider._ensure_finbert()
+    if not provider._pipe:
+        sys.exit("FinBERT pipeline unavailable (install transformers/torch, set FINBERT_MODEL)")
+
+    groups = make_texts()
+    n = SYMBOLS * HEADLINES
+    provider.score_each(groups[0])  # warm-up
+
+    t0 = time.perf_counter()
+    legacy(provider, groups)
+    before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    stats = asyncio.run(batched(provider, groups))
+    after = time.perf_counter() - t0
+
+    print(f"{n} texts, {SYMBOLS} symbols")
+    print(f"{'per-symbol, batch 16':<28}{n / before:8.1f} texts/s")
+    print(f"{'micro-batched, sorted':<28}{n / after:8.1f} texts/s  ({before / after:.2f}x)")
+    print(stats)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,131 @@
+"""Parity, latency and memory of the FinBERT inference backends (torch / int8 / onnx).
+
+Each backend runs in its own subprocess (so RSS is comparable) over a fixed
+headline set, with the model named by FINBERT_MODEL and FINBERT_MAX_LENGTH tokens.
+Scores are compared against the full-precision torch backend.
+
+    python scripts/bench_sentiment_backends.py [--backends torch int8 onnx]
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+HEADLINES = [
+    "Apple beats quarterly revenue estimates as iPhone sales rebound",
+    "Tesla shares slide after deliveries miss analyst expectations",
+    "Federal Reserve holds rates steady, signals two cuts later this year",
+    "Microsoft raises dividend by 10% and announces $60 billion buyback",
+    "Boeing faces new FAA probe over 737 MAX production quality",
+    "Nvidia market value tops $3 trillion on surging AI chip demand",
+    "Intel to cut 15% of workforce as turnaround plan stalls",
+    "Amazon Web Services growth accelerates for third straight quarter",
+    "Bank of America warns of slowing consumer spending in the second half",
+    "Pfizer lowers full-year guidance on weaker Covid product sales",
+    "JPMorgan posts record profit, net interest income beats forecasts",
+    "Oil prices fall as OPEC+ agrees to boost output from August",
+    "Walmart lifts outlook as shoppers trade down to discount retailers",
+    "Disney streaming unit turns first quarterly profit",
+    "Netflix subscriber growth slows; shares drop in after-hours trading",
+    "Meta faces EU antitrust charges over ad-supported subscription model",
+    "Alphabet announces first-ever dividend and $70 billion buyback",
+    "Ford recalls 1.9 million vehicles over steering defect",
+    "Goldman Sachs trading revenue jumps 20% on volatile markets",
+    "Treasury yields climb after hotter-than-expected inflation report",
+    "Nike cuts revenue forecast, warns of weaker demand in China",
+    "Costco same-store sales rise 7%, beating estimates",
+    "Credit Suisse shares plunge to record low amid funding concerns",
+    "Exxon completes acquisition of Pioneer Natural Resources",
+    "Starbucks names new CEO as sales slump continues",
+    "AMD unveils new data center GPU to challenge Nvidia",
+    "Home Depot warns housing slowdown will weigh on sales",
+    "Visa quarterly payments volume grows 8% year over year",
+    "Regional bank stocks tumble as deposit outflows resume",
+    "UnitedHealth shares sink after cyberattack disrupts claims processing",
+    "Coca-Cola raises annual sales forecast on strong pricing",
+    "Chevron profit falls on lower refining margins",
+    "Salesforce shares surge after upbeat guidance and margin expansion",
+    "Moody's downgrades outlook on U.S. credit rating to negative",
+    "Berkshire Hathaway cash pile hits record as Buffett trims Apple stake",
+    "Semiconductor stocks rally as export restrictions ease",
+    "Airline shares fall as jet fuel costs spike",
+    "Eli Lilly obesity drug sales exceed expectations, stock hits record",
+    "Retail sales unexpectedly decline in May",
+    "S&P 500 closes flat as investors await jobs data",
+]
+
+
+def worker(backend: str) -> None:
+    from app.services.providers.sentiment_provider import SentimentProvider
+
+    t0 = time.perf_counter()
+    provider = SentimentProvider(cache=None, backend=backend, processes=0)
+    provider._ensure_finbert()
+    if not provider._pipe:
+        sys.exit(f"{backend}: FinBERT pipeline unavailable")
+    load = time.perf_counter() - t0
+
+    provider.score_each(HEADLINES[:4])  # warm-up
+    t0 = time.perf_counter()
+    scores = provider.score_each(HEADLINES)
+    latency = (time.perf_counter() - t0) / len(HEADLINES)
+
+    gc.collect()
+    result = {
+        "scores": scores,
+        "load_s": load,
+        "ms_per_text": latency * 1e3,
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "rss_mb": current_rss_mb(),
+    }
+    print(json.dumps(result))
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run(backends: list[str]) -> None:
+    results = {}
+    for b in backends:
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", b], capture_output=True, text=True, check=True
+        )
+        results[b] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    ref = np.array(results[backends[0]]["scores"])
+    print(f"{len(HEADLINES)} headlines, reference backend: {backends[0]}")
+    print(
+        f"{'backend':<8}{'load s':>8}{'ms/text':>10}{'RSS MB':>9}{'peak MB':>9}"
+        f"{'max |d|':>10}{'sign agree':>12}"
+    )
+    for b, r in results.items():
+        s = np.array(r["scores"])
+        print(
+            f"{b:<8}{r['load_s']:8.1f}{r['ms_per_text']:10.1f}{r['rss_mb']:9.0f}{r['peak_mb']:9.0f}"
+            f"{np.abs(s - ref).max():10.4f}{np.mean(np.sign(s) == np.sign(ref)):12.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--worker")
+    args = parser.parse_args()
+    if args.worker:
+        worker(args.worker)
+    else:
+        run(args.backends)
@@ -0,0 +1,59 @@
+"""Symbol -> asset id resolution: per-symbol get_by_symbol vs AssetRepo.resolve_many.
+
+Seeds 500 synthetic BENCH* assets into the database at DATABASE_URL and times resolving
+all of them one query per symbol (the old callers), with resolve_many on an empty
+SymbolMap (one query for every miss) and with resolve_many on a warm map (no query),
+then deletes the assets.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo, invalidate_symbols  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
+ASSETS = 500
+REPEAT = 5
+SYMBOLS = [f"BENCH{i:04d}" for i in range(ASSETS)]
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+    invalidate_symbols()
+
+
+def timed(label, fn, before=lambda: None):
+    before()
+    fn()  # warm the connection pool
+    total = 0.0
+    for _ in range(REPEAT):
+        before()
+        t0 = time.perf_counter()
+        out = fn()
+        total += time.perf_counter() - t0
+    print(f"{label:<36}{total / REPEAT * 1e3:9.2f} ms")
+    return out
+
+
+if __name__ == "__main__":
+    cleanup()
+    try:
+        repo = AssetRepo()
+        repo.ensure_assets([{"symbol": s, "name": s, "asset_class": "equity"} for s in SYMBOLS])
+        print(f"{ASSETS} symbols")
+        a = timed("per-symbol get_by_symbol (old)",
+                  lambda: {s: repo.get_by_symbol(s).id for s in SYMBOLS})
+        b = timed("resolve_many, cold map", lambda: repo.resolve_many(SYMBOLS),
+                  before=invalidate_symbols)
+        c = timed("resolve_many, warm map", lambda: repo.resolve_many(SYMBOLS))
+        print(f"same ids: {a == b == c}")
+    finally:
+        cleanup()
@@ -0,0 +1,89 @@
+"""top_by_avg_volume: 60-day prices aggregate vs the asset_volume_stats top-k lookup.
+
+Seeds 500 synthetic BENCH* assets x 3 years of bars into the database at DATABASE_URL
+(the bulk upsert also fills their asset_volume_stats rows), times both queries and the
+incremental summary refresh after a one-day upsert, then deletes the assets.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import PriceRepo  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.features.basket import (  # noqa: E402
+    _top_by_avg_volume_query,
+    top_by_avg_volume,
+)
+
+ASSETS = 500
+DAYS = 3 * 365
+REPEAT = 20
+END = date.today()
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+def seed() -> list[int]:
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": f"BENCH{i:04d}", "name": "bench", "asset_class": "equity"} for i in range(ASSETS)]
+    )
+    dates = np.arange(np.datetime64(END - timedelta(days=DAYS)), np.datetime64(END))
+    dates = dates[np.is_busday(dates)]
+    rng = np.random.default_rng(0)
+    n = len(dates)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, n),
+        np.tile(dates, len(ids)),
+        rng.uniform(10, 500, n * len(ids)),
+        rng.uniform(1e5, 5e7, n * len(ids)).round(),
+    )
+    return ids
+
+
+def timed(label, fn):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        out = fn()
+    dt = (time.perf_counter() - t0) / REPEAT
+    print(f"{label:<44}{dt * 1e3:9.2f} ms")
+    return out
+
+
+def aggregate():
+    with SessionLocal() as s:
+        query = _top_by_avg_volume_query(60, settings.avg_volume_window_days)
+        return [r[0] for r in s.execute(query).all()]
+
+
+if __name__ == "__main__":
+    cleanup()
+    try:
+        ids = seed()
+        a = timed("prices GROUP BY aggregate (old)", aggregate)
+        b = timed("asset_volume_stats top-k lookup", top_by_avg_volume)
+        print(f"same top 60: {a == b}")
+        repo = PriceRepo()
+        day = np.datetime64(END)
+        timed(
+            f"one-day upsert of {ASSETS} assets (+refresh)",
+            lambda: repo.bulk_upsert(ids, np.full(len(ids), day), np.ones(len(ids)), np.ones(len(ids))),
+        )
+        timed("full nightly refresh", repo.refresh_volume_stats)
+    finally:
+        cleanup()
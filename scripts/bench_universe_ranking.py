@@ -0,0 +1,122 @@
+"""Universe top-volume ranking from the local price store.
+
+Seeds 500 synthetic BENCH* assets x 3 years of bars into the database at DATABASE_URL,
+times ranking all of them by ~30-day average volume from stored prices (what
+UNIVERSE_RANKING=local does instead of downloading 45 days for every S&P 500 member),
+then deletes the assets.
+
+It then runs UniverseProvider's local ranking twice over 500 members of which only the
+first 100 have stored bars (the usual universe), with yfinance replaced by a synthetic
+download, and reports how many members each build downloads: the first build stores
+what it downloads, so the second downloads none.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo, invalidate_symbols  # noqa: E402
+from app.db.repositories.price_repo import AsyncPriceRepo, PriceRepo  # noqa: E402
+from app.db.session import SessionLocal, async_engine  # noqa: E402
+from app.services.providers import market_provider, universe_provider  # noqa: E402
+from app.services.providers.universe_provider import (  # noqa: E402
+    VOLUME_WINDOW_DAYS,
+    UniverseProvider,
+)
+
+ASSETS = 500
+DAYS = 3 * 365
+REPEAT = 20
+END = date.today()
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+    invalidate_symbols()
+
+
+def seed(assets: int = ASSETS) -> list[str]:
+    symbols = [f"BENCH{i:04d}" for i in range(assets)]
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": s, "name": s, "asset_class": "equity"} for s in symbols]
+    )
+    dates = np.arange(np.datetime64(END - timedelta(days=DAYS)), np.datetime64(END))
+    dates = dates[np.is_busday(dates)]
+    rng = np.random.default_rng(0)
+    n = len(dates)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, n),
+        np.tile(dates, len(ids)),
+        rng.uniform(10, 500, n * len(ids)),
+        rng.uniform(1e5, 5e7, n * len(ids)).round(),
+    )
+    return symbols
+
+
+async def rank(repo: AsyncPriceRepo, symbols: list[str]) -> list[str]:
+    stats = await repo.volume_stats(symbols, END - timedelta(days=VOLUME_WINDOW_DAYS))
+    return [s for s, _ in sorted(stats.items(), key=lambda x: x[1][0], reverse=True)[:100]]
+
+
+async def main(symbols: list[str]) -> None:
+    repo = AsyncPriceRepo()
+    await rank(repo, symbols)  # warm the connection pool
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        top = await rank(repo, symbols)
+    dt = (time.perf_counter() - t0) / REPEAT
+    print(f"rank {len(symbols)} members from stored prices: {dt * 1e3:.1f} ms (top {len(top)})")
+    await async_engine.dispose()
+
+
+async def synthetic_download(symbols, start, end, limiter=None, concurrency=None):
+    downloads.append(len(symbols))
+    dates = pd.bdate_range(start, end, inclusive="left").date
+    rng = np.random.default_rng(len(downloads))
+    return {
+        s: pd.DataFrame({"date": dates, "close": 100.0, "volume": rng.uniform(1e5, 5e7, len(dates))})
+        for s in symbols
+    }
+
+
+downloads: list[int] = []
+
+
+async def builds() -> None:
+    members = [f"BENCH{i:04d}" for i in range(ASSETS)]
+    universe_provider._constituents = (time.monotonic(), members)
+    market_provider.fetch_yfinance_many = synthetic_download
+    provider = UniverseProvider(polygon_api_key="")
+    for build in (1, 2):
+        downloads.clear()
+        t0 = time.perf_counter()
+        top = await provider._local_top_volume_sp500(100)
+        print(f"build {build}: downloaded {sum(downloads)} of {ASSETS} members, "
+              f"{(time.perf_counter() - t0) * 1e3:.0f} ms (top {len(top)})")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    cleanup()
+    try:
+        t0 = time.perf_counter()
+        syms = seed()
+        print(f"seeded {ASSETS} assets in {time.perf_counter() - t0:.1f} s")
+        asyncio.run(main(syms))
+        cleanup()
+        seed(100)
+        asyncio.run(builds())
+    finally:
+        cleanup()
@@ -0,0 +1,203 @@
+"""Celery worker throughput in symbols/second: per-symbol tasks vs chunked tasks.
+
+Runs the prices and signals stages for 50 synthetic BENCH* assets in this process, the
+way one prefork worker child would (FinBERT scored in-process), against local mocks of
+Polygon aggregates and Google News RSS and the database at DATABASE_URL:
+
+- per-symbol: one task per symbol that builds fresh providers and a SignalService (so
+  FinBERT is loaded again) and runs on a fresh event loop torn down with its DB and
+  HTTP pools afterwards -- the old task bodies;
+- chunked: fetch_and_store_prices_many / compute_signals_batch_task over chunks of
+  PIPELINE_PRICE_CHUNK / PIPELINE_SIGNAL_CHUNK symbols on the worker resources that
+  worker_process_init creates once (model load reported separately).
+
+Set FINBERT_MODEL to a local checkpoint to run offline.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import uvicorn
+
+SYMBOLS = [f"BENCH{i:03d}" for i in range(50)]
+HEADLINES = 4
+END = date.today()
+GAP_DAYS = 10  # bars each run has to fetch
+_round = [0]  # changes the headlines between runs: no sentiment cache hits
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _bars(start: date, end: date) -> bytes:
+    days = np.arange(np.datetime64(start), np.datetime64(end))
+    days = days[np.is_busday(days)]
+    ms = days.astype("datetime64[ms]").astype(np.int64)
+    rows = ",".join(f'{{"t":{t},"c":{100 + i * 0.1:.2f},"v":1000000}}' for i, t in enumerate(ms))
+    return f'{{"results":[{rows}]}}'.encode()
+
+
+def _rss(symbol: str) -> bytes:
+    items = "".join(
+        f"<item><title>{symbol} headline {i} round {_round[0]}: shares move on earnings "
+        f"outlook</title><description>Analysts update {symbol} guidance {i}.</description>"
+        f"<link>https://news.test/{symbol}/{i}</link></item>"
+        for i in range(HEADLINES)
+    )
+    return f"<rss><channel>{items}</channel></rss>".encode()
+
+
+async def upstream(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    path, query = scope["path"], scope["query_string"].decode()
+    if path.startswith("/v2/aggs/ticker/"):
+        parts = path.split("/")
+        body, ctype = _bars(date.fromisoformat(parts[-2]), date.fromisoformat(parts[-1])), b"application/json"
+    else:
+        symbol = dict(p.split("=", 1) for p in query.split("&"))["q"]
+        body, ctype = _rss(symbol), b"application/rss+xml"
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", ctype)]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def start_upstream() -> str:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(upstream, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+BASE_URL = start_upstream()
+os.environ.update(
+    POLYGON_API_KEY="bench",
+    POLYGON_BASE_URL=BASE_URL,
+    POLYGON_GROUPED_DAILY="false",
+    NEWSAPI_KEY="",
+    GOOGLE_NEWS_BASE_URL=BASE_URL,
+    SENTIMENT_PROCESSES="0",  # prefork children score in-process
+    NEGATIVE_CACHE_TTL_SECS="0",
+    RATE_LIMIT_POLYGON="",  # the mock has no quota
+    RATE_LIMIT_GOOGLE_NEWS="",
+)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.models.asset import Asset  # noqa: E402
+from app.db.models.price import Price  # noqa: E402
+from app.db.repositories.asset_repo import AssetRepo  # noqa: E402
+from app.db.repositories.price_repo import AsyncPriceRepo, PriceRepo  # noqa: E402
+from app.db.session import SessionLocal, async_engine  # noqa: E402
+from app.services.features.price_ingest import backfill_many  # noqa: E402
+from app.services.features.signals import SignalService  # noqa: E402
+from app.services.providers.http_clients import http_clients  # noqa: E402
+from app.services.providers.market_provider import MarketProvider  # noqa: E402
+from app.services.providers.news_provider import NewsProvider  # noqa: E402
+from app.services.providers.sentiment_provider import SentimentProvider  # noqa: E402
+from app.services.tasks import worker_state  # noqa: E402
+from app.services.tasks.orchestrate import chunks  # noqa: E402
+from app.services.tasks.price_tasks import fetch_and_store_prices_many  # noqa: E402
+from app.services.tasks.signal_tasks import compute_signals_batch_task  # noqa: E402
+
+LOOKBACK = 400
+
+
+def cleanup():
+    with SessionLocal() as s:
+        s.execute(delete(Asset).where(Asset.symbol.like("BENCH%")))
+        s.commit()
+
+
+def seed() -> dict[str, int]:
+    ids = AssetRepo().ensure_assets(
+        [{"symbol": s, "name": s, "asset_class": "equity"} for s in SYMBOLS]
+    )
+    dates = np.arange(np.datetime64(END - timedelta(days=LOOKBACK)), np.datetime64(END))
+    dates = dates[np.is_busday(dates)]
+    n = len(dates)
+    rng = np.random.default_rng(0)
+    PriceRepo().bulk_upsert(
+        np.repeat(ids, n), np.tile(dates, len(ids)),
+        rng.uniform(10, 500, n * len(ids)), np.full(n * len(ids), 1e6),
+    )
+    return dict(zip(SYMBOLS, ids))
+
+
+def reset(ids: dict[str, int]) -> None:
+    """Drop the last GAP_DAYS of bars so every run fetches the same gap."""
+    _round[0] += 1
+    with SessionLocal() as s:
+        s.execute(delete(Price).where(Price.asset_id.in_(list(ids.values())),
+                                      Price.date >= END - timedelta(days=GAP_DAYS)))
+        s.commit()
+
+
+def old_run_async(coro):
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await http_clients.aclose()
+            await async_engine.dispose()
+
+    return asyncio.run(_main())
+
+
+def per_symbol(ids: dict[str, int]) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    for s in SYMBOLS:
+        market = MarketProvider()
+        old_run_async(backfill_many(market, AsyncPriceRepo(), {s: ids[s]},
+                                    END - timedelta(days=LOOKBACK), END))
+    t1 = time.perf_counter()
+    for s in SYMBOLS:
+        svc = SignalService(MarketProvider(), NewsProvider(), SentimentProvider())
+        old_run_async(svc.compute_and_persist(s))
+    return t1 - t0, time.perf_counter() - t1
+
+
+def chunked() -> tuple[float, float]:
+    t0 = time.perf_counter()
+    for chunk in chunks(SYMBOLS, settings.pipeline_price_chunk):
+        fetch_and_store_prices_many.apply(args=[chunk, LOOKBACK]).get()
+    t1 = time.perf_counter()
+    for chunk in chunks(SYMBOLS, settings.pipeline_signal_chunk):
+        out = compute_signals_batch_task.apply(args=[chunk]).get()
+    print(f"  worker stats: {out['worker']}")
+    return t1 - t0, time.perf_counter() - t1
+
+
+def report(name: str, prices: float, signals: float) -> None:
+    n = len(SYMBOLS)
+    print(f"{name:>10}: prices {n / prices:6.1f} sym/s, signals {n / signals:6.1f} sym/s, "
+          f"both stages {n / (prices + signals):6.1f} sym/s")
+
+
+if __name__ == "__main__":
+    cleanup()
+    try:
+        ids = seed()
+        reset(ids)
+        report("per-symbol", *per_symbol(ids))
+
+        reset(ids)
+        t0 = time.perf_counter()
+        worker_state.init_worker(preload_model=True)  # what worker_process_init does
+        print(f"  worker init (model load): {time.perf_counter() - t0:.1f} s")
+        report("chunked", *chunked())
+        worker_state.shutdown_worker()
+    finally:
+        cleanup()